@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import logging
+import random
+from time import perf_counter
+
+from cli_command_parser import Command, Counter, Flag, Option, main
+
+from music.files.parsing import AlbumName, _parse_album_name, split_artists
+
+log = logging.getLogger(__name__)
+
+WORDS = ('Love', 'Dream', 'Night', 'Summer', 'Blue', 'Heart', 'Star', 'Run', 'Forever', 'Party', 'Magic', 'Light')
+KOR_WORDS = ('사랑', '밤', '꿈', '여름', '파란', '마음', '별', '영원히')
+ARTISTS = ('TAEYEON', 'Red Velvet', 'IU', 'SEVENTEEN', 'Lauv', 'San E', 'BOL4', 'Heize', '태연', '아이유')
+ORDINALS = ('1st', '2nd', '3rd', '4th', '5th', '6th')
+TEMPLATES = (
+    '{title}',
+    '{title} - EP',
+    '{title} - Single',
+    '{title} - SM STATION',
+    '{title} ({kor})',
+    '{kor} ({title})',
+    'The {ordinal} Mini Album `{title}`',
+    '{title} [{ordinal} Album]',
+    '{title} (Japanese Ver.)',
+    '{title} (feat. {artist})',
+    '{title} (feat. {artist}) (Remix)',
+    '{title} OST Part {num}',
+    '{title} (Special Edition)',
+)
+
+
+class BenchmarkAlbumParsing(Command, description='Benchmark AlbumName.parse / split_artists over synthetic album tags'):
+    albums: int = Option('-a', default=50_000, help='Number of distinct albums in the synthetic corpus')
+    tracks: int = Option('-t', default=12, help='Number of tracks per album (each track has the same album tags)')
+    seed: int = Option('-s', default=1, help='Random seed for the synthetic corpus')
+    profile = Flag('-p', help='Profile the cached run and print the functions with the highest cumulative time')
+    verbose = Counter('-v', help='Increase logging verbosity (can specify multiple times)')
+
+    def _init_command_(self):
+        from ds_tools.logging import init_logging
+
+        init_logging(self.verbose, log_path=None)
+
+    def main(self):
+        tags = self._corpus()
+        print(f'Parsing tags for {len(tags):,d} tracks ({self.albums:,d} albums x {self.tracks} tracks)')
+        splitter = split_artists.__self__
+        modes = {
+            'uncached': (AlbumName._parse, splitter._split_artists_with_retry),
+            'cached': (AlbumName.parse, split_artists),
+        }
+        for mode, (parse_album, parse_artists) in modes.items():
+            _parse_album_name.cache_clear()
+            splitter.cache.clear()
+            if self.profile and mode == 'cached':
+                self._profile(tags, parse_album, parse_artists)
+            else:
+                start = perf_counter()
+                _parse_all(tags, parse_album, parse_artists)
+                elapsed = perf_counter() - start
+                print(f'{mode:>8s}: {elapsed:7.3f}s ({elapsed / len(tags) * 1_000_000:7.2f} us/track)')
+
+        log.debug(f'AlbumName.parse cache: {_parse_album_name.cache_info()}')
+        log.debug(f'split_artists cache: {splitter.cache}')
+
+    def _profile(self, tags, parse_album, parse_artists):
+        from cProfile import Profile
+        from pstats import Stats
+
+        with Profile() as profiler:
+            _parse_all(tags, parse_album, parse_artists)
+        Stats(profiler).sort_stats('cumulative').print_stats(25)
+
+    def _corpus(self) -> list[tuple[str, str]]:
+        rand = random.Random(self.seed)
+        tags = []
+        for _ in range(self.albums):
+            artist = rand.choice(ARTISTS)
+            album = rand.choice(TEMPLATES).format(
+                title=' '.join(rand.choice(WORDS) for _ in range(rand.randint(1, 3))),
+                kor=rand.choice(KOR_WORDS),
+                ordinal=rand.choice(ORDINALS),
+                artist=rand.choice(ARTISTS),
+                num=rand.randint(1, 12),
+            )
+            tags.extend((album, artist) for _ in range(self.tracks))
+        return tags
+
+
+def _parse_all(tags, parse_album, parse_artists):
+    for album, artist in tags:
+        parse_album(album, artist)
+        parse_artists(artist)
+
+
+if __name__ == '__main__':
+    main()
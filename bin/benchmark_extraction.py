@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+import ast
+import logging
+from pathlib import Path
+from time import perf_counter
+
+from cli_command_parser import Command, Counter, Option, main
+
+from music.text import extraction
+from music.text.extraction import ends_with_enclosed, has_unpaired, partition_enclosed, split_enclosed, strip_enclosed
+
+log = logging.getLogger(__name__)
+TESTS_DIR = Path(__file__).resolve().parents[1].joinpath('tests')
+CORPUS_FILES = ('test_extraction.py', 'test_file_album_parsing.py', 'test_file_artist_parsing.py')
+
+
+class BenchmarkExtraction(Command, description='Benchmark music.text.extraction on strings from the unit tests'):
+    runs: int = Option('-n', default=200, help='Number of passes over the corpus')
+    verbose = Counter('-v', help='Increase logging verbosity (can specify multiple times)')
+
+    def _init_command_(self):
+        from ds_tools.logging import init_logging
+
+        init_logging(self.verbose, log_path=None)
+
+    def main(self):
+        corpus = load_corpus()
+        print(f'Corpus: {len(corpus):,d} strings from {", ".join(CORPUS_FILES)}')
+        cases = {
+            'split_enclosed': lambda text: split_enclosed(text),
+            'split_enclosed(reverse, maxsplit=1)': lambda text: split_enclosed(text, reverse=True, maxsplit=1),
+            'split_enclosed(recurse=1)': lambda text: split_enclosed(text, recurse=1),
+            'partition_enclosed': _partition,
+            'has_unpaired': has_unpaired,
+            'ends_with_enclosed': ends_with_enclosed,
+            'strip_enclosed': strip_enclosed,
+        }
+        for name, func in cases.items():
+            extraction._tokenize.cache_clear()
+            start = perf_counter()
+            for _ in range(self.runs):
+                for text in corpus:
+                    func(text)
+            elapsed = perf_counter() - start
+            per_call = elapsed / (self.runs * len(corpus)) * 1_000_000
+            print(f'{name:>36s}: {elapsed:6.3f}s ({per_call:6.2f} us/call)')
+
+        log.debug(f'Tokenizer cache: {extraction._tokenize.cache_info()}')
+
+
+def _partition(text: str):
+    try:
+        return partition_enclosed(text)
+    except ValueError:
+        return None
+
+
+def load_corpus() -> list[str]:
+    """The unique string literals (other than docstrings / short strings) in the extraction-related test modules"""
+    strings = {}
+    for file_name in CORPUS_FILES:
+        tree = ast.parse(TESTS_DIR.joinpath(file_name).read_text('utf-8'))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and 2 < len(node.value) < 200:
+                strings[node.value] = None
+    return list(strings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+import json
+import logging
+import sys
+from pathlib import Path
+from statistics import median
+from subprocess import check_output
+from time import perf_counter
+
+from cli_command_parser import Command, Counter, Option, main
+
+log = logging.getLogger(__name__)
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_QUERY = 'title~foo bar genre!=pop year>=2020 rating>5 artist NOT contains baz'
+
+# Executed in a fresh interpreter for each run, so import and parser initialization costs are included every time
+CHILD_CODE = """
+import json, sys, time
+start = time.perf_counter()
+import music.cli.plex_manager
+imported = time.perf_counter()
+from music.plex.query_parsing import PLEX_QUERY_GRAMMAR, PlexQuery
+if sys.argv[1] == 'runtime':
+    from lark import Lark
+    PlexQuery.parser = Lark(PLEX_QUERY_GRAMMAR)
+PlexQuery.parse(sys.argv[2])
+print(json.dumps({'import': imported - start, 'parse': time.perf_counter() - imported}))
+""".strip()
+
+
+class BenchmarkFindStartup(Command, description='Benchmark the startup cost of the plex_manager.py find command'):
+    runs: int = Option('-n', default=10, help='Number of runs per mode')
+    query = Option('-q', default=DEFAULT_QUERY, help='The query to parse')
+    verbose = Counter('-v', help='Increase logging verbosity (can specify multiple times)')
+
+    def _init_command_(self):
+        from ds_tools.logging import init_logging
+
+        init_logging(self.verbose, log_path=None)
+
+    def main(self):
+        self._run('cached')  # Ensure the cached grammar exists before timing runs that use it
+        for mode in ('runtime', 'cached'):
+            results = [self._run(mode) for _ in range(self.runs)]
+            print(f'{mode}:')
+            for key in ('import', 'parse', 'total'):
+                values = [result[key] * 1000 for result in results]
+                print(f'  {key:>6s}: min={min(values):7.2f} ms, median={median(values):7.2f} ms')
+
+    def _run(self, mode: str) -> dict[str, float]:
+        start = perf_counter()
+        output = check_output([sys.executable, '-c', CHILD_CODE, mode, self.query], cwd=PROJECT_ROOT.joinpath('lib'))
+        result = json.loads(output.splitlines()[-1])
+        result['total'] = perf_counter() - start
+        log.debug(f'{mode}: {result}')
+        return result
+
+
+if __name__ == '__main__':
+    main()
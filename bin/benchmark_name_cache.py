@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+import logging
+import random
+import tracemalloc
+from time import perf_counter
+
+from cli_command_parser import Command, Counter, Option, main
+
+from music.text.name import _ENCLOSED_CACHE, Name
+
+log = logging.getLogger(__name__)
+
+ENG_WORDS = ('love', 'night', 'dream', 'you', 'summer', 'blue', 'heart', 'star', 'run', 'forever', 'my', 'the')
+KOR_WORDS = ('사랑', '밤', '꿈', '너', '여름', '파란', '마음', '별', '달려', '영원히', '나의')
+SUFFIXES = ('', '', '', ' (Inst.)', ' (Remix)', ' OST')
+
+
+class BenchmarkNameCache(Command, description='Benchmark cached vs uncached Name.from_enclosed parsing'):
+    count: int = Option('-n', default=100_000, help='Number of names to parse')
+    distinct: int = Option('-d', default=10_000, help='Number of distinct values in the synthetic corpus')
+    seed: int = Option('-s', default=1, help='Random seed for the synthetic corpus')
+    verbose = Counter('-v', help='Increase logging verbosity (can specify multiple times)')
+
+    def _init_command_(self):
+        from ds_tools.logging import init_logging
+
+        init_logging(self.verbose, log_path=None)
+
+    def main(self):
+        values = self._corpus()
+        print(f'Parsing {len(values):,d} names ({len(set(values)):,d} distinct values)')
+        for mode, parse in (('uncached', Name._from_enclosed), ('cached', Name.from_enclosed)):
+            _ENCLOSED_CACHE.clear()
+            tracemalloc.start()
+            start = perf_counter()
+            names = [parse(value) for value in values]
+            parsed = perf_counter()
+            for name in names:
+                name.eng_fuzzed_nospace, name.non_eng_nospace, name.eng_lang, name.non_eng_lang  # noqa
+            end = perf_counter()
+            size, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f'{mode:>8s}: parse={parsed - start:6.3f}s derived={end - parsed:6.3f}s total={end - start:6.3f}s'
+                f' retained={size / 1048576:7.2f} MiB peak={peak / 1048576:7.2f} MiB'
+            )
+            del names
+
+        log.debug(f'Cache stats: {_ENCLOSED_CACHE}')
+
+    def _corpus(self) -> list[str]:
+        rand = random.Random(self.seed)
+        distinct = [self._random_title(rand) for _ in range(self.distinct)]
+        return [rand.choice(distinct) for _ in range(self.count)]
+
+    @classmethod
+    def _random_title(cls, rand: random.Random) -> str:
+        eng = ' '.join(rand.choice(ENG_WORDS) for _ in range(rand.randint(1, 4))).title()
+        suffix = rand.choice(SUFFIXES)
+        if rand.random() < 0.5:
+            return eng + suffix
+        kor = ' '.join(rand.choice(KOR_WORDS) for _ in range(rand.randint(1, 3)))
+        return f'{kor} ({eng}){suffix}' if rand.random() < 0.5 else f'{eng} ({kor}){suffix}'
+
+
+if __name__ == '__main__':
+    main()
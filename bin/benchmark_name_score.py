@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+import logging
+import random
+from time import perf_counter
+
+from cli_command_parser import Command, Counter, Option, main
+
+from music.text.name import _ENCLOSED_CACHE, Name, _lang_profile
+
+log = logging.getLogger(__name__)
+
+ENG_WORDS = ('love', 'night', 'dream', 'you', 'summer', 'blue', 'heart', 'star', 'run', 'forever', 'my', 'the')
+KOR_WORDS = ('사랑', '밤', '꿈', '너', '여름', '파란', '마음', '별', '달려', '영원히', '나의')
+SUFFIXES = ('', '', '', ' (Inst.)', ' (Remix)', ' OST')
+
+
+class BenchmarkNameScore(Command, description='Benchmark Name._score for mixed Korean/English titles'):
+    pairs: int = Option('-n', default=50_000, help='Number of Name pairs to score')
+    distinct: int = Option('-d', default=2_000, help='Number of distinct titles in the synthetic corpus')
+    seed: int = Option('-s', default=1, help='Random seed for the synthetic corpus')
+    verbose = Counter('-v', help='Increase logging verbosity (can specify multiple times)')
+
+    def _init_command_(self):
+        from ds_tools.logging import init_logging
+
+        init_logging(self.verbose, log_path=None)
+
+    def main(self):
+        pairs = self._corpus()
+        print(f'Scoring {len(pairs):,d} pairs of names ({self.distinct:,d} distinct titles)')
+        for mode in ('cold', 'warm'):
+            if mode == 'cold':
+                _lang_profile.cache_clear()
+            # Fresh Name objects are used for each run so that only the shared language profiles can be re-used
+            _ENCLOSED_CACHE.clear()
+            names = [(Name._from_enclosed(a), Name._from_enclosed(b)) for a, b in pairs]
+            start = perf_counter()
+            for a, b in names:
+                list(a._score(b))
+            elapsed = perf_counter() - start
+            print(f'{mode:>5s}: {elapsed:7.3f}s ({elapsed / len(names) * 1_000_000:7.2f} us/pair)')
+
+        log.debug(f'Language profile cache: {_lang_profile.cache_info()}')
+
+    def _corpus(self) -> list[tuple[str, str]]:
+        rand = random.Random(self.seed)
+        distinct = [self._random_title(rand) for _ in range(self.distinct)]
+        return [(rand.choice(distinct), rand.choice(distinct)) for _ in range(self.pairs)]
+
+    @classmethod
+    def _random_title(cls, rand: random.Random) -> str:
+        eng = ' '.join(rand.choice(ENG_WORDS) for _ in range(rand.randint(1, 4))).title()
+        kor = ' '.join(rand.choice(KOR_WORDS) for _ in range(rand.randint(1, 3)))
+        suffix = rand.choice(SUFFIXES)
+        return f'{kor} ({eng}){suffix}' if rand.random() < 0.5 else f'{eng} ({kor}){suffix}'
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from functools import cached_property, partial
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Iterator
 
@@ -107,6 +107,9 @@ class SyncRatings(PlexManager, choice='sync ratings', help='Sync song rating inf
     direction = Positional(choices=('to_files', 'from_files'), help='Direction to sync information')
     path_filter = Option('-f', help='Only sync tracks with paths that contain the given text (not case sensitive)')
     parallel: int = Option('-P', default=4, help='Number of workers to use in parallel')
+    incremental = Flag(
+        '-i', help='Skip tracks whose files and Plex ratings were not modified since they were last synced'
+    )
 
     with ParamGroup(mutually_exclusive=True):
         before = Option('-b', type=Date(), help='Only sync files last modified before this date')
@@ -120,59 +123,52 @@ class SyncRatings(PlexManager, choice='sync ratings', help='Sync song rating inf
 
         before = self.before_days or self.before
         after = self.after_days or self.after
-        rs = RatingSynchronizer(self.plex, self.path_filter, self.parallel, mod_before=before, mod_after=after)
+        rs = RatingSynchronizer(
+            self.plex, self.path_filter, self.parallel, mod_before=before, mod_after=after, incremental=self.incremental
+        )
         rs.sync(self.direction == 'from_files')
 
 
 class SyncPlaylists(PlexManager, choice='sync playlists', help='Sync playlists with custom filters'):
+    parallel: int = Option('-P', default=4, help='Number of workers to use in parallel')
+
     def main(self):
-        from music.plex.playlist import PlexPlaylist
+        from music.plex.playlist import PlaylistSyncPlanner
 
         kpop_tracks = self.plex.query('track', mood__ne='Duplicate Rating')
-        playlist = partial(PlexPlaylist, plex=self.plex, externally_synced=True)
-
-        playlist('K-Pop Female Solo Artists 3+ Stars').sync_or_create(
-            query=kpop_tracks.filter(
+        unrated_filters = {
+            'userRating': 0,
+            'genre__like_exact': 'k-?pop',
+            'genre__not_like': 'christmas',
+            'title__not_like': r'(?:^|\()(?:intro|outro)(?:$|\s|:|\))|\(inst(?:\.?|rumental)|(?:japanese|jp|karaoke|mandarin|chinese) ver(?:\.|sion)|christmas|santa|remix|snow',
+            'parentTitle__not_like': 'christmas|santa',
+            'duration__gte': 60000,
+        }
+        rules = {
+            'K-Pop Female Solo Artists 3+ Stars': kpop_tracks.filter(
                 userRating__gte=6,
                 grandparentTitle__like=r'taeyeon|chungha|younha|heize|rothy|sunmi|ailee|lee hi|jo yuri|seori|\biu\b|choi ye.?na|yuju|baek ji young|gummy|yuqi|hong jin young|bibi|hyori|hyolyn|yourbeagle|wendy|whee in|hwa sa|minnie|joy|seulgi|siyeon',
-            )
-        )
-        playlist('K-Pop ALL').sync_or_create(query=kpop_tracks)
-        playlist('K-Pop 1 Star').sync_or_create(query=kpop_tracks.filter(userRating=2))
-        # playlist('K-Pop 1\u00BD Star').sync_or_create(query=kpop_tracks.filter(userRating=3))
-        playlist('K-Pop 2 Stars').sync_or_create(query=kpop_tracks.filter(userRating=4))
-        # playlist('K-Pop 2\u00BD Stars').sync_or_create(query=kpop_tracks.filter(userRating=5))
-        playlist('K-Pop 3 Stars').sync_or_create(query=kpop_tracks.filter(userRating=6))
-        playlist('K-Pop 3+ Stars').sync_or_create(query=kpop_tracks.filter(userRating__gte=6))
-        playlist('K-Pop 3\u00BD Stars').sync_or_create(query=kpop_tracks.filter(userRating=7))
-        playlist('K-Pop 3\u00BD+ Stars').sync_or_create(query=kpop_tracks.filter(userRating__gte=7))
-        playlist('K-Pop 4 Stars').sync_or_create(query=kpop_tracks.filter(userRating=8))
-        playlist('K-Pop 4+ Stars').sync_or_create(query=kpop_tracks.filter(userRating__gte=8))
-        playlist('K-Pop 4~4\u00BD Stars').sync_or_create(
-            query=kpop_tracks.filter(userRating__gte=8, userRating__lte=9)
-        )
-        playlist('K-Pop 4\u00BD Stars').sync_or_create(query=kpop_tracks.filter(userRating=9))
-        playlist('K-Pop 5 Stars').sync_or_create(query=kpop_tracks.filter(userRating__gte=10))
-        playlist('K-Pop Unrated').sync_or_create(
-            query=kpop_tracks.filter(
-                userRating=0,
-                genre__like_exact='k-?pop',
-                genre__not_like='christmas',
-                title__not_like=r'(?:^|\()(?:intro|outro)(?:$|\s|:|\))|\(inst(?:\.?|rumental)|(?:japanese|jp|karaoke|mandarin|chinese) ver(?:\.|sion)|christmas|santa|remix|snow',
-                parentTitle__not_like='christmas|santa',
-                duration__gte=60000,
-            ).unique()
-        )
-        playlist('K-Pop Unrated from Known Artists').sync_or_create(
-            query=kpop_tracks.filter(userRating__gte=6).artists().tracks().filter(
-                userRating=0,
-                genre__like_exact='k-?pop',
-                genre__not_like='christmas',
-                title__not_like=r'(?:^|\()(?:intro|outro)(?:$|\s|:|\))|\(inst(?:\.?|rumental)|(?:japanese|jp|karaoke|mandarin|chinese) ver(?:\.|sion)|christmas|santa|remix|snow',
-                parentTitle__not_like='christmas|santa',
-                duration__gte=60000,
-            ).unique()
-        )
+            ),
+            'K-Pop ALL': kpop_tracks,
+            'K-Pop 1 Star': kpop_tracks.filter(userRating=2),
+            # 'K-Pop 1\u00BD Star': kpop_tracks.filter(userRating=3),
+            'K-Pop 2 Stars': kpop_tracks.filter(userRating=4),
+            # 'K-Pop 2\u00BD Stars': kpop_tracks.filter(userRating=5),
+            'K-Pop 3 Stars': kpop_tracks.filter(userRating=6),
+            'K-Pop 3+ Stars': kpop_tracks.filter(userRating__gte=6),
+            'K-Pop 3\u00BD Stars': kpop_tracks.filter(userRating=7),
+            'K-Pop 3\u00BD+ Stars': kpop_tracks.filter(userRating__gte=7),
+            'K-Pop 4 Stars': kpop_tracks.filter(userRating=8),
+            'K-Pop 4+ Stars': kpop_tracks.filter(userRating__gte=8),
+            'K-Pop 4~4\u00BD Stars': kpop_tracks.filter(userRating__gte=8, userRating__lte=9),
+            'K-Pop 4\u00BD Stars': kpop_tracks.filter(userRating=9),
+            'K-Pop 5 Stars': kpop_tracks.filter(userRating__gte=10),
+            'K-Pop Unrated': kpop_tracks.filter(**unrated_filters).unique(),
+            'K-Pop Unrated from Known Artists': (
+                kpop_tracks.filter(userRating__gte=6).artists().tracks().filter(**unrated_filters).unique()
+            ),
+        }
+        PlaylistSyncPlanner(self.plex, rules, parallel=self.parallel).sync()
 
 
 # endregion
@@ -276,11 +272,21 @@ class Compare(Playlist, help='Compare playlists'):
     path = Positional(help='Playlist dump location')
     playlist = Option('-p', help='Compare the specified playlist (default: all)')
     strict = Flag('-s', help='Perform a strict comparison (default: by artist/album/title)')
+    json = Flag(
+        '-j',
+        help='Print a machine-readable JSON list of differences instead of human-readable output.  Each entry has a'
+        ' status of deleted, changed, or unchanged (or created, with --include-created)',
+    )
+    include_created = Flag(
+        '-c', help='Also report playlists on the server that are not in the backup (default: backup playlists only)'
+    )
 
     def main(self, *args, **kwargs):
         from music.plex.playlist import compare_playlists
 
-        compare_playlists(self.plex, self.path, self.playlist, self.strict)
+        compare_playlists(
+            self.plex, self.path, self.playlist, self.strict, as_json=self.json, include_created=self.include_created
+        )
 
 
 class Show(Playlist, help='Show a playlist and its contents'):
@@ -297,10 +303,11 @@ class Show(Playlist, help='Show a playlist and its contents'):
         if self.path:
             from music.plex.playlist import PlexPlaylist
 
-            playlists = PlexPlaylist.load_all(self.path, self.plex)
             if self.name:
-                return playlists[self.name]
-            elif len(playlists) == 1:
+                return PlexPlaylist.load_one(self.path, self.name, self.plex)
+
+            playlists = PlexPlaylist.load_all(self.path, self.plex)
+            if len(playlists) == 1:
                 return next(iter(playlists.values()))
             else:
                 raise ParamUsageError(
@@ -367,10 +374,11 @@ class Restore(Playlist, help='Restore a playlist backup', use_log_file=True):
     def _get_playlist(self) -> PlexPlaylist:
         from music.plex.playlist import PlexPlaylist
 
-        playlists = PlexPlaylist.load_all(self.path, self.plex)
         if self.name:
-            return playlists[self.name]
-        elif len(playlists) == 1:
+            return PlexPlaylist.load_one(self.path, self.name, self.plex)
+
+        playlists = PlexPlaylist.load_all(self.path, self.plex)
+        if len(playlists) == 1:
             return next(iter(playlists.values()))
         else:
             raise ParamUsageError(
@@ -405,7 +413,7 @@ class ShowMissingAnalysis(
         from ds_tools.output.table import Table, SimpleColumn as Col
         from music.plex.db import PlexDB
 
-        db = PlexDB.from_remote_server(max_age=self.max_age)
+        db = PlexDB.from_remote_server(max_age=self.max_age, optimize=True)
         if self.format == 'table':
             columns = ('lib_section', 'artist_id', 'artist', 'album_id', 'album', 'track_num', 'track', 'track_id')
             table = Table(*(Col(c) for c in columns), sort_by=columns[:3], sort=True, update_width=True)
@@ -7,7 +7,7 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass, InitVar, fields
-from functools import cached_property, reduce
+from functools import cached_property, lru_cache, partial, reduce
 from operator import xor
 from typing import Iterator, Sequence, Collection, Union, MutableSequence, Optional, Iterable, Pattern
 
@@ -15,12 +15,14 @@ from ds_tools.unicode.languages import LangCat
 from ds_tools.unicode.hangul.constants import HANGUL_REGEX_CHAR_CLASS
 from ..common.disco_entry import DiscoEntryType
 from ..text.extraction import split_enclosed, has_unpaired, ends_with_enclosed, get_unpaired, strip_unpaired
-from ..text.name import Name, sort_name_parts
+from ..text.name import Name, NameCache, sort_name_parts
 from ..text.utils import find_ordinal, NumberParser, parse_int_words
 
 __all__ = ['AlbumName', 'split_artists', 'UnexpectedListFormat']
 log = logging.getLogger(__name__)
 
+# The max number of distinct (album text, artist text) values for which AlbumName.parse results are cached
+ALBUM_NAME_CACHE_SIZE = 10_000
 ATTR_NAMES = {'alb_type': 'type', 'sm_station': 'SM', 'version': 'ver', 'alb_num': 'num', 'ost': 'OST'}
 APOSTROPHES = "'`՚՛՜՝‘’"
 CHANNELS = ('sbs', 'kbs', 'tvn', 'mbc')
@@ -87,6 +89,11 @@ class AlbumName:
     def __parts(self):
         return tuple(getattr(self, attr) for attr in _fields(self))
 
+    def __setattr__(self, key: str, value):
+        if self.__dict__.get('_read_only'):
+            raise AttributeError(f'Unable to set {key!r} - parsed {self.__class__.__name__} objects are read-only')
+        super().__setattr__(key, value)
+
     def __hash__(self) -> int:
         return hash(self.__class__) ^ reduce(xor, map(hash, self.__parts))
 
@@ -119,6 +126,33 @@ class AlbumName:
 
     @classmethod
     def parse(cls, name: str, artist: str = None) -> AlbumName:
+        """
+        Parse the given album name (such as the value of a track's album tag).  Results are cached, since all of the
+        tracks in an album typically have the same tags.  Parsed AlbumNames are read-only.  Each call returns a new
+        AlbumName whose Names are copies of the cached ones (similar to the copies returned by :class:`.NameCache`),
+        so modifying them does not affect the results of other calls.
+
+        :param name: The album name to parse
+        :param artist: The artist name for the album, if known (used to distinguish the album's artist from
+          collaborators / featured artists)
+        :return: The parsed AlbumName
+        """
+        return _parse_album_name(cls, name, artist)._copy()
+
+    def _copy(self) -> AlbumName:
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.__dict__.pop('_AlbumName__parts', None)
+        for attr in ('name', 'song_name'):
+            if (name := clone.__dict__.get(attr)) is not None:
+                clone.__dict__[attr] = name._interned_copy()
+        for attr in ('feat', 'collabs'):
+            if names := clone.__dict__.get(attr):
+                clone.__dict__[attr] = tuple(name._interned_copy() for name in names)
+        return clone
+
+    @classmethod
+    def _parse(cls, name: str, artist: str = None) -> AlbumName:
         self = cls.__new__(cls)                                         # type: AlbumName
         artist = Name.from_enclosed(artist) if artist else None         # type: Optional[Name]
 
@@ -161,6 +195,7 @@ class AlbumName:
         self.name = Name(*sort_name_parts(name_parts))
         if versions:
             self.name.update(versions=set(versions))
+        self.__dict__['_read_only'] = True
         return self
 
     def _process_name_parts(self, parts, artist, name):
@@ -353,7 +388,17 @@ def fix_apostrophes(text: str) -> str:
 
 
 class _ArtistSplitter:
+    def __init__(self, cache_size: int = 10_000):
+        self.cache = NameCache(cache_size)
+
     def split_artists(self, text: str) -> list[Name]:
+        """
+        Results are cached, so repeated values are only parsed once.  A new list of new Names is returned each time, so
+        the returned Names may be modified freely.
+        """
+        return self.cache.get(text, partial(self._split_artists_with_retry, text))
+
+    def _split_artists_with_retry(self, text: str) -> list[Name]:
         try:
             return self._split_artists(text)
         except UnexpectedListFormat:
@@ -535,6 +580,11 @@ class _ArtistSplitter:
 split_artists = _ArtistSplitter().split_artists
 
 
+@lru_cache(ALBUM_NAME_CACHE_SIZE)
+def _parse_album_name(cls, name: str, artist: str | None) -> AlbumName:
+    return cls._parse(name, artist)
+
+
 def _langs_match(parts):
     iparts = iter(parts)
     lang = LangCat.categorize(next(iparts))
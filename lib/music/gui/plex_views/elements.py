@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from functools import cached_property
 from itertools import count
@@ -8,6 +11,7 @@ from math import ceil
 from operator import itemgetter
 from pathlib import Path
 from tempfile import gettempdir
+from threading import RLock
 from typing import TYPE_CHECKING, Union, Collection, Optional, Iterable
 from urllib.parse import quote
 
@@ -15,7 +19,8 @@ from cachetools import LRUCache
 from FreeSimpleGUI import Column, HorizontalSeparator, Image
 from plexapi.audio import Track, Album, Artist
 from plexapi.video import Movie, Show, Season, Episode
-from requests import RequestException
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
 
 from ds_tools.images.utils import ImageType, as_image, scale_image
 from ...common.ratings import stars
@@ -65,36 +70,110 @@ DEFAULT_SORT_FIELDS = {
 
 
 class ImageCache:
-    def __init__(self, cache_dir: Union[str, Path] = None, size: int = 100):
+    """
+    Cache for Plex object images, with an in-memory LRU cache of loaded images, and a disk cache of downloaded images
+    and generated thumbnails.  When the total size of the files in the disk cache exceeds ``max_disk_bytes``, the least
+    recently used files are deleted.
+
+    Images can be retrieved in the background via :meth:`prefetch`, which uses a small thread pool that shares a
+    pooled HTTP session, so images for a full page of results are retrieved concurrently.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = None,
+        size: int = 100,
+        max_disk_bytes: int = 256 * 1024 ** 2,
+        workers: int = 4,
+    ):
         self.icons_dir = Path(__file__).resolve().parents[4].joinpath('icons')
         if cache_dir is None:
             self.cache_dir = Path(gettempdir()).joinpath('plex', 'images')
         else:
             self.cache_dir = Path(cache_dir).expanduser()
         self.mem_cache = LRUCache(size)
+        self.max_disk_bytes = max_disk_bytes
+        self.workers = workers
+        self._lock = RLock()
+        self._pending: dict[tuple[str, tuple[int, int]], Future] = {}
+        self._disk_index: Optional[OrderedDict[Path, int]] = None
+        self._disk_bytes = 0
+
+    @cached_property
+    def _executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='plex_image_prefetch')
+
+    @cached_property
+    def _session(self) -> Session:
+        session = Session()
+        adapter = HTTPAdapter(pool_maxsize=self.workers + 1)  # +1 for requests made by the main thread
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
 
     def get_images(self, plex_obj: PlexObj, img_size: tuple[int, int]) -> ImageOrImages:
-        full_rel_path: str = plex_obj.thumb[1:]
-        cache_key = (full_rel_path, img_size)
+        cache_key = (plex_obj.thumb[1:], img_size)
+        with self._lock:
+            try:
+                images = self.mem_cache[cache_key]
+            except KeyError:
+                future = self._pending.get(cache_key)
+            else:
+                if _files_exist(images):
+                    return images
+                del self.mem_cache[cache_key]  # A file was evicted from the disk cache
+                future = None
+
+        if future is not None:
+            return future.result()
+        return self._load(plex_obj, cache_key)
+
+    def prefetch(self, plex_objs: Iterable[PlexObj], img_size: tuple[int, int]):
+        """Retrieve images for the given objects in the background so they are ready by the time they are needed"""
+        with self._lock:
+            for plex_obj in plex_objs:
+                cache_key = (plex_obj.thumb[1:], img_size)
+                if cache_key not in self.mem_cache and cache_key not in self._pending:
+                    self._pending[cache_key] = self._executor.submit(self._load, plex_obj, cache_key)
+
+    def cancel_prefetch(self):
+        """Cancel any pending prefetch requests that have not started yet"""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            # Cancelled futures never run, so they would not remove themselves
+            self._pending = {key: future for key, future in self._pending.items() if not future.cancelled()}
+
+    def _load(self, plex_obj: PlexObj, cache_key: tuple[str, tuple[int, int]]) -> ImageOrImages:
         try:
-            return self.mem_cache[cache_key]
-        except KeyError:
-            pass
-
-        self.mem_cache[cache_key] = images = self._get_images(plex_obj, full_rel_path, img_size)
-        return images
+            images = self._get_images(plex_obj, *cache_key)
+            with self._lock:
+                self.mem_cache[cache_key] = images
+            return images
+        finally:
+            with self._lock:
+                self._pending.pop(cache_key, None)
 
     def _get_images(self, plex_obj: PlexObj, full_rel_path: str, img_size: tuple[int, int]) -> ImageOrImages:
         full_size_path = self.cache_dir.joinpath(full_rel_path)
         thumb_path = full_size_path.with_name('{}__{}x{}'.format(full_size_path.name, *img_size))
-        if self._can_use_thumb_path(thumb_path):
-            return thumb_path, full_size_path
-        elif full_size_path.exists():
-            return convert_and_save_thumbnail(full_size_path, thumb_path, img_size), full_size_path
+        # Existing files are marked as the most recently used before they are read, so other workers will not evict them
+        self._touch(thumb_path, full_size_path)
+        try:
+            if self._can_use_thumb_path(thumb_path):
+                return thumb_path, full_size_path
+            elif full_size_path.exists():
+                thumbnail = convert_and_save_thumbnail(full_size_path, thumb_path, img_size)
+                self._touch(full_size_path, thumb_path)
+                return thumbnail, full_size_path
+        except FileNotFoundError as e:
+            log.debug(f'Cached image for {plex_obj} was removed before it could be used - downloading it again: {e}')
 
         server = plex_obj._server
         try:
-            resp: Response = server._session.get(server.url(plex_obj.thumb), headers=server._headers())
+            resp: Response = self._session.get(
+                server.url(plex_obj.thumb), headers=server._headers(), verify=server._session.verify
+            )
             resp.raise_for_status()
         except RequestException as e:
             log.debug(f'Error retrieving image for {plex_obj}: {e}')
@@ -102,7 +181,9 @@ class ImageCache:
         else:
             log.debug(f'Saving image for {plex_obj} to {full_size_path.as_posix()}')
             save_image(resp.content, full_size_path)
-            return convert_and_save_thumbnail(resp.content, thumb_path, img_size), full_size_path
+            thumbnail = convert_and_save_thumbnail(resp.content, thumb_path, img_size)
+            self._touch(full_size_path, thumb_path)
+            return thumbnail, full_size_path
 
     @classmethod
     def _can_use_thumb_path(cls, path: Path) -> bool:
@@ -113,6 +194,52 @@ class ImageCache:
             return False
         return True
 
+    # region Disk Cache Size Management
+
+    def _get_disk_index(self) -> OrderedDict[Path, int]:
+        if self._disk_index is None:
+            entries = []
+            for root, dirs, files in os.walk(self.cache_dir):
+                for file in files:
+                    try:
+                        stat = (path := Path(root, file)).stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path, stat.st_size))
+
+            entries.sort(key=itemgetter(0))  # Least recently used first; mtimes are updated when files are used
+            self._disk_index = OrderedDict((path, size) for _, path, size in entries)
+            self._disk_bytes = sum(self._disk_index.values())
+            log.debug(f'Found {len(entries):,d} files ({self._disk_bytes:,d} B) in {self.cache_dir.as_posix()}')
+        return self._disk_index
+
+    def _touch(self, *paths: Path):
+        """Mark the given files as the most recently used, then evict the least recently used files if necessary"""
+        with self._lock:
+            index = self._get_disk_index()
+            for path in paths:
+                try:
+                    os.utime(path)
+                    size = path.stat().st_size
+                except OSError:
+                    continue
+                self._disk_bytes += size - index.pop(path, 0)
+                index[path] = size
+
+            while self._disk_bytes > self.max_disk_bytes and len(index) > len(paths):
+                path, size = index.popitem(last=False)
+                log.debug(f'Evicting {path.as_posix()} from the image cache')
+                path.unlink(missing_ok=True)
+                self._disk_bytes -= size
+
+    # endregion
+
+
+def _files_exist(images: ImageOrImages) -> bool:
+    if not isinstance(images, tuple):
+        images = (images,)
+    return all(image.exists() for image in images if isinstance(image, Path))
+
 
 class Result:
     def __init__(self, plex_obj: PlexObj):
@@ -325,6 +452,10 @@ class ResultTable(Column):
         end = start + per_page if page < pages else self.result_count
         self.last_page_count = total = end - start
         log.debug(f'Showing {page=} with {total}/{self.result_count} results ({start} - {end})')
+        # Images for the current page are retrieved concurrently, followed by images for the next page
+        img_cache, img_size = ResultRow._img_cache, self.rows[0].img_size
+        img_cache.cancel_prefetch()
+        img_cache.prefetch((result.plex_obj for result in self.results[start:end + per_page]), img_size)
         for row, obj in zip(self.rows, self.results[start:end]):
             row.update(obj)
 
@@ -350,6 +481,7 @@ class ResultTable(Column):
             self.show_page(1)
 
     def clear_results(self):
+        ResultRow._img_cache.cancel_prefetch()
         self.results = None
         self.result_count = 0
         if self.last_page_count:
@@ -197,6 +197,8 @@ class PlexConfig(ClearableCachedPropertyMixin):
     db_remote_dir: Path | None = ConfigEntry('custom.db', 'remote_db_dir')
     db_remote_user: str | None = ConfigEntry('custom.db', 'remote_user')
     db_remote_host: str | None = ConfigEntry('custom.db', 'remote_host')
+    #: The command used to run the helper that computes block hashes on the server for delta transfers of the DB
+    db_remote_python: str = ConfigEntry('custom.db', 'remote_python', default='python3')
 
     def __init__(self, path: PathLike = DEFAULT_CONFIG_PATH, dry_run: bool = False):
         self._temp_overrides = {}  # Overrides that should be used, but not saved
@@ -6,16 +6,17 @@ from __future__ import annotations
 
 import logging
 from collections import Counter, defaultdict
-from contextlib import closing
+from contextlib import closing, contextmanager
 from datetime import datetime
 from enum import Enum
 from functools import cached_property
 from pathlib import Path
-from sqlite3 import Row, connect
-from typing import TYPE_CHECKING, Union, Iterable, Any
+from sqlite3 import DatabaseError, Row, connect
+from time import monotonic
+from typing import TYPE_CHECKING, Union, Iterable, Iterator, Any
 from urllib.parse import parse_qsl, parse_qs
 
-from paramiko import SSHClient, AutoAddPolicy
+from paramiko import SSHClient, AutoAddPolicy, SSHException
 from scp import SCPClient
 
 from ds_tools.fs.paths import get_user_temp_dir
@@ -23,10 +24,13 @@ from ds_tools.output.formatting import readable_bytes, format_duration
 
 from music.common.utils import MissingMixin
 from .config import config
+from .db_query import DBQuery, register_functions
+from .db_transfer import DeltaTransferError, delta_fetch, integrity_check
 
 if TYPE_CHECKING:
     from plexapi.audio import Track
     from .server import LocalPlexServer
+    from .typing import PlexObjTypes
 
 __all__ = ['PlexDB', 'StreamType']
 log = logging.getLogger(__name__)
@@ -63,27 +67,109 @@ Meta_Type = Union[MetaType, str, int]
 
 # endregion
 
+# Indexes that cover the join paths used by queries in this module (only created in read-optimized mode)
+_INDEXES = {
+    'mm_media_streams_type_item': ('media_streams', ('stream_type_id', 'media_item_id', 'codec')),
+    'mm_media_items_metadata_item': ('media_items', ('metadata_item_id', 'library_section_id', 'size', 'duration')),
+    'mm_media_parts_media_item': ('media_parts', ('media_item_id', 'file')),
+    'mm_metadata_items_type_parent': ('metadata_items', ('metadata_type', 'parent_id', 'library_section_id')),
+    'mm_metadata_item_settings_guid': ('metadata_item_settings', ('guid', 'account_id', 'rating', 'last_rated_at')),
+    'mm_taggings_item_tag': ('taggings', ('metadata_item_id', 'tag_id')),
+}
+
 
 class PlexDB:
-    def __init__(self, db_path: Union[str, Path], execute_log_level: int = 9):
+    """
+    :param db_path: Path to a copy of Plex's DB
+    :param execute_log_level: Log level to use for logging executed queries and their timings
+    :param optimize: Whether the DB should be opened in a read-optimized mode.  Only intended to be used with a
+      throwaway copy of the DB, since it creates indexes for the join paths used by the queries in this class.  The
+      connection is then made read-only, memory mapping and a larger page cache are enabled, and values that are
+      parsed from ``media_streams.extra_data`` by UDFs are computed once and stored in a temporary table.
+    """
+
+    def __init__(self, db_path: Union[str, Path], execute_log_level: int = 9, optimize: bool = False):
         db_path = Path(db_path).expanduser().resolve()
         self.db_path = db_path
-        self.db = connect(db_path.as_posix())
+        self.db = connect(db_path.as_posix(), cached_statements=256 if optimize else 128)
         self.db.row_factory = Row
         self.db.create_function('num_loudness_keys', 1, num_loudness_keys, deterministic=True)
         self.db.create_function('video_height_lte_720', 1, video_height_lte_720, deterministic=True)
         self.db.create_function('video_resolution', 1, video_resolution, deterministic=True)
+        register_functions(self.db)
         self.execute_log_level = execute_log_level
+        self.optimize = optimize
+        if optimize:
+            self._optimize()
+
+    def _optimize(self):
+        start = monotonic()
+        for name, (table, columns) in _INDEXES.items():
+            try:
+                self.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({", ".join(columns)})')
+            except DatabaseError as e:  # Tables may be missing in older / newer DB versions
+                log.debug(f'Unable to create index {name} on {table}: {e}')
+
+        mmap_size = max(self.db_path.stat().st_size, 256 * 1024 * 1024)
+        for pragma in (f'mmap_size = {mmap_size}', 'cache_size = -131072', 'temp_store = MEMORY', 'query_only = 1'):
+            self.execute(f'PRAGMA {pragma}')
+
+        log.log(self.execute_log_level, f'Prepared read-optimized DB in {format_duration(monotonic() - start)}')
+
+    @cached_property
+    def _stream_info_table(self) -> str:
+        """
+        Stores the results of the extra_data UDFs in a temp table, so each stream's extra_data is only parsed once,
+        regardless of how many queries use it.  The ``query_only`` pragma also applies to temp tables, so it is only
+        disabled while this table is being populated.
+        """
+        table = 'temp.stream_info'
+        self.execute('PRAGMA query_only = 0')
+        self.execute(
+            f'CREATE TABLE {table} ('
+            ' id INTEGER PRIMARY KEY, num_loudness_keys INTEGER, video_height_lte_720 INTEGER, video_resolution TEXT'
+            ')'
+        )
+        video, audio = StreamType.VIDEO.value, StreamType.AUDIO.value
+        self.execute(
+            f'INSERT INTO {table}'
+            f' SELECT id, CASE WHEN stream_type_id = {audio} THEN num_loudness_keys(extra_data) END,'
+            f' CASE WHEN stream_type_id = {video} THEN video_height_lte_720(extra_data) END,'
+            f' CASE WHEN stream_type_id = {video} THEN video_resolution(extra_data) END'
+            f' FROM media_streams WHERE stream_type_id IN ({video}, {audio})'
+        )
+        self.execute('PRAGMA query_only = 1')
+        return table
+
+    def _stream_value(self, func: str) -> str:
+        """
+        :param func: The name of a registered function that accepts ``media_streams.extra_data``
+        :return: The expression to use in a query to get the result of that function for each row
+        """
+        if self.optimize:
+            return f'{self._stream_info_table}.{func}'
+        return f'{func}(media_streams.extra_data)'
+
+    def _prepare_from_and_filters(self, stream_type: Stream_Type, *metadata_types: Meta_Type) -> str:
+        query = _prepare_from_and_filters(stream_type, *metadata_types)
+        if not self.optimize:
+            return query
+        table = self._stream_info_table
+        join = f'\nINNER JOIN {table} ON {table}.id = media_streams.id'
+        return query.replace('\nWHERE ', join + '\nWHERE ', 1)
 
     @classmethod
-    def from_remote_server(cls, name: str = DEFAULT_FILE_NAME, max_age: int = 180, **kwargs) -> PlexDB:
+    def from_remote_server(
+        cls, name: str = DEFAULT_FILE_NAME, max_age: int = 180, delta: bool = True, **kwargs
+    ) -> PlexDB:
         """
         SCPs the db file from the server to a local path, then initializes this class with that file.
 
         Uses SCP instead of ``PlexServer.downloadDatabases()`` because SCP is faster.  The REST call is relatively slow,
-        and requires an extra decompression step.
+        and requires an extra decompression step.  When a local copy already exists, only the blocks that changed on
+        the server are retrieved by default (see :func:`.delta_fetch`).
         """
-        path = get_db_file(name, max_age)
+        path = get_db_file(name, max_age, delta)
         return cls(path, **kwargs)
 
     def execute(self, *args, **kwargs):
@@ -93,7 +179,20 @@ class PlexDB:
         """
         with self.db:
             log.log(self.execute_log_level, 'Executing SQL: {}'.format(', '.join(map('"{}"'.format, args))))
-            return self.db.execute(*args, **kwargs)
+            start = monotonic()
+            cursor = self.db.execute(*args, **kwargs)
+            log.log(self.execute_log_level, f'Executed SQL in {format_duration(monotonic() - start)}')
+            return cursor
+
+    def fetch_all(self, *args, **kwargs) -> list[Row]:
+        """
+        Executes the given query and returns all resulting rows.  Unlike :meth:`.execute`, the logged timing includes
+        the time spent retrieving every row, since SQLite lazily evaluates most of each query while rows are fetched.
+        """
+        start = monotonic()
+        rows = self.execute(*args, **kwargs).fetchall()
+        log.log(self.execute_log_level, f'Fetched {len(rows):,d} rows in {format_duration(monotonic() - start)}')
+        return rows
 
     @cached_property
     def table_names(self) -> tuple[str]:
@@ -118,6 +217,25 @@ class PlexDB:
     def library_sections(self) -> dict[int, dict[str, Any]]:
         return {row['id']: dict(row) for row in self.execute('SELECT * from library_sections')}
 
+    def query(self, obj_type: PlexObjTypes = 'track', section: int | str = None, **kwargs) -> list[Row]:
+        """
+        Query this DB using the same filters that are supported by :meth:`.QueryResults.filter`.  See
+        :class:`.DBQuery` for more info.
+
+        :param obj_type: The type of object to query (track, album, or artist)
+        :param section: The ID or name of the library section to query (optional)
+        :param kwargs: Filters to apply
+        :return: List of rows that contain the same fields as the attributes of elements in Plex's XML responses
+        """
+        if isinstance(section, str):
+            try:
+                section = next(sid for sid, row in self.library_sections.items() if row['name'] == section)
+            except StopIteration as e:
+                raise ValueError(f'Invalid library {section=}') from e
+
+        query, params = DBQuery(obj_type, section).build(**kwargs)
+        return self.fetch_all(query, params)
+
     def find_media_streams(self, stream_type: Stream_Type):
         params = (StreamType(stream_type).value,)
         query = 'SELECT id, media_item_id, media_part_id, extra_data FROM media_streams WHERE stream_type_id=?'
@@ -170,29 +288,29 @@ class PlexDB:
         query = (
             'SELECT'
             ' movies.id AS movie_id,  movies.title AS movie,'
-            ' video_resolution(media_streams.extra_data) as resolution,'
+            f' {self._stream_value("video_resolution")} as resolution,'
             ' media_items.size as size,'
             ' library_sections.id AS lib_section_id,  library_sections.name AS lib_section'
         )
-        query += _prepare_from_and_filters(StreamType.VIDEO, MetaType.MOVIE)
+        query += self._prepare_from_and_filters(StreamType.VIDEO, MetaType.MOVIE)
         if low_resolution:
-            query += ' AND video_height_lte_720(media_streams.extra_data)'
-        return self.execute(query)
+            query += f' AND {self._stream_value("video_height_lte_720")}'
+        return self.fetch_all(query)
 
     def find_movies_by_codec(self, codec: str = None):
         query = (
             'SELECT'
             ' movies.id AS movie_id,  movies.title AS movie,  media_streams.codec AS codec,'
-            ' video_resolution(media_streams.extra_data) as resolution,'
+            f' {self._stream_value("video_resolution")} as resolution,'
             ' media_items.size as size_b,  media_items.duration as duration_ms,'
             ' library_sections.id AS lib_section_id,  library_sections.name AS lib_section'
         )
-        query += _prepare_from_and_filters(StreamType.VIDEO, MetaType.MOVIE)
+        query += self._prepare_from_and_filters(StreamType.VIDEO, MetaType.MOVIE)
         if codec:
             query += ' AND codec=?'
-            rows = [dict(row) for row in self.execute(query, (codec,))]
+            rows = [dict(row) for row in self.fetch_all(query, (codec,))]
         else:
-            rows = [dict(row) for row in self.execute(query)]
+            rows = [dict(row) for row in self.fetch_all(query)]
 
         for row in rows:
             row['size'] = readable_bytes(row['size_b'])
@@ -217,13 +335,13 @@ class PlexDB:
             ' episodes.id AS episode_id,  episodes."index" AS episode_num,  episodes.title AS episode_title,'
             ' seasons.id AS season_id,    seasons."index" AS season_num,'
             ' shows.id AS show_id,        shows.title AS show,'
-            ' video_resolution(media_streams.extra_data) as resolution,'
+            f' {self._stream_value("video_resolution")} as resolution,'
             ' library_sections.id AS lib_section_id, library_sections.name AS lib_section'
         )
-        query += _prepare_from_and_filters(StreamType.VIDEO, MetaType.EPISODE, MetaType.SEASON, MetaType.SHOW)
+        query += self._prepare_from_and_filters(StreamType.VIDEO, MetaType.EPISODE, MetaType.SEASON, MetaType.SHOW)
         if low_resolution:
-            query += ' AND video_height_lte_720(media_streams.extra_data)'
-        return self.execute(query)
+            query += f' AND {self._stream_value("video_height_lte_720")}'
+        return self.fetch_all(query)
 
     def find_low_res_show_name_map(self) -> dict[str, dict[str, dict[str, Union[str, None]]]]:
         shows = {}
@@ -258,10 +376,9 @@ class PlexDB:
             ' artists.id AS artist_id,  artists.title AS artist,'
             ' library_sections.id AS lib_section_id, library_sections.name AS lib_section'
         )
-        query += _prepare_from_and_filters(StreamType.AUDIO, MetaType.TRACK, MetaType.ALBUM, MetaType.ARTIST)
-        query += '\nAND num_loudness_keys(media_streams.extra_data) = 0'
-
-        return self.execute(query)
+        query += self._prepare_from_and_filters(StreamType.AUDIO, MetaType.TRACK, MetaType.ALBUM, MetaType.ARTIST)
+        query += f'\nAND {self._stream_value("num_loudness_keys")} = 0'
+        return self.fetch_all(query)
 
     def find_missing_analysis_name_map(self) -> dict[str, dict[str, dict[str, list[str]]]]:
         albums = {}
@@ -344,7 +461,7 @@ def _prepare_from_and_filters(stream_type: Stream_Type, *metadata_types: Meta_Ty
     return '\n'.join(query)
 
 
-def get_db_file(name: str = DEFAULT_FILE_NAME, max_age: int = 180) -> Path:
+def get_db_file(name: str = DEFAULT_FILE_NAME, max_age: int = 180, delta: bool = True) -> Path:
     path = get_user_temp_dir('plexapi').joinpath(name)
     if path.exists():
         last_mod = datetime.fromtimestamp(path.stat().st_mtime)
@@ -355,21 +472,42 @@ def get_db_file(name: str = DEFAULT_FILE_NAME, max_age: int = 180) -> Path:
             'Retrieving new DB file - the locally cached version was'
             f' last modified {last_mod.isoformat(" ")} >= {max_age:,d}s ago'
         )
+        if delta:
+            try:
+                delta_fetch_db(path, name)
+            except (DeltaTransferError, OSError, SSHException) as e:
+                log.warning(f'Delta transfer of the DB failed - retrieving the full file instead: {e}')
+            else:
+                return path
     else:
         log.debug('Retrieving new DB file - there was no locally cached version')
 
     scp_db_to_tmp_dir(path, name)
+    if errors := integrity_check(path):
+        log.warning(f'The retrieved DB failed the integrity check - it may have changed during transfer: {errors[:5]}')
     return path
 
 
-def scp_db_to_tmp_dir(local_path: Path, name: str):
-    remote_path = Path(config.db_remote_dir).joinpath(name).as_posix()
-
+@contextmanager
+def _ssh_client() -> Iterator[SSHClient]:
     with closing(SSHClient()) as client:
         client.load_system_host_keys()
         client.set_missing_host_key_policy(AutoAddPolicy())
         client.connect(
             config.db_remote_host, username=config.db_remote_user, key_filename=config.db_ssh_key_path.as_posix()
         )
-        with SCPClient(client.get_transport()) as scp:
-            scp.get(remote_path, local_path.as_posix())
+        yield client
+
+
+def _remote_db_path(name: str) -> str:
+    return Path(config.db_remote_dir).joinpath(name).as_posix()
+
+
+def scp_db_to_tmp_dir(local_path: Path, name: str):
+    with _ssh_client() as client, SCPClient(client.get_transport()) as scp:
+        scp.get(_remote_db_path(name), local_path.as_posix())
+
+
+def delta_fetch_db(local_path: Path, name: str):
+    with _ssh_client() as client:
+        delta_fetch(client, _remote_db_path(name), local_path, remote_python=config.db_remote_python)
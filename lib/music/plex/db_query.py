@@ -0,0 +1,311 @@
+"""
+Translates :class:`QueryResults<.query.QueryResults>`-style filters into SQL queries against a local copy of Plex's DB.
+
+Example::\n
+    >>> db = PlexDB.from_remote_server()
+    >>> rows = db.query('track', userRating__gte=8, grandparentTitle__like='^red velvet$', mood__ne='Duplicate Rating')
+    >>> rows[0]['title'], rows[0]['file']
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import InvalidQueryFilter
+from .filters import get_attr_operator
+from .query import ALIASES, CUSTOM_OPS
+
+if TYPE_CHECKING:
+    from .typing import PlexObjTypes
+
+__all__ = ['DBQuery']
+log = logging.getLogger(__name__)
+
+# region Schema
+
+_TYPE_IDS = {'artist': 8, 'album': 9, 'track': 10}
+_TYPE_PARENTS = {'track': ('tracks', 'albums', 'artists'), 'album': ('albums', 'artists'), 'artist': ('artists',)}
+_TAG_TYPES = {'genre': 1, 'collection': 2, 'label': 11, 'mood': 300, 'style': 301}
+_KEY_PREFIX = '/library/metadata/'
+
+
+def _item_columns(alias: str, prefix: str = '') -> dict[str, str]:
+    """Columns / expressions for the XML attributes that Plex returns for the given item"""
+    if prefix:
+        return {
+            f'{prefix}RatingKey': f'{alias}.id',
+            f'{prefix}Key': f"'{_KEY_PREFIX}' || {alias}.id",
+            f'{prefix}Title': f'{alias}.title',
+            f'{prefix}Index': f'{alias}."index"',
+            f'{prefix}Year': f'{alias}.year',
+            f'{prefix}Guid': f'{alias}.guid',
+        }
+    return {
+        'ratingKey': f'{alias}.id',
+        'key': f"'{_KEY_PREFIX}' || {alias}.id",
+        'title': f'{alias}.title',
+        'titleSort': f'{alias}.title_sort',
+        'originalTitle': f'{alias}.original_title',
+        'index': f'{alias}."index"',
+        'year': f'{alias}.year',
+        'guid': f'{alias}.guid',
+        'duration': f'{alias}.duration',
+        'originallyAvailableAt': f'{alias}.originally_available_at',
+        'addedAt': f'{alias}.added_at',
+        'updatedAt': f'{alias}.updated_at',
+        'librarySectionID': f'{alias}.library_section_id',
+        'userRating': 'settings.rating',
+        'lastRatedAt': 'settings.last_rated_at',
+        'viewCount': 'settings.view_count',
+        'lastViewedAt': 'settings.last_viewed_at',
+    }
+
+
+@lru_cache(10)
+def _columns(obj_type: PlexObjTypes) -> dict[str, str]:
+    aliases = _TYPE_PARENTS[obj_type]
+    columns = _item_columns(aliases[0])
+    for alias, prefix in zip(aliases[1:], ('parent', 'grandparent')):
+        columns.update(_item_columns(alias, prefix))
+    if obj_type == 'track':
+        columns['file'] = (
+            'SELECT media_parts.file FROM media_parts'
+            ' INNER JOIN media_items ON media_items.id = media_parts.media_item_id'
+            ' WHERE media_items.metadata_item_id = tracks.id ORDER BY media_parts.id LIMIT 1'
+        )
+    return columns
+
+
+def _multi_value_subqueries(obj_type: PlexObjTypes) -> dict[str, str]:
+    """
+    Subqueries for attributes of child elements / tags, which may have multiple values per item.  Each returns the
+    values in a column named ``value``.
+    """
+    alias = _TYPE_PARENTS[obj_type][0]
+    subqueries = {
+        'media__part__file': 'media_parts.file',
+        'media__part__size': 'media_parts.size',
+        'media__part__container': 'media_parts.container',
+    }
+    subqueries = {
+        key: (
+            f'SELECT {column} AS value FROM media_parts'
+            ' INNER JOIN media_items ON media_items.id = media_parts.media_item_id'
+            f' WHERE media_items.metadata_item_id = {alias}.id'
+        )
+        for key, column in subqueries.items()
+    }
+    for tag_name, tag_type in _TAG_TYPES.items():
+        # Plex does not return genres for tracks; QueryResults.with_genre uses album genres for them
+        tag_alias = 'albums' if tag_name == 'genre' and obj_type == 'track' else alias
+        subqueries[f'{tag_name}__tag'] = subqueries[tag_name] = (
+            'SELECT tags.tag AS value FROM taggings INNER JOIN tags ON tags.id = taggings.tag_id'
+            f' WHERE taggings.metadata_item_id = {tag_alias}.id AND tags.tag_type = {tag_type}'
+        )
+    return subqueries
+
+
+# endregion
+
+# region Operators
+
+# Templates for positive conditions; ``{x}`` is replaced with the column / value expression
+_OP_TEMPLATES = {
+    'exact': '{x} = ?',
+    'eq': '{x} = ?',
+    'iexact': 'py_lower({x}) = py_lower(?)',
+    'ieq': 'py_lower({x}) = py_lower(?)',
+    'lc': 'py_lower({x}) = py_lower(?)',
+    'contains': 'instr({x}, ?) > 0',
+    'icontains': 'instr(py_lower({x}), py_lower(?)) > 0',
+    'startswith': 'substr({x}, 1, length(?)) = ?',
+    'istartswith': 'substr(py_lower({x}), 1, length(?)) = py_lower(?)',
+    'endswith': 'substr({x}, -length(?)) = ?',
+    'iendswith': 'substr(py_lower({x}), -length(?)) = py_lower(?)',
+    'gt': '{x} > ?',
+    'gte': '{x} >= ?',
+    'lt': '{x} < ?',
+    'lte': '{x} <= ?',
+    'regex': 'regexp(?, {x})',
+    'iregex': 'regexp(?, {x}, 1)',
+    'sregex': 'regexp(?, {x})',
+}
+_NEGATED_OPS = {'ne': 'exact', 'nsregex': 'sregex', 'not_in': 'in', 'not_contains': 'contains'}
+
+# endregion
+
+
+class DBQuery:
+    """
+    Translates QueryResults-style filter kwargs into a SQL query for the given object type.  Supports the same field
+    names as the attributes of elements in Plex's XML responses (``title``, ``parentTitle``, ``grandparentTitle``,
+    ``originalTitle``, ``userRating``, ``parentYear``, etc.), ``media__part__file``, genres, and moods.
+
+    Negative filters (``ne``, ``not_like``, ``__not__{op}``) include items where the value is missing, and filters on
+    fields that may have multiple values match if any value matches (or if no value matches, for negative filters), to
+    match the behavior of :func:`.ele_matches_filters`.
+
+    :param obj_type: The type of object to query (track, album, or artist)
+    :param section_id: The ID of the library section to query (optional)
+    :param account_id: The ID of the account whose ratings / view counts should be used (1 is the server owner)
+    """
+
+    __slots__ = ('obj_type', 'section_id', 'account_id', 'columns', 'multi_value_fields', '_conditions', '_params')
+
+    def __init__(self, obj_type: PlexObjTypes, section_id: int = None, account_id: int = 1):
+        if obj_type not in _TYPE_IDS:
+            raise InvalidQueryFilter(f'Unsupported {obj_type=} - expected one of: {", ".join(_TYPE_IDS)}')
+        self.obj_type = obj_type
+        self.section_id = section_id
+        self.account_id = account_id
+        self.columns = _columns(obj_type)
+        self.multi_value_fields = _multi_value_subqueries(obj_type)
+        self._conditions: list[str] = []
+        self._params: list[Any] = []
+
+    def build(self, **kwargs) -> tuple[str, list[Any]]:
+        """
+        :param kwargs: QueryResults-style filters
+        :return: Tuple of (query, params)
+        """
+        self._conditions, self._params = [], [self.account_id]
+        aliases = _TYPE_PARENTS[self.obj_type]
+        query = [
+            'SELECT ' + ', '.join(f'({expr}) AS "{name}"' for name, expr in self.columns.items()),
+            f'FROM metadata_items AS {aliases[0]}',
+        ]
+        for child, parent in zip(aliases, aliases[1:]):
+            query.append(f'INNER JOIN metadata_items AS {parent} ON {parent}.id = {child}.parent_id')
+
+        query.append(
+            'LEFT JOIN metadata_item_settings AS settings'
+            f' ON settings.guid = {aliases[0]}.guid AND settings.account_id = ?'
+        )
+        self._conditions.append(f'{aliases[0]}.metadata_type = {_TYPE_IDS[self.obj_type]}')
+        self._conditions.append(f'{aliases[0]}.deleted_at IS NULL')
+        if self.section_id is not None:
+            self._add_condition(f'{aliases[0]}.library_section_id = ?', self.section_id)
+
+        for key, value in _normalize_filters(self.obj_type, kwargs).items():
+            self._add_filter(key, value)
+
+        query.append('WHERE ' + '\n  AND '.join(self._conditions))
+        return '\n'.join(query), self._params
+
+    def _add_condition(self, condition: str, *params):
+        self._conditions.append(condition)
+        self._params.extend(params)
+
+    def _add_filter(self, key: str, value: Any):
+        field, op, _ = get_attr_operator(key)
+        if op == 'custom':
+            raise InvalidQueryFilter(f'Custom filter functions are not supported for DB queries: {key}')
+
+        negate = op.startswith('not ')
+        if negate:
+            op = op[4:]
+        elif op in _NEGATED_OPS:
+            negate, op = True, _NEGATED_OPS[op]
+
+        if expr := self.columns.get(field):
+            self._add_scalar_filter(expr, field, op, value, negate)
+        elif subquery := self.multi_value_fields.get(field):
+            self._add_multi_value_filter(subquery, field, op, value, negate)
+        else:
+            raise InvalidQueryFilter(f'Unsupported field={field!r} for {self.obj_type} DB queries')
+
+    def _add_scalar_filter(self, expr: str, field: str, op: str, value: Any, negate: bool):
+        if op in ('exists', 'notset'):
+            if op == 'exists':
+                is_set = f'({expr}) IS NOT NULL'
+            else:
+                is_set = f'(({expr}) IS NOT NULL AND ({expr}) NOT IN (\'\', 0))'
+            # exists=True / notset=False -> the value must be set
+            want_set = bool(value) == (op == 'exists')
+            return self._conditions.append(is_set if want_set != negate else f'NOT {is_set}')
+
+        condition, params = _condition(f'({expr})', op, value, field)
+        if op == 'exact' and not negate and value in (None, 0, ''):
+            # Missing values are considered to match empty values, for consistency with element filtering
+            condition = f'(({expr}) IS NULL OR {condition})'
+        elif negate:
+            condition = f'(({expr}) IS NULL OR NOT {condition})'
+        self._add_condition(condition, *params)
+
+    def _add_multi_value_filter(self, subquery: str, field: str, op: str, value: Any, negate: bool):
+        if op in ('exists', 'notset'):
+            exists = (bool(value) == (op == 'exists')) != negate
+            return self._conditions.append(f'{"" if exists else "NOT "}EXISTS ({subquery})')
+
+        condition, params = _condition('value', op, value, field)
+        self._add_condition(f'{"NOT " if negate else ""}EXISTS (SELECT 1 FROM ({subquery}) WHERE {condition})', *params)
+
+
+def _condition(expr: str, op: str, value: Any, field: str) -> tuple[str, list[Any]]:
+    if op == 'in':
+        values = list(value)
+        if not values:
+            return '0', []
+        return f'{expr} IN ({", ".join("?" * len(values))})', values
+    elif op in ('sregex', 'regex', 'iregex'):
+        if isinstance(value, re.Pattern):
+            return _OP_TEMPLATES['iregex' if value.flags & re.IGNORECASE else 'regex'].format(x=expr), [value.pattern]
+        return _OP_TEMPLATES[op].format(x=expr), [value]
+
+    try:
+        template = _OP_TEMPLATES[op]
+    except KeyError as e:
+        raise InvalidQueryFilter(f'Unsupported operator={op!r} for DB queries on {field=}') from e
+    return template.format(x=expr), [value] * template.count('?')
+
+
+def _normalize_filters(obj_type: PlexObjTypes, kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Resolve aliases and shorthand operators the same way that :meth:`QueryResults.filter` does"""
+    normalized = {}
+    for key, value in kwargs.items():
+        base, _, op = key.partition('__')
+        if real_base := ALIASES.get(base):
+            base = real_base
+        if obj_type == 'track' and base == 'year':
+            base = 'parentYear'
+        key = f'{base}__{op}' if op else base
+        if keyword := next((val for val in CUSTOM_OPS if key.endswith(val)), None):
+            key = f'{key[:-len(keyword)]}__{CUSTOM_OPS[keyword]}'
+            if keyword == '__like' and isinstance(value, str):
+                value = value.replace(' ', '.*?')
+            if isinstance(value, str):
+                value = re.compile(value, re.IGNORECASE)
+        normalized[key] = value
+
+    return normalized
+
+
+# region Registered DB Functions
+
+
+def register_functions(db):
+    db.create_function('regexp', -1, regexp, deterministic=True)
+    db.create_function('py_lower', 1, py_lower, deterministic=True)
+
+
+@lru_cache(100)
+def _compile(pattern: str, ignore_case: bool) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE) if ignore_case else re.compile(pattern)
+
+
+def regexp(pattern: str, value: Any, ignore_case: int = 0) -> bool:
+    if value is None:
+        return False
+    return _compile(pattern, bool(ignore_case)).search(value if isinstance(value, str) else str(value)) is not None
+
+
+def py_lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+# endregion
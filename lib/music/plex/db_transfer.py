@@ -0,0 +1,148 @@
+"""
+Block-level delta transfer for keeping a local copy of Plex's DB in sync with the copy on the server.
+
+A helper command is executed on the server to compute a hash for each fixed-size block in the remote file, and only
+the blocks whose hashes do not match the corresponding blocks in the local copy are retrieved via SFTP.
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import logging
+import shlex
+from contextlib import closing
+from hashlib import blake2b
+from pathlib import Path
+from shutil import copyfile
+from sqlite3 import connect
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+from ds_tools.output.formatting import readable_bytes
+
+if TYPE_CHECKING:
+    from paramiko import SSHClient
+
+__all__ = ['DeltaTransferError', 'delta_fetch', 'integrity_check']
+log = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+_DIGEST_SIZE = 16
+# Executed on the server via ``python3 -c``; prints the file size, followed by 1 hex digest per block
+_REMOTE_HASH_SCRIPT = f"""
+import hashlib, os, sys
+with open(sys.argv[1], 'rb') as f:
+    print(os.fstat(f.fileno()).st_size)
+    for block in iter(lambda: f.read(int(sys.argv[2])), b''):
+        print(hashlib.blake2b(block, digest_size={_DIGEST_SIZE}).hexdigest())
+""".strip()
+
+
+class DeltaTransferError(Exception):
+    """Raised when a delta transfer could not be completed"""
+
+
+def delta_fetch(
+    client: SSHClient,
+    remote_path: str,
+    local_path: Path,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    remote_python: str = 'python3',
+):
+    """
+    Update the given local copy of a file so that it matches the given remote file, only retrieving blocks that differ.
+    Changes are applied to a temporary copy of the local file, which only replaces the local file if the result passes
+    :func:`integrity_check`.
+
+    :param client: A connected SSHClient
+    :param remote_path: The path of the file on the server
+    :param local_path: The path of the existing local copy of the file
+    :param block_size: The size of each block to compare, in bytes
+    :param remote_python: The command to use to run Python on the server
+    """
+    remote_size, remote_hashes = _get_remote_hashes(client, remote_path, block_size, remote_python)
+    hash_pairs = _zip_hashes(local_path, block_size, remote_hashes)
+    changed = [i for i, (local_hash, remote_hash) in enumerate(hash_pairs) if local_hash != remote_hash]
+    to_fetch = sum(min(block_size, remote_size - i * block_size) for i in changed)
+    log.info(
+        f'Retrieving {len(changed):,d} / {len(remote_hashes):,d} changed blocks ({readable_bytes(to_fetch)}'
+        f' / {readable_bytes(remote_size)}) from {remote_path}'
+    )
+
+    tmp_path = local_path.with_name(local_path.name + '.tmp')
+    copyfile(local_path, tmp_path)
+    try:
+        with tmp_path.open('r+b') as f:
+            if changed:
+                _fetch_blocks(client, remote_path, f, _get_ranges(changed, block_size, remote_size))
+            f.truncate(remote_size)
+
+        if errors := integrity_check(tmp_path):
+            raise DeltaTransferError(f'Integrity check failed after delta transfer of {remote_path}: {errors[:5]}')
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    tmp_path.replace(local_path)
+
+
+def _get_remote_hashes(client: SSHClient, remote_path: str, block_size: int, python: str) -> tuple[int, list[str]]:
+    cmd = ' '.join(map(shlex.quote, (python, '-c', _REMOTE_HASH_SCRIPT, remote_path, str(block_size))))
+    log.debug(f'Computing block hashes on the server for {remote_path}')
+    _, stdout, stderr = client.exec_command(cmd)
+    output = stdout.read().decode('utf-8').splitlines()
+    if code := stdout.channel.recv_exit_status():
+        error = stderr.read().decode('utf-8', 'replace').strip()
+        raise DeltaTransferError(f'Remote block hash command exited with {code=}: {error}')
+
+    try:
+        return int(output[0]), output[1:]
+    except (IndexError, ValueError) as e:
+        raise DeltaTransferError(f'Unexpected output from remote block hash command: {output[:1]}') from e
+
+
+def _zip_hashes(local_path: Path, block_size: int, remote_hashes: list[str]) -> Iterator[tuple[str | None, str]]:
+    with local_path.open('rb') as f:
+        for remote_hash in remote_hashes:
+            if block := f.read(block_size):
+                yield blake2b(block, digest_size=_DIGEST_SIZE).hexdigest(), remote_hash
+            else:
+                yield None, remote_hash
+
+
+def _get_ranges(changed: list[int], block_size: int, total_size: int) -> list[tuple[int, int]]:
+    """Combines consecutive changed blocks into (offset, length) ranges"""
+    ranges = []
+    start = last = changed[0]
+    for i in changed[1:]:
+        if i != last + 1:
+            ranges.append((start, last))
+            start = i
+        last = i
+    ranges.append((start, last))
+    return [
+        (start * block_size, min((last + 1) * block_size, total_size) - start * block_size) for start, last in ranges
+    ]
+
+
+def _fetch_blocks(client: SSHClient, remote_path: str, f: BinaryIO, ranges: list[tuple[int, int]]):
+    with closing(client.open_sftp()) as sftp, sftp.open(remote_path, 'rb') as remote_file:
+        for (offset, length), data in zip(ranges, remote_file.readv(ranges)):
+            if len(data) != length:
+                raise DeltaTransferError(f'Expected {length=} bytes at {offset=} from {remote_path}, found {len(data)}')
+            f.seek(offset)
+            f.write(data)
+
+
+def integrity_check(path: Path) -> list[str]:
+    """
+    :param path: Path to a SQLite DB file
+    :return: The list of problems reported by ``PRAGMA integrity_check`` (empty if the DB is consistent)
+    """
+    log.debug(f'Checking integrity of {path.as_posix()}')
+    with closing(connect(f'{path.resolve().as_uri()}?mode=ro', uri=True)) as db:
+        try:
+            results = [row[0] for row in db.execute('PRAGMA integrity_check')]
+        except Exception as e:  # Severe corruption may result in DatabaseError
+            return [str(e)]
+    return [] if results == ['ok'] else results
@@ -5,7 +5,7 @@ functions here change:
   - PlexObject's _getAttrOperator to avoid an O(n) operation (n=len(OPERATORS)) on every object in searches, and to
     support negation via __not__{op}
   - PlexObject's fetchItem operators to include a compiled regex pattern search
-  - PlexObject's _getAttrValue for minor optimizations
+  - PlexObject's _getAttrValue to use cached accessor functions that are compiled for each attribute path
   - PlexObject's _checkAttrs to fix op=exact behavior, and to support filtering based on if an attribute is not set
 
 :author: Doug Skrypa
@@ -15,7 +15,7 @@ from __future__ import annotations
 
 import logging
 from numbers import Number
-from typing import TYPE_CHECKING, Iterable, Hashable, Callable, Any
+from typing import TYPE_CHECKING, Iterable, Iterator, Hashable, Callable, Any
 
 from plexapi.base import OPERATORS as _OPERATORS
 
@@ -23,12 +23,14 @@ if TYPE_CHECKING:
     from xml.etree.ElementTree import Element
 
     Operator = Callable[[Any, Any], bool | Any]
-    DoesNotMatchFunc = Callable[[Element, Any, str, str, Operator], bool]
+    AttrAccessor = Callable[[Element], list[str]]
+    DoesNotMatchFunc = Callable[[Element, Any, str, str, Operator, AttrAccessor], bool]
 
 __all__ = ['ele_matches_filters']
 log = logging.getLogger(__name__)
 
 OP_CACHE = {}
+ACCESSOR_CACHE = {}
 OP_TO_CAST_FUNC = {
     k: None for k in (
         'sregex', 'nsregex', 'lc', 'ieq', 'iexact', 'icontains', 'startswith', 'istartswith', 'endswith',
@@ -67,14 +69,14 @@ class ElementFilterer:
         # This method replaces :meth:`PlexObject._checkAttrs`
         # Returns True if the element should be included in results, False otherwise
         for attr, query in kwargs.items():
-            attr, op, operator, does_not_match = self._get_attr_operator(attr)
+            attr, op, operator, does_not_match, get_values = self._get_attr_operator(attr)
             # log.debug(f'Processing {attr=} {op=} {query=} for {elem.attrib.get("key", elem)!r}')
-            if does_not_match(elem, query, attr, op, operator):
+            if does_not_match(elem, query, attr, op, operator, get_values):
                 return False
 
         return True
 
-    def _get_attr_operator(self, attr: str) -> tuple[str, str, Operator, DoesNotMatchFunc]:
+    def _get_attr_operator(self, attr: str) -> tuple[str, str, Operator, DoesNotMatchFunc, AttrAccessor]:
         try:
             return self.op_cache[attr]
         except KeyError:
@@ -89,26 +91,33 @@ class ElementFilterer:
                 func = self._other_does_not_match
 
             # log.debug(f'get_attr_operator({attr!r}) => attr={base!r}, {op=}, {operator=}, {func=}')
-            self.op_cache[attr] = result = base, op, operator, func
+            self.op_cache[attr] = result = base, op, operator, func, get_attr_accessor(base)
             return result
 
     @classmethod
-    def _custom_does_not_match(cls, elem: Element, query, attr: str, op: str, operator: Operator) -> bool:
+    def _custom_does_not_match(
+        cls, elem: Element, query, attr: str, op: str, operator: Operator, get_values: AttrAccessor
+    ) -> bool:
         return not query(elem.attrib)
 
     @classmethod
-    def _notset_does_not_match(cls, elem: Element, query, attr: str, op: str, operator: Operator) -> bool:
-        values = get_attr_value(elem, attr)
-        return not operator(values, query)
-
-    def _negated_does_not_match(self, elem: Element, query, attr: str, op: str, operator: Operator) -> bool:
-        values = get_attr_value(elem, attr)
+    def _notset_does_not_match(
+        cls, elem: Element, query, attr: str, op: str, operator: Operator, get_values: AttrAccessor
+    ) -> bool:
+        return not operator(get_values(elem), query)
+
+    def _negated_does_not_match(
+        self, elem: Element, query, attr: str, op: str, operator: Operator, get_values: AttrAccessor
+    ) -> bool:
+        values = get_values(elem)
         cast = self._get_cast_func(op, query)
         # If any value is not truthy for a negative filter, then it should be filtered out
         return not all(operator(_cast(cast, value, attr, elem), query) for value in values)
 
-    def _other_does_not_match(self, elem: Element, query, attr: str, op: str, operator: Operator) -> bool:
-        values = get_attr_value(elem, attr)
+    def _other_does_not_match(
+        self, elem: Element, query, attr: str, op: str, operator: Operator, get_values: AttrAccessor
+    ) -> bool:
+        values = get_values(elem)
         if not values:
             # special case query in (None, 0, '') to include missing attr
             if op == 'exact' and query in (None, 0, ''):
@@ -185,41 +194,104 @@ _ELE_FILTERER = ElementFilterer()
 ele_matches_filters = _ELE_FILTERER.ele_matches_filters
 
 
-def get_attr_value(elem: Element, attrstr: str, results=None):
-    # log.debug(f'Fetching {attrstr} in {elem.tag}')
+# region Attribute Accessors
+
+
+def get_attr_value(elem: Element, attrstr: str, results=None) -> list[str]:
+    # This function replaces :meth:`PlexObject._getAttrValue`; the ``results`` param is only accepted for compatibility
     try:
-        value = elem.attrib[attrstr]
+        accessor = ACCESSOR_CACHE[attrstr]
     except KeyError:
-        if attrstr == 'etag':
-            return [elem.tag]
-    else:
-        return [value]
+        accessor = get_attr_accessor(attrstr)
+    return accessor(elem)
 
+
+def get_attr_accessor(attrstr: str) -> AttrAccessor:
+    """
+    :param attrstr: An attribute name, or a path to attributes of child elements, such as ``media__part__file``
+    :return: A function that accepts an element and returns a list of the values for the given attribute path
+    """
     try:
-        attr, attrstr = attrstr.split('__', 1)
-    except ValueError:
-        lc_attr = attrstr.lower()
+        return ACCESSOR_CACHE[attrstr]
+    except KeyError:
+        ACCESSOR_CACHE[attrstr] = accessor = _compile_accessor(attrstr)
+        return accessor
+
+
+def _compile_accessor(attrstr: str) -> AttrAccessor:
+    *tags, attr = attrstr.split('__')
+    if not tags:
+        if attr == 'etag':
+            return lambda elem: [elem.attrib.get('etag', elem.tag)]
+
+        get_value = _compile_value_getter(attr)
+
+        def get_attr_values(elem: Element) -> list[str]:
+            # The common case of a direct hit is handled here to avoid an extra function call
+            if (value := elem.attrib.get(attr)) is not None or (value := get_value(elem)) is not None:
+                return [value]
+            return []
+
+        return get_attr_values
+
+    get_value = _get_etag if attr == 'etag' else _compile_value_getter(attr)
+    iter_values = _compile_child_iterator(tags, get_value)
+
+    def get_child_attr_values(elem: Element) -> list[str]:
+        return list(iter_values(elem))
+
+    return get_child_attr_values
+
+
+def _compile_value_getter(attr: str) -> Callable[[Element], str | None]:
+    lc_attr = attr.lower()
+    lc_len = len(lc_attr)
+
+    def get_value(elem: Element) -> str | None:
+        attrib = elem.attrib
+        if (value := attrib.get(attr)) is not None or (value := attrib.get(lc_attr)) is not None:
+            return value
+        # Fall back to a case-insensitive match, only comparing keys that have the same length
+        for key, value in attrib.items():
+            if len(key) == lc_len and key.lower() == lc_attr:
+                return value
+        return None
+
+    return get_value
+
+
+def _get_etag(elem: Element) -> str:
+    return elem.attrib.get('etag', elem.tag)
+
+
+def _compile_child_iterator(tags: list[str], get_value: Callable[[Element], str | None]):
+    lc_tag = tags[0].lower()
+    tag_matches = {}  # Memoizes case-insensitive tag comparisons, since there are only a few distinct tags
+
+    def is_match(tag: str) -> bool:
         try:
-            value = elem.attrib[lc_attr]
+            return tag_matches[tag]
         except KeyError:
-            # loop through attrs so we can perform case-insensitive match
-            for attr, value in elem.attrib.items():
-                if lc_attr == attr.lower():
-                    return [value]
+            tag_matches[tag] = matches = tag.lower() == lc_tag
+            return matches
 
-            return []
-        else:
-            return [value]
+    if len(tags) > 1:
+        iter_child_values = _compile_child_iterator(tags[1:], get_value)
+
+        def iter_values(elem: Element) -> Iterator[str]:
+            for child in elem:
+                if is_match(child.tag):
+                    yield from iter_child_values(child)
     else:
-        lc_attr = attr.lower()
-        if results is None:
-            results = []
+        def iter_values(elem: Element) -> Iterator[str]:
+            for child in elem:
+                if is_match(child.tag) and (value := get_value(child)) is not None:
+                    yield value
+
+    return iter_values
 
-        for child in elem:
-            if child.tag.lower() == lc_attr:
-                results.extend(get_attr_value(child, attrstr, results))
 
-        return [r for r in results if r is not None]
+# endregion
 
 
 def _cast(cast, value, attr, elem):
@@ -0,0 +1,116 @@
+"""
+Lightweight, lazily materialized stand-ins for PlexAPI objects that are backed directly by XML elements.
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Type
+
+from plexapi.base import PlexObject, PlexPartialObject
+
+from .patches import PlexAttribute
+
+if TYPE_CHECKING:
+    from xml.etree.ElementTree import Element
+
+    from plexapi.server import PlexServer
+
+__all__ = ['LazyPlexObject', 'get_lazy_class']
+log = logging.getLogger(__name__)
+
+_LAZY_CLASSES: dict[Type[PlexPartialObject], Type[LazyPlexObject]] = {}
+_CONSTANT_TYPES = (str, int, float, bool, type(None))
+
+
+class LazyPlexObject:
+    """
+    A stand-in for a PlexAPI object (such as a :class:`~plexapi.audio.Track`) that avoids the cost of initializing the
+    real object until it is needed.
+
+    Attributes that are backed by the element are provided by the same descriptors that :mod:`.patches` installs on
+    PlexAPI classes, so accessing them does not require the real object.  Any other attribute or method is retrieved
+    from the real object, which is only initialized the first time that happens.  The reported ``__class__`` is the
+    real class, so ``isinstance`` checks, reprs, and hashes are the same as for real objects, and instances can be
+    mixed with real objects in sets (equality is based on ``key``, as it is in :class:`PlexPartialObject`).
+
+    Attribute values are not automatically reloaded from the server when they are missing, and values retrieved via
+    descriptors reflect the element that this object was created with, even if the real object is later reloaded.
+    """
+
+    _cls: Type[PlexPartialObject] = PlexPartialObject
+
+    def __init__(self, server: PlexServer, data: Element, initpath: str = None):
+        self._server = server
+        self._data = data
+        self._initpath = initpath
+
+    @property
+    def __class__(self):
+        return self._cls
+
+    @cached_property
+    def _real_obj(self) -> PlexPartialObject:
+        log.debug(f'Initializing {self._cls.__name__} object for key={self.key!r}')
+        obj = self._cls(self._server, self._data, self._initpath)
+        # Values that were assigned to this object (such as librarySectionID) or that were already retrieved via
+        # descriptors are stored the same way by the real object
+        obj.__dict__.update({key: val for key, val in self.__dict__.items() if not key.startswith('_')})
+        return obj
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called when the attribute was not found via the class / descriptors / instance dict
+        return getattr(self._real_obj, attr)
+
+    @property
+    def key(self) -> str:
+        return self._data.attrib.get('key', '')
+
+    @cached_property
+    def _int_key(self) -> int:
+        return int(PlexObject._clean(self, self.key))
+
+    def __repr__(self) -> str:
+        return self._cls.__repr__(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PlexPartialObject):  # Also True for other LazyPlexObjects due to __class__
+            return self.key == other.key
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # PlexPartialObject.__hash__ uses ``hash(repr(self))``; the hash is cached since this object's values are fixed
+        try:
+            return self.__dict__['_hash']
+        except KeyError:
+            self.__dict__['_hash'] = hash_val = hash(repr(self))
+            return hash_val
+
+    def __lt__(self, other) -> bool:
+        return self._int_key < other._int_key
+
+
+def get_lazy_class(cls: Type[PlexPartialObject]) -> Type[LazyPlexObject]:
+    """
+    :param cls: A PlexAPI class, such as :class:`~plexapi.audio.Track`
+    :return: A subclass of :class:`LazyPlexObject` that uses the data descriptors and constants from the given class
+    """
+    try:
+        return _LAZY_CLASSES[cls]
+    except KeyError:
+        pass
+
+    attrs = {'_cls': cls, '__module__': __name__, '__qualname__': f'Lazy{cls.__name__}'}
+    for klass in reversed(cls.__mro__):
+        for name, attr in vars(klass).items():
+            if isinstance(attr, PlexAttribute):
+                attrs[name] = attr
+            elif not name.startswith('_') and isinstance(attr, _CONSTANT_TYPES):  # TAG, TYPE, listType, etc.
+                attrs[name] = attr
+
+    attrs.pop('key', None)  # Always provided by LazyPlexObject so that equality checks will never trigger a reload
+    _LAZY_CLASSES[cls] = lazy_cls = type(f'Lazy{cls.__name__}', (LazyPlexObject,), attrs)
+    return lazy_cls
@@ -1,2 +1,4 @@
-from .playlist import PlexPlaylist, compare_playlists
+from .playlist import PlexPlaylist
+from .compare import PlaylistComparer, PlaylistDiff, compare_playlists
 from .serialization import PlaylistSerializer, PlaylistLoader
+from .planner import PlaylistSyncPlanner, PlaylistSyncPlan
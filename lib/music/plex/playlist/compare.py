@@ -0,0 +1,250 @@
+"""
+Plex playlist comparison utilities
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable
+
+from ds_tools.output.color import colored
+from ds_tools.output.formatting import bullet_list
+
+from .playlist import PlexPlaylist
+from .utils import get_plex
+
+if TYPE_CHECKING:
+    from plexapi.audio import Track
+
+    from music.typing import PathLike
+    from ..server import LocalPlexServer
+
+    OptServer = LocalPlexServer | None
+
+__all__ = ['PlaylistComparer', 'PlaylistDiff', 'TrackKeyIndex', 'compare_playlists']
+log = logging.getLogger(__name__)
+
+TrackKey = tuple[str, str, str]
+TrackPos = tuple[int, 'Track']
+
+
+class TrackKeyIndex:
+    """
+    The IDs and normalized artist + album + title keys for the tracks in a playlist.  Keys are computed once when the
+    index is created, so any number of comparisons can be performed with set lookups.
+
+    :param tracks: The tracks in a playlist, in playlist order (only the first occurrence of duplicates is indexed)
+    """
+
+    __slots__ = ('entries', 'ids', 'keys')
+
+    def __init__(self, tracks: Iterable[Track]):
+        self.entries: list[tuple[int, int, TrackKey, Track]] = []
+        self.ids: set[int] = set()
+        self.keys: set[TrackKey] = set()
+        for pos, track in enumerate(tracks, 1):
+            if (track_id := track._int_key) in self.ids:
+                continue
+            self.entries.append((pos, track_id, (key := _track_key(track)), track))
+            self.ids.add(track_id)
+            self.keys.add(key)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def difference(self, other: TrackKeyIndex, strict: bool = False) -> list[TrackPos]:
+        """
+        Tracks with the same ID are always considered to be the same track.  Unless ``strict`` is True, tracks with the
+        same artist name + album name + title are also considered to be the same track.
+
+        :param other: The index to compare against
+        :param strict: Whether only track IDs should be compared
+        :return: A list of (position, track) tuples for tracks in this index that are not in the other index
+        """
+        ids = other.ids
+        if strict:
+            return [(pos, track) for pos, track_id, _, track in self.entries if track_id not in ids]
+        keys = other.keys
+        return [(pos, track) for pos, track_id, key, track in self.entries if track_id not in ids and key not in keys]
+
+
+class PlaylistDiff:
+    """
+    The differences between an old version (such as a backup) and a new version (such as the current version on the
+    server) of a playlist.  Either version may be None if the playlist only exists on one side.
+    """
+
+    __slots__ = ('name', 'old', 'new', 'removed', 'added')
+
+    def __init__(self, name: str, old: TrackKeyIndex | None, new: TrackKeyIndex | None, strict: bool = False):
+        self.name = name
+        self.old = old
+        self.new = new
+        if old is None or new is None:
+            self.removed, self.added = [], []
+        else:
+            self.removed, self.added = old.difference(new, strict), new.difference(old, strict)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}[{self.name!r}, {self.status}]>'
+
+    @property
+    def status(self) -> str:
+        if self.new is None:
+            return 'deleted'
+        elif self.old is None:
+            return 'created'
+        return 'changed' if self.removed or self.added else 'unchanged'
+
+    @property
+    def changed(self) -> bool:
+        return self.status != 'unchanged'
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: A JSON-serializable dict with the playlist ``name``, its ``status`` (``deleted``, ``created``,
+          ``changed``, or ``unchanged``), the number of tracks in the ``old_tracks`` / ``new_tracks`` versions (None if
+          that version does not exist), and the ``removed`` / ``added`` tracks, each with their ``position``, ``id``,
+          ``artist``, ``album``, and ``title``
+        """
+        return {
+            'name': self.name,
+            'status': self.status,
+            'old_tracks': None if self.old is None else len(self.old),
+            'new_tracks': None if self.new is None else len(self.new),
+            'removed': [_track_dict(pos, track) for pos, track in self.removed],
+            'added': [_track_dict(pos, track) for pos, track in self.added],
+        }
+
+    def print(self, old_name: str = None, new_name: str = None):
+        old_name = old_name or f'{self.name!r} (old)'
+        new_name = new_name or f'{self.name!r} (current)'
+        if self.new is None:
+            log.info(f'Playlist {old_name} no longer exists', extra={'color': 'red'})
+            return
+        elif self.old is None:
+            log.info(f'Playlist {new_name} was created after the backup', extra={'color': 'green'})
+            return
+
+        print(f'{new_name} contains {len(self.new)} tracks, {old_name} contains {len(self.old)} tracks')
+        if self.removed:
+            log.info(f'{len(self.removed)} tracks were removed from {old_name}:', extra={'color': 'red'})
+            print(colored(bullet_list(_track_strs(self.removed)), 'red'))
+        if self.added:
+            log.info(f'{len(self.added)} tracks were added to {new_name}:', extra={'color': 'green'})
+            print(colored(bullet_list(_track_strs(self.added)), 'green'))
+        if not self.removed and not self.added:
+            log.info(f'Playlists {new_name} and {old_name} are identical')
+
+
+class PlaylistComparer:
+    """
+    Compares the playlists stored in a backup against the current playlists on the server.
+
+    All playlists in the backup are loaded at once, the current items in all playlists on the server are loaded
+    concurrently, and normalized keys are computed exactly once for each playlist on each side.
+
+    :param plex: A :class:`LocalPlexServer`
+    :param strict: Whether only track IDs should be compared (default: compare by artist/album/title as well)
+    :param parallel: Number of workers to use in parallel when loading the items in live playlists
+    """
+
+    __slots__ = ('plex', 'strict', 'parallel')
+
+    def __init__(self, plex: OptServer = None, strict: bool = False, parallel: int = 4):
+        self.plex = get_plex(plex)
+        self.strict = strict
+        self.parallel = parallel
+
+    def compare(self, path: PathLike, name: str = None, include_created: bool = False) -> list[PlaylistDiff]:
+        """
+        :param path: Playlist dump location
+        :param name: The name of a single playlist to compare (default: all playlists in the backup)
+        :param include_created: Whether playlists that exist on the server but not in the backup should be included
+          (with a status of ``created``).  Ignored if a ``name`` is specified.
+        :return: A list of diffs, sorted by playlist name
+        """
+        live = self.plex.playlists  # Uses a single request for all playlists
+        if name:
+            old = {name: PlexPlaylist.load_one(path, name, self.plex)}
+        else:
+            old = PlexPlaylist.load_all(path, self.plex)
+        if name or not include_created:
+            live = {name: live[name] for name in old if name in live}
+
+        old_indexes = {name: TrackKeyIndex(playlist.items) for name, playlist in old.items()}
+        new_indexes = self._index_live(live)
+        return [
+            PlaylistDiff(name, old_indexes.get(name), new_indexes.get(name), self.strict)
+            for name in sorted(old_indexes.keys() | new_indexes.keys())
+        ]
+
+    def _index_live(self, live: dict[str, PlexPlaylist]) -> dict[str, TrackKeyIndex]:
+        log.debug(f'Loading current items for {len(live)} playlists')
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            futures = {name: executor.submit(_index_items, playlist) for name, playlist in live.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+
+# region Public Functions
+
+
+def compare_playlists(
+    plex: LocalPlexServer,
+    path: PathLike,
+    name: str = None,
+    strict: bool = False,
+    as_json: bool = False,
+    include_created: bool = False,
+) -> list[PlaylistDiff]:
+    """
+    Compare the playlists in the given backup to the current playlists on the server, and print the differences.
+
+    :param plex: A :class:`LocalPlexServer`
+    :param path: Playlist dump location
+    :param name: The name of a single playlist to compare (default: all playlists in the backup)
+    :param strict: Whether only track IDs should be compared (default: compare by artist/album/title as well)
+    :param as_json: Print a JSON list of diffs instead of human-readable output.  See :meth:`PlaylistDiff.to_dict`.
+    :param include_created: Whether playlists that exist on the server but not in the backup should be included
+    :return: The list of diffs
+    """
+    diffs = PlaylistComparer(plex, strict).compare(path, name, include_created)
+    if as_json:
+        print(json.dumps([diff.to_dict() for diff in diffs], indent=4, ensure_ascii=False))
+    else:
+        for diff in diffs:
+            diff.print()
+    return diffs
+
+
+# endregion
+
+
+def _index_items(playlist: PlexPlaylist) -> TrackKeyIndex:
+    return TrackKeyIndex(playlist.items)
+
+
+def _track_key(track: Track) -> TrackKey:
+    return _norm_title(track.grandparentTitle), _norm_title(track.parentTitle), _norm_title(track.title)
+
+
+def _norm_title(title: str) -> str:
+    return ''.join(title.split()).casefold()
+
+
+def _track_strs(tracks: list[TrackPos]) -> list[str]:
+    return [f'[{pos:04d}] {track}' for pos, track in tracks]
+
+
+def _track_dict(pos: int, track: Track) -> dict[str, Any]:
+    return {
+        'position': pos,
+        'id': track._int_key,
+        'artist': track.grandparentTitle,
+        'album': track.parentTitle,
+        'title': track.title,
+    }
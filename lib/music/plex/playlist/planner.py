@@ -0,0 +1,218 @@
+"""
+Plex multi-playlist sync planning utilities
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping
+
+from ds_tools.output.formatting import bullet_list
+from ds_tools.output.prefix import DryRunMixin
+from plexapi.audio import Track
+
+from ..query import QueryResults
+from .playlist import PlexPlaylist, Tracks
+from .utils import get_plex
+
+if TYPE_CHECKING:
+    from xml.etree.ElementTree import Element
+
+    from ..server import LocalPlexServer
+
+    OptServer = LocalPlexServer | None
+    Rules = Mapping[str, Tracks] | Iterable[tuple[str, Tracks]]
+
+__all__ = ['PlaylistSyncPlanner', 'PlaylistSyncPlan']
+log = logging.getLogger(__name__)
+
+
+class PlaylistSyncPlan:
+    """The changes that need to be made to a single playlist for it to match the tracks that are expected in it."""
+
+    __slots__ = ('playlist', 'expected', 'current', 'to_add', 'to_remove')
+
+    def __init__(self, playlist: PlexPlaylist, expected: set[Track], current: set[Track] | None):
+        self.playlist = playlist
+        self.expected = expected
+        self.current = current
+        if current is None:
+            self.to_add, self.to_remove = expected, set()
+        else:
+            self.to_add, self.to_remove = expected.difference(current), current.difference(expected)
+
+    def __repr__(self) -> str:
+        changes = f'add={len(self.to_add)}, remove={len(self.to_remove)}'
+        return f'<{self.__class__.__name__}[{self.playlist.name!r}, create={self.is_new}, {changes}]>'
+
+    @property
+    def is_new(self) -> bool:
+        return self.current is None
+
+    @property
+    def in_sync(self) -> bool:
+        return not self.is_new and not self.to_add and not self.to_remove
+
+    def print(self):
+        playlist = self.playlist
+        if self.is_new:
+            log.info(f'{playlist.lp.create} {playlist} with {len(self.expected):,d} tracks:', extra={'color': 10})
+            print(bullet_list(self.expected, sort=True))
+        elif self.in_sync:
+            log.info(
+                f'{playlist} contains {len(self.current):,d} tracks and is already in sync with the given criteria',
+                extra={'color': 11},
+            )
+        else:
+            size = len(self.current)
+            if self.to_remove:
+                playlist._log_change(self.to_remove, 'remove', size)
+                size -= len(self.to_remove)
+            if self.to_add:
+                playlist._log_change(self.to_add, 'add', size)
+
+    def apply(self):
+        playlist = self.playlist
+        if self.is_new:
+            playlist._create(list(self.expected), quiet=True)
+        else:
+            if self.to_remove:
+                playlist.remove_items(self.to_remove, quiet=True)
+            if self.to_add:
+                playlist.add_items(self.to_add, quiet=True)
+            playlist._finish_sync()
+
+
+class PlaylistSyncPlanner(DryRunMixin):
+    """
+    Plans and applies syncs for multiple playlists at once.
+
+    The current items in all target playlists are loaded concurrently, and expected tracks for every rule are built
+    from a single shared snapshot so that each track that appears in multiple playlists is only materialized once.
+    The combined plan is printed before any changes are made, and changes are then applied to all playlists in
+    parallel.
+
+    :param plex: A :class:`LocalPlexServer`
+    :param rules: A mapping of (or iterable that yields 2-tuples of) playlist name to query results / tracks
+    :param parallel: Number of workers to use in parallel
+    :param externally_synced: Whether the target playlists should be marked as being externally synced
+    """
+
+    def __init__(
+        self, plex: OptServer = None, rules: Rules = None, *, parallel: int = 4, externally_synced: bool = True
+    ):
+        self.plex = get_plex(plex)
+        self.dry_run = self.plex.dry_run
+        self.parallel = parallel
+        self.externally_synced = externally_synced
+        self.rules: dict[str, Tracks] = {}
+        if rules:
+            for name, content in rules.items() if isinstance(rules, Mapping) else rules:
+                self.add_rule(name, content)
+
+    def add_rule(self, name: str, content: Tracks = None, **criteria):
+        if name in self.rules:
+            raise KeyError(f'A rule was already registered for playlist={name!r}')
+        elif content is None:
+            if not criteria:
+                raise ValueError('Query results or criteria, or a collection of tracks are required')
+            content = self.plex.query('track', **criteria)
+        elif isinstance(content, QueryResults) and content._type != 'track':
+            raise ValueError(f'Expected track results, found {content._type!r}')
+
+        self.rules[name] = content
+
+    # region Plan
+
+    def plan(self) -> list[PlaylistSyncPlan]:
+        snapshot = self._get_snapshot()
+        playlists = self._get_playlists()
+        current_items = self._load_current_items(playlists)
+        return [
+            PlaylistSyncPlan(playlists[name], self._get_expected(content, snapshot), current_items.get(name))
+            for name, content in self.rules.items()
+        ]
+
+    def _get_snapshot(self) -> dict[str, Track]:
+        """
+        Builds Track objects for the union of all query results across all rules, so each track is only built once
+        and every playlist's expected contents are based on the same set of objects.
+        """
+        key_ele_map: dict[str, Element] = {}
+        results = None
+        for content in self.rules.values():
+            if isinstance(content, QueryResults):
+                key_ele_map.update(content.items())
+                results = content
+
+        if results is None:
+            return {}
+
+        log.debug(f'Building a shared snapshot of {len(key_ele_map):,d} tracks for {len(self.rules)} playlists')
+        return {track.key: track for track in results._new(list(key_ele_map.values())).results(lazy=True)}
+
+    @classmethod
+    def _get_expected(cls, content: Tracks, snapshot: dict[str, Track]) -> set[Track]:
+        if isinstance(content, QueryResults):
+            return {snapshot[key] for key in content.keys()}
+        elif isinstance(content, Track):
+            return {content}
+        return content if isinstance(content, set) else set(content)
+
+    def _get_playlists(self) -> dict[str, PlexPlaylist]:
+        live = self.plex.playlists  # Uses a single request for all playlists
+        lc_live = {name.lower(): playlist for name, playlist in live.items()}
+        playlists = {}
+        for name in self.rules:
+            if (playlist := live.get(name) or lc_live.get(name.lower())) is None:
+                playlist = PlexPlaylist(name, self.plex)
+            playlist.externally_synced = self.externally_synced
+            playlists[name] = playlist
+
+        return playlists
+
+    def _load_current_items(self, playlists: dict[str, PlexPlaylist]) -> dict[str, set[Track]]:
+        existing = {name: playlist for name, playlist in playlists.items() if playlist._exists}
+        log.debug(f'Loading current items for {len(existing)} playlists')
+        return dict(self._run_parallel(lambda pl: pl.item_set, existing))
+
+    # endregion
+
+    def print_plan(self, plans: Iterable[PlaylistSyncPlan]):
+        plans = list(plans)
+        for plan in plans:
+            plan.print()
+
+        if changes := [plan for plan in plans if not plan.in_sync]:
+            add_count = sum(len(plan.to_add) for plan in changes)
+            rm_count = sum(len(plan.to_remove) for plan in changes)
+            log.info(
+                f'Summary: {len(changes)}/{len(plans)} playlists require changes'
+                f' ({add_count:,d} additions, {rm_count:,d} removals)'
+            )
+        else:
+            log.info(f'All {len(plans)} playlists are already in sync')
+
+    def apply(self, plans: Iterable[PlaylistSyncPlan]):
+        if to_apply := {plan.playlist.name: plan for plan in plans if not plan.in_sync}:
+            for _ in self._run_parallel(PlaylistSyncPlan.apply, to_apply):
+                pass
+
+    def sync(self):
+        plans = self.plan()
+        self.print_plan(plans)
+        if not self.dry_run:
+            self.apply(plans)
+
+    def _run_parallel(self, func: Callable, name_obj_map: Mapping[str, Any]) -> Iterator[tuple[str, Any]]:
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            futures = {executor.submit(func, obj): name for name, obj in name_obj_map.items()}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            except BaseException:  # inside the as_completed loop
+                executor.shutdown(cancel_futures=True)
+                raise
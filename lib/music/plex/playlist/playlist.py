@@ -16,7 +16,6 @@ from plexapi.exceptions import BadRequest
 from plexapi.playlist import Playlist
 from plexapi.utils import joinArgs
 
-from ds_tools.caching.decorators import ClearableCachedPropertyMixin
 from ds_tools.output.color import colored
 from ds_tools.output.formatting import bullet_list, format_duration
 from ds_tools.output.prefix import DryRunMixin
@@ -33,7 +32,7 @@ if TYPE_CHECKING:
 
     OptServer = LocalPlexServer | None
 
-__all__ = ['PlexPlaylist', 'compare_playlists']
+__all__ = ['PlexPlaylist']
 log = logging.getLogger(__name__)
 
 Tracks = Collection[Track] | QueryResults
@@ -45,6 +44,11 @@ class PlexPlaylist(DryRunMixin):
     _exists: bool = False
     _externally_synced: bool | None = None
     _playlist: Playlist | None
+    _items: list[Track] | None = None           # Local copy of items; updated optimistically after changes
+    _item_set: set[Track] | None = None
+    _updated_at: str | None = None              # The playlist's updatedAt value when items were last (re)loaded
+    _dirty: bool = False                        # True if changes were made since items were last (re)loaded
+    _missing_item_ids: bool = False             # True if added items do not have a playlistItemID yet
 
     def __init__(
         self, name: str, plex: OptServer = None, playlist: Playlist | None = None, externally_synced: bool | None = None
@@ -77,15 +81,17 @@ class PlexPlaylist(DryRunMixin):
         items = list(_get_tracks(self.plex, content, **criteria))
         self._create(items)
 
-    def _create(self, items: Collection[Track]):
-        log.info(f'{self.lp.create} {self} with {len(items):,d} tracks:', extra={'color': 10})
-        print(bullet_list(items, sort=isinstance(items, set)))
+    def _create(self, items: Collection[Track], quiet: bool = False):
+        if not quiet:
+            log.info(f'{self.lp.create} {self} with {len(items):,d} tracks:', extra={'color': 10})
+            print(bullet_list(items, sort=isinstance(items, set)))
         if not self.plex.dry_run:
             self._playlist = Playlist.create(self.plex.server, self.name, items=items)
             self._exists = True
+            self._items = self._item_set = None
 
     def clone(self, name: str) -> PlexPlaylist:
-        items = self.playlist.items()
+        items = self.items
         clone = self.__class__(name, self.plex, externally_synced=self.externally_synced)
         clone._create(items)
         return clone
@@ -98,7 +104,7 @@ class PlexPlaylist(DryRunMixin):
         return f'{self.__class__.__name__}({self.name!r})'
 
     def __len__(self) -> int:
-        return len(self.playlist)
+        return len(self.items)
 
     # endregion
 
@@ -179,11 +185,94 @@ class PlexPlaylist(DryRunMixin):
     def tracks(self) -> list[Track]:
         # Note: Handling for video/photo playlists is not implemented here
         if (playlist := self.playlist) and playlist.playlistType == 'audio':
-            return playlist.items()
+            return self.items
         return []
 
     # endregion
 
+    # region Local Items
+
+    @property
+    def items(self) -> list[Track]:
+        """
+        A local copy of the items in this playlist.  It is updated optimistically when items are added, removed, or
+        moved via this class, so the full list of items only needs to be retrieved from the server again after a sync
+        completes, or if the playlist was modified elsewhere.
+        """
+        if self._items is None:
+            if (playlist := self.playlist) is None:
+                return []
+            self._items = list(playlist.items())
+            self._updated_at = playlist._data.attrib.get('updatedAt')
+            self._dirty = self._missing_item_ids = False
+        return self._items
+
+    @property
+    def item_set(self) -> set[Track]:
+        if self._item_set is None:
+            self._item_set = set(self.items)
+        return self._item_set
+
+    def reload(self):
+        """Reload this playlist's metadata from the server, and discard the local copy of its items."""
+        if (playlist := self.playlist) is not None and self._exists:
+            log.debug(f'Reloading {self}')
+            playlist.reload()
+        self._items = self._item_set = None
+        self._dirty = self._missing_item_ids = False
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload this playlist if its ``updatedAt`` timestamp on the server no longer matches the one that was reported
+        when its items were last loaded / when the last change was made via this class.  Only this playlist's metadata
+        is requested to perform this check - its items are not retrieved unless it changed.
+
+        :return: True if the playlist changed and was reloaded, False otherwise
+        """
+        if self._items is None or not self._exists or (playlist := self.playlist) is None:
+            return False
+
+        data = playlist._server.query(playlist.key)
+        if (updated_at := _get_updated_at(data)) == self._updated_at and updated_at is not None:
+            return False
+
+        log.debug(f'{self} was modified (updatedAt: {self._updated_at} => {updated_at}) - reloading it')
+        self.reload()
+        return True
+
+    def _finish_sync(self):
+        if self._dirty:
+            self.reload()
+
+    def _record_change(self, data: Element | None):
+        self._item_set = None
+        self._dirty = True
+        # If the response did not contain the updated timestamp, then the next check will always trigger a reload
+        self._updated_at = _get_updated_at(data)
+
+    def _get_playlist_item_ids(self, items: Collection[Track]) -> list[int]:
+        # Only items retrieved via the playlist have playlist item IDs - accessing that attribute on other Track objects
+        # would trigger a reload of each of them, so IDs are always resolved via the local copy of this playlist's items
+        if self._missing_item_ids:
+            self.reload()  # Items that were added since the last reload will not have playlist item IDs yet
+        key_id_map = {item.ratingKey: item.playlistItemID for item in self.items}
+        try:
+            return [key_id_map[item.ratingKey] for item in items]
+        except KeyError as e:
+            raise InvalidPlaylist(f'{self} does not contain an item with ratingKey={e}') from e
+
+    def _get_item_at(self, index: int) -> Track:
+        """Retrieve only the item at the given position in this playlist from the server"""
+        playlist = self.playlist
+        params = {'X-Plex-Container-Start': index, 'X-Plex-Container-Size': 1}
+        data = playlist._server.query(f'{playlist.key}/items{joinArgs(params)}')
+        try:
+            return playlist.findItems(data)[0]
+        except IndexError as e:
+            raise InvalidPlaylist(f'{self} does not contain an item at {index=}') from e
+
+    # endregion
+
     # region Add / Remove Items & Sync
 
     def remove_items(self, items: Collection[Track], quiet: bool = False):
@@ -201,10 +290,14 @@ class PlexPlaylist(DryRunMixin):
         elif not (playlist := self.playlist):
             raise InvalidPlaylist(f'{self} does not exist - cannot remove items from it')
 
+        item_ids = self._get_playlist_item_ids(items)
         query = playlist._server.query
         del_method = playlist._server._session.delete
-        results = [query(f'{playlist.key}/items/{item.playlistItemID}', method=del_method) for item in items]
-        playlist.reload()
+        results = [query(f'{playlist.key}/items/{item_id}', method=del_method) for item_id in item_ids]
+        if self._items is not None:
+            removed = set(item_ids)
+            self._items = [item for item in self._items if item.playlistItemID not in removed]
+        self._record_change(results[-1] if results else None)
         return results
 
     def add_items(self, items: Collection[Track], quiet: bool = False):
@@ -228,7 +321,10 @@ class PlexPlaylist(DryRunMixin):
         # `PlexServer._uriRoot()` returns `f'server://{self.machineIdentifier}/com.plexapp.plugins.library'`
         params = {'uri': f'library://{next(iter(items)).section().uuid}/directory//library/metadata/{rating_key_str}'}
         result = playlist._server.query(f'{playlist.key}/items{joinArgs(params)}', method=playlist._server._session.put)
-        playlist.reload()
+        if self._items is not None:
+            self._items.extend(items)
+            self._missing_item_ids = True
+        self._record_change(result)
         return result
 
     def sync_or_create(self, query: QueryResults = None, **criteria):
@@ -239,7 +335,8 @@ class PlexPlaylist(DryRunMixin):
 
     def sync(self, query: QueryResults = None, **criteria):
         expected = _get_tracks(self.plex, query, **criteria)
-        plist_items = set(self.playlist.items())
+        self.reload_if_changed()
+        plist_items = self.item_set
 
         size = len(plist_items)
         rm_count = self._maybe_remove_items(plist_items, expected)
@@ -251,17 +348,36 @@ class PlexPlaylist(DryRunMixin):
             log.info(
                 f'{self} contains {size:,d} tracks and is already in sync with the given criteria', extra={'color': 11}
             )
+        self._finish_sync()
 
     def sync_tracks(self, tracks: Sequence[Track]):
         PlaylistSynchronizer(self, tracks).sync_tracks()
 
     def _move_item_to_top(self, track: Track, size: int, add: bool = False):
         if add:
+            missing_item_ids = self._missing_item_ids
             self._log_change([track], 'add', size)
             self.add_items([track], quiet=True)
 
-        self.playlist.moveItem(track)  # Omitting `after` results in the item becoming the first item in the playlist
-        self.playlist.reload()
+        if self.plex.dry_run:
+            return
+
+        # Omitting `after` results in the item becoming the first item in the playlist
+        playlist = self.playlist
+        if add:
+            # Only the added item is retrieved to obtain its playlist item ID, instead of reloading all items
+            item = self._get_item_at(size)
+            item_id = item.playlistItemID
+            if self._items is not None:
+                self._items[-1] = item
+                self._missing_item_ids = missing_item_ids
+        else:
+            item_id = self._get_playlist_item_ids([track])[0]
+        result = playlist._server.query(f'{playlist.key}/items/{item_id}/move', method=playlist._server._session.put)
+        items = self.items
+        if (index := next((i for i, item in enumerate(items) if item.playlistItemID == item_id), None)) is not None:
+            items.insert(0, items.pop(index))
+        self._record_change(result)
 
     def _maybe_remove_items(self, plist_items: set[Track], expected: Collection[Track]) -> int:
         if to_rm := plist_items.difference(expected):
@@ -287,7 +403,7 @@ class PlexPlaylist(DryRunMixin):
 
     def _log_change(self, items: Collection[Track], verb: str, size: int = None):
         if size is None:
-            size = len(self.playlist)
+            size = len(self.items)
 
         num = len(items)
         new, prep, color = (size + num, 'to', 14) if verb == 'add' else (size - num, 'from', 13)
@@ -299,29 +415,13 @@ class PlexPlaylist(DryRunMixin):
     # endregion
 
     def compare_tracks(self, other: PlexPlaylist, strict: bool = False):
-        self_tracks = set(self.playlist.items())
-        other_tracks = set(other.playlist.items())
-        print(f'{self} contains {len(self_tracks)} tracks, {other} contains {len(other_tracks)} tracks')
-        if strict:
-            removed, added = other_tracks.difference(self_tracks), self_tracks.difference(other_tracks)
-        else:
-            removed, added = _track_diff(other_tracks, self_tracks), _track_diff(self_tracks, other_tracks)
-
-        if removed:
-            # log.info(f'{len(removed)} tracks are in {other} but not in {self}', extra={'color': 'red'})
-            log.info(f'{len(removed)} tracks were removed from {other}:', extra={'color': 'red'})
-            print(colored(bullet_list(removed), 'red'))
+        from .compare import PlaylistDiff, TrackKeyIndex
 
-        if added:
-            # log.info(f'{len(added)} tracks are in {self} but not in {other}', extra={'color': 'green'})
-            log.info(f'{len(added)} tracks were added to {self}:', extra={'color': 'green'})
-            print(colored(bullet_list(added), 'green'))
-
-        if not removed and not added:
-            log.info(f'Playlists {self} and {other} are identical')
+        diff = PlaylistDiff(self.name, TrackKeyIndex(other.items), TrackKeyIndex(self.items), strict)
+        diff.print(repr(other), repr(self))
 
     def print_info(self, flac_color: AnsiColor = 10, other_color: AnsiColor = 9):
-        tracks = self.playlist.items()
+        tracks = self.items
         print(f'{self} contains {len(tracks)} tracks:')
         for track in tracks:
             is_flac = track.media[0].audioCodec == 'flac'
@@ -434,50 +534,31 @@ class PlexPlaylist(DryRunMixin):
 
         return PlaylistLoader(plex).load_all(path)
 
-    # endregion
-
-
-# region Public Functions
-
-
-def compare_playlists(plex: LocalPlexServer, path: PathLike, name: str = None, strict: bool = False):
-    file_playlists = PlexPlaylist.load_all(path, plex)
-    if name:
-        try:
-            file_playlists = {name: file_playlists[name]}
-        except KeyError as e:
-            raise ValueError(f'Playlist {name!r} was not stored in {path}') from e
-
-    live_playlists = plex.playlists
-    for name, playlist in file_playlists.items():
-        try:
-            current = live_playlists[name]
-        except KeyError:
-            pass
-        else:
-            current.name += ' (current)'
-            playlist.name += ' (old)'
-            current.compare_tracks(playlist, strict)
+    @classmethod
+    def load_one(cls, path: PathLike, name: str, plex: OptServer = None) -> PlexPlaylist:
+        from .serialization import PlaylistLoader
 
+        return PlaylistLoader(plex).load_one(path, name)
 
-# endregion
+    # endregion
 
 
-class PlaylistSynchronizer(ClearableCachedPropertyMixin):
+class PlaylistSynchronizer:
     def __init__(self, playlist: PlexPlaylist, tracks: Sequence[Track]):
         self.playlist = playlist
         self.tracks = tracks
         self.expected_set = set(tracks)
 
-    @cached_property
+    @property
     def plist_items(self) -> list[Track]:
-        return self.playlist.playlist.items()
+        return self.playlist.items
 
-    @cached_property
+    @property
     def plist_item_set(self) -> set[Track]:
-        return set(self.plist_items)
+        return self.playlist.item_set
 
     def sync_tracks(self):
+        self.playlist.reload_if_changed()
         if self._nothing_to_do():
             return
 
@@ -488,6 +569,8 @@ class PlaylistSynchronizer(ClearableCachedPropertyMixin):
             self.playlist._log_change(to_add, 'add', size)
             self.playlist.add_items(to_add, quiet=True)
 
+        self.playlist._finish_sync()
+
     def _nothing_to_do(self) -> bool:
         if not self.tracks:
             log.warning(f'No tracks were provided - skipping sync for {self.playlist}')
@@ -510,11 +593,9 @@ class PlaylistSynchronizer(ClearableCachedPropertyMixin):
             self.playlist._move_item_to_top(
                 first_track, len(self.plist_items), add=first_track not in self.plist_item_set
             )
-            self.clear_cached_properties()
 
     def _remove_unexpected_items(self):
-        if self.playlist._maybe_remove_items(self.plist_item_set, self.expected_set):
-            self.clear_cached_properties()
+        self.playlist._maybe_remove_items(self.plist_item_set, self.expected_set)
 
     def _find_first_unexpected_index(self) -> int | None:
         for i, (pl_item, expected_item) in enumerate(zip(self.plist_items, self.tracks)):
@@ -532,7 +613,6 @@ class PlaylistSynchronizer(ClearableCachedPropertyMixin):
             )
             print(bullet_list(to_rm, sort=False))
             self.playlist.remove_items(to_rm, quiet=True)
-            self.clear_cached_properties()
             size -= len(to_rm)
         else:
             log.log(19, f'{self.playlist} does not contain any out-of-order tracks that should be removed')
@@ -549,7 +629,7 @@ def _get_tracks(plex: LocalPlexServer, content: Tracks = None, **criteria) -> se
     elif isinstance(content, QueryResults):
         if content._type != 'track':
             raise ValueError(f'Expected track results, found {content._type!r}')
-        return content.results()
+        return content.results(lazy=True)
     elif isinstance(content, Track):
         return {content}
     elif isinstance(next(iter(content)), Track):
@@ -558,27 +638,13 @@ def _get_tracks(plex: LocalPlexServer, content: Tracks = None, **criteria) -> se
         raise TypeError(f'Unexpected track type={type(content).__name__!r}')
 
 
-def _track_diff(a: set[Track], b: set[Track]) -> list[str]:
-    """
-    Considers tracks with the same ID or with the same artist name + album name + title to be the same track.
-
-    :param a: A set of tracks
-    :param b: A set of tracks
-    :return: The set of tracks that are in set A that are not in set B
-    """
-    a_dict = {_track_key(t): (i, t) for i, t in enumerate(a, 1)}
-    b_titles = {_track_key(t) for t in b}
-    if title_diff := set(a_dict).difference(b_titles):
-        diff_id_map = {t._int_key: (i, t) for i, t in (a_dict[k] for k in title_diff)}
-        keep_ids = set(diff_id_map).difference(t._int_key for t in b)
-        return ['[{:04d}] {}'.format(*diff_id_map[i]) for i in keep_ids]
-    else:
-        return []
-
-
-def _norm_title(title: str) -> str:
-    return ''.join(title.split()).casefold()
-
+def _get_updated_at(data: Element | None) -> str | None:
+    """Extract a playlist's updatedAt value from the response to a request to view or modify that playlist"""
+    if data is None:
+        return None
+    elif data.tag == 'Playlist':
+        return data.attrib.get('updatedAt')
+    elif (playlist_ele := data.find('Playlist')) is not None:
+        return playlist_ele.attrib.get('updatedAt')
+    return None
 
-def _track_key(track: Track) -> tuple[str, str, str]:
-    return _norm_title(track.grandparentTitle), _norm_title(track.parentTitle), _norm_title(track.title)
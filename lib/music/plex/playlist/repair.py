@@ -8,16 +8,20 @@ from __future__ import annotations
 
 import logging
 from functools import cached_property
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from plexapi.audio import Track
 from ds_tools.output.prefix import DryRunMixin
 from ds_tools.output.color import colored
 
 from music.text.name import Name
+from music.text.name_index import NameIndex
 from .playlist import PlexPlaylist
 
 if TYPE_CHECKING:
+    from xml.etree.ElementTree import Element
+
+    from ..query import QueryResults
     from ..server import LocalPlexServer
 
     OptServer = LocalPlexServer | None
@@ -50,11 +54,11 @@ class PlaylistRepairer(DryRunMixin):
         return [new_track for old_track, new_track in self._iter_track_changes() if new_track is not None]
 
     def _iter_track_changes(self) -> Iterator[tuple[Track, Track | None]]:
-        all_tracks = self.plex.all_tracks
+        finder = self._track_replacement_finder
         for track in self.backup_playlist.tracks:
-            if track in all_tracks:
+            if track in finder:
                 yield track, track
-            elif alt_track := self._track_replacement_finder.find_alt_track(track):
+            elif alt_track := finder.find_alt_track(track):
                 a_str = f'{track}[{track.media[0].audioCodec}]'
                 b_str = f'{alt_track}[{alt_track.media[0].audioCodec}]'
                 log.info(f'Will replace {colored(a_str, 9)} with {colored(b_str, 10)}')
@@ -65,89 +69,116 @@ class PlaylistRepairer(DryRunMixin):
 
 
 class TrackReplacementFinder:
-    def __init__(self, plex: LocalPlexServer):
+    """
+    Finds tracks in the music library that can replace tracks that are no longer present in it.
+
+    All indexes are built once from the raw elements for all tracks in the library, and Track objects are only built
+    for tracks that are returned as replacements.  Artist names are matched via a :class:`.NameIndex`, so only the
+    artists that may match a given artist name (based on fuzzed / romanized name keys) are scored.  Album names are
+    only compared against the albums of matching artists, and track titles are only compared against the tracks in
+    matching albums.
+
+    :param plex: A :class:`LocalPlexServer`
+    :param threshold: The minimum score for artist, album, and track names to be considered a match
+    """
+
+    def __init__(self, plex: LocalPlexServer, threshold: int = 90):
         self.plex = plex
-        self._artist_album_names = {}
+        self.threshold = threshold
+        self._artist_album_indexes: dict[str, tuple[NameIndex, dict[Name, str]]] = {}
+        self._tracks: dict[Element, Track] = {}
+
+    def __contains__(self, track: Track) -> bool:
+        return track.key in self._key_map
 
     def find_alt_track(self, track: Track) -> Track | None:
         track_name = Name.from_enclosed(track.title)
         for album_tracks in self._iter_album_candidates(track):
-            track_names = {Name.from_enclosed(t.title): t for t in album_tracks}
-            if match := track_name.find_best_match(track_names):
-                return track_names[match]
+            track_names = {Name.from_enclosed(ele.attrib['title']): ele for ele in album_tracks}
+            if match := track_name.find_best_match(track_names, self.threshold):
+                return self._get_track(track_names[match])
 
         return None
 
-    def _iter_album_candidates(self, track: Track) -> Iterator[list[Track]]:
+    def _iter_album_candidates(self, track: Track) -> Iterator[list[Element]]:
         if exact_match := self._get_exact_album_match(track):
             yield exact_match
+            return
+
+        track_artist_name = Name.from_enclosed(track.grandparentTitle)
+        artist_index, artist_names = self._artist_index
+        if artist_matches := sorted(track_artist_name.find_best_matches(artist_index, self.threshold), reverse=True):
+            track_album_name = Name.from_enclosed(track.parentTitle)
+            for artist_score, artist_name in artist_matches:
+                artist = artist_names[artist_name]
+                album_index, album_names = self._get_album_index(artist)
+                for _score, album_name in sorted(
+                    track_album_name.find_best_matches(album_index, self.threshold), reverse=True
+                ):
+                    yield self._artist_album_title_map[artist][album_names[album_name]]
         else:
-            track_artist_name = Name.from_enclosed(track.grandparentTitle)
-            if artist_matches := sorted(track_artist_name.find_best_matches(self._artist_names), reverse=True):
-                track_album_name = Name.from_enclosed(track.parentTitle)
-                for artist_score, artist_name in artist_matches:
-                    artist_name_str = self._artist_names[artist_name]
-                    artist_albums = self._get_album_names(artist_name_str)
-                    for _score, album_name in sorted(track_album_name.find_best_matches(artist_albums), reverse=True):
-                        yield self._artist_album_tracks_title_map[artist_name_str][artist_albums[album_name]]
-            else:
-                log.warning(f'Could not find a match for artist={track.grandparentTitle!r} for {track=}')
+            log.warning(f'Could not find a match for artist={track.grandparentTitle!r} for {track=}')
 
-    def _get_exact_album_match(self, track: Track) -> list[Track] | None:
+    def _get_exact_album_match(self, track: Track) -> list[Element] | None:
         try:
-            return self._artist_album_tracks_key_map[track.grandparentRatingKey][track.parentRatingKey]
+            return self._artist_album_key_map[(str(track.grandparentRatingKey), str(track.parentRatingKey))]
         except KeyError:
             pass
         try:
-            return self._artist_album_tracks_title_map[track.grandparentTitle][track.parentTitle]
+            return self._artist_album_title_map[track.grandparentTitle][track.parentTitle]
         except KeyError:
             pass
         return None
 
+    def _get_track(self, element: Element) -> Track:
+        try:
+            return self._tracks[element]
+        except KeyError:
+            self._tracks[element] = track = self._results._new([element]).result()
+            return track
+
+    # region Indexes
+
     @cached_property
-    def _artist_album_tracks_title_map(self) -> dict[str, dict[str, list[Track]]]:
-        artist_album_tracks_map = {}
-        for track in self.plex.all_tracks:
-            try:
-                album_track_map = artist_album_tracks_map[track.grandparentTitle]
-            except KeyError:
-                artist_album_tracks_map[track.grandparentTitle] = album_track_map = {}
-            try:
-                tracks = album_track_map[track.parentTitle]
-            except KeyError:
-                album_track_map[track.parentTitle] = [track]
-            else:
-                tracks.append(track)
+    def _results(self) -> QueryResults:
+        return self.plex.query('track')
 
-        return artist_album_tracks_map
+    @cached_property
+    def _key_map(self) -> dict[str, Element]:
+        return dict(self._results.items())
 
     @cached_property
-    def _artist_album_tracks_key_map(self) -> dict[str, dict[str, list[Track]]]:
+    def _artist_album_key_map(self) -> dict[tuple[str, str], list[Element]]:
         artist_album_tracks_map = {}
-        for track in self.plex.all_tracks:
-            try:
-                album_track_map = artist_album_tracks_map[track.grandparentRatingKey]
-            except KeyError:
-                artist_album_tracks_map[track.grandparentRatingKey] = album_track_map = {}
-            try:
-                tracks = album_track_map[track.parentRatingKey]
-            except KeyError:
-                album_track_map[track.parentRatingKey] = [track]
-            else:
-                tracks.append(track)
+        for ele in self._results:
+            key = (ele.attrib['grandparentRatingKey'], ele.attrib['parentRatingKey'])
+            artist_album_tracks_map.setdefault(key, []).append(ele)
+        return artist_album_tracks_map
 
+    @cached_property
+    def _artist_album_title_map(self) -> dict[str, dict[str, list[Element]]]:
+        artist_album_tracks_map = {}
+        for ele in self._results:
+            attrib = ele.attrib
+            album_tracks_map = artist_album_tracks_map.setdefault(attrib['grandparentTitle'], {})
+            album_tracks_map.setdefault(attrib['parentTitle'], []).append(ele)
         return artist_album_tracks_map
 
     @cached_property
-    def _artist_names(self) -> dict[Name, str]:
-        return {Name.from_enclosed(artist): artist for artist in self._artist_album_tracks_title_map}
+    def _artist_index(self) -> tuple[NameIndex, dict[Name, str]]:
+        return self._build_index(self._artist_album_title_map)
 
-    def _get_album_names(self, artist_name: str) -> dict[Name, str]:
+    def _get_album_index(self, artist: str) -> tuple[NameIndex, dict[Name, str]]:
         try:
-            return self._artist_album_names[artist_name]
+            return self._artist_album_indexes[artist]
         except KeyError:
             pass
 
-        album_names = {Name.from_enclosed(album): album for album in self._artist_album_tracks_title_map[artist_name]}
-        self._artist_album_names[artist_name] = album_names
-        return album_names
+        self._artist_album_indexes[artist] = index = self._build_index(self._artist_album_title_map[artist])
+        return index
+
+    def _build_index(self, titles: Iterable[str]) -> tuple[NameIndex, dict[Name, str]]:
+        names = {Name.from_enclosed(title): title for title in titles}
+        return NameIndex(names, self.threshold), names
+
+    # endregion
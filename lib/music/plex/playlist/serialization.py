@@ -9,6 +9,7 @@ from __future__ import annotations
 import gzip
 import json
 import logging
+import re
 from contextlib import contextmanager
 from datetime import date
 from enum import Enum
@@ -16,7 +17,7 @@ from pathlib import Path
 from tarfile import TarFile
 from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING, Any, Iterable, Iterator, Literal, Mapping, TextIO, TypeGuard
-from xml.etree.ElementTree import Element, ElementTree, indent as _indent, tostring, fromstring
+from xml.etree.ElementTree import Element, ElementTree, indent as _indent, tostring, fromstring, iterparse
 
 from plexapi.audio import Track
 from plexapi.playlist import Playlist
@@ -57,24 +58,54 @@ class PlaylistSerializer:
     # region Dump to One File
 
     def _dump_combined(self):
-        self._dump(
-            self._prepare_combined(),
-            dst_dir=self.dst_dir,
-            stem='all_plex_playlists',
-            log_name=f'{len(self.playlists)} playlists',
-            compress=self.compress,
-            sanitize=False,
-        )
-
-    def _prepare_combined(self) -> str | dict[str, PlaylistXmlDict]:
-        if self.xml:
-            root = Element('PlexPlaylists')
-            root.extend(p.as_xml() for p in self.playlists.values())
-            _indent(root)
-            root.tail = '\n'
-            return tostring(root, encoding='unicode')
-        else:
-            return {name: playlist.dumps() for name, playlist in self.playlists.items()}  # pre-sorted
+        """
+        Writes each playlist to the combined file as soon as it has been serialized (and compressed incrementally, if
+        compression is enabled), so the combined data for all playlists never needs to be held in memory.  The data is
+        written to a temporary file that is only renamed after all playlists were written successfully.
+        """
+        ext = '.xml' if self.xml else '.json'
+        path = prepare_path(self.dst_dir, ('all_plex_playlists', ext + '.gz' if self.compress else ext), add_date=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        log.info(f'Saving {len(self.playlists)} playlists to {path.as_posix()}')
+        try:
+            # The temp file's suffix does not indicate whether it should be compressed, so that is specified explicitly
+            with _open_file(tmp_path, 'w', compress=self.compress) as f:
+                for chunk in self._iter_combined_xml() if self.xml else self._iter_combined_json():
+                    f.write(chunk)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        tmp_path.replace(path)
+
+    def _iter_combined_xml(self) -> Iterator[str]:
+        # Produces the same output as indenting and serializing a PlexPlaylists element containing all playlists
+        if not self.playlists:
+            yield '<PlexPlaylists />\n'
+            return
+
+        yield '<PlexPlaylists>'
+        for name, playlist in self.playlists.items():
+            log.debug(f'Serializing playlist={name!r}')
+            ele = playlist.as_xml()
+            _indent(ele, level=1)
+            yield '\n  ' + tostring(ele, encoding='unicode')
+        yield '\n</PlexPlaylists>\n'
+
+    def _iter_combined_json(self) -> Iterator[str]:
+        # Produces the same output as ``json.dump(..., indent=4)`` for a dict of {name: playlist.dumps()}
+        if not self.playlists:
+            yield '{}'
+            return
+
+        prefix = '{\n    '
+        for name, playlist in self.playlists.items():  # pre-sorted
+            log.debug(f'Serializing playlist={name!r}')
+            # JSON strings can't contain literal newlines, so all newlines here are between values
+            data = json.dumps(playlist.dumps(), indent=4, ensure_ascii=False).replace('\n', '\n    ')
+            yield f'{prefix}{json.dumps(name, ensure_ascii=False)}: {data}'
+            prefix = ',\n    '
+        yield '\n}'
 
     # endregion
 
@@ -194,6 +225,76 @@ class PlaylistLoader:
 
     # endregion
 
+    # region Load Named Playlist
+
+    def load_one(self, path: PathLike, name: str) -> PlexPlaylist:
+        """
+        Load the playlist with the given name from a file or archive that may contain multiple playlists.  Playlists in
+        the file that precede the specified playlist are skipped without loading their tracks, and the rest of the file
+        is not read after the specified playlist is found.
+
+        :param path: The path to a single / combined playlist dump file, or to a .tgz archive of separate playlist files
+        :param name: The name of the playlist to load
+        :return: The specified playlist
+        """
+        path = Path(path).expanduser()
+        if path.name.endswith(('.tgz', '.tar.gz')):
+            playlist = self._load_one_from_archive(path, name)
+        else:
+            with _open_file(path, 'r') as f:
+                if _get_file_type(f) == DataType.JSON:
+                    playlist = self._load_one_json(f.read(), name)
+                else:  # XML
+                    playlist = self._load_one_xml(f, name)
+
+        if playlist is None or playlist.name != name:
+            raise ValueError(f'Playlist {name!r} was not stored in {path}')
+        return playlist
+
+    def _load_one_from_archive(self, path: Path, name: str) -> PlexPlaylist | None:
+        file_names = {sanitize_file_name(name + ext) for ext in ('.xml', '.json')}
+        with TarFile.gzopen(path, 'r') as tf:
+            for member in tf:  # Members are read sequentially, so only the matching file is decompressed + parsed
+                if member.isfile() and Path(member.name).name in file_names:
+                    return self.loads(tf.extractfile(member).read().decode('utf-8'))
+        return None
+
+    def _load_one_xml(self, f: TextIO, name: str) -> PlexPlaylist | None:
+        context = iterparse(f, events=('start', 'end'))
+        _, root = next(context)
+        for event, ele in context:
+            if event == 'end' and ele.tag == 'PlexPlaylist':
+                if ele.attrib.get('name') == name:
+                    return self._load(ele[0], ele[1])
+                elif ele is not root:
+                    root.clear()  # Discard playlists that were already parsed
+
+        if root.tag == 'PlexPlaylist':  # The file contained only one playlist
+            return self._load(root[0], root[1])
+        return None
+
+    def _load_one_json(self, text: str, name: str) -> PlexPlaylist | None:
+        decode, idx = _JSON_DECODER.raw_decode, _skip_ws(text, 0)
+        if text[idx] != '{':
+            raise ValueError(f'Unable to load playlists - unexpected JSON content: {text[:50]!r}')
+
+        idx = _skip_ws(text, idx + 1)
+        while text[idx] != '}':
+            key, idx = decode(text, idx)
+            idx = _skip_ws(text, _skip_ws(text, idx) + 1)  # Skip the ':' and surrounding whitespace
+            if text[idx] != '{':  # The file contained only one playlist
+                return self._load_json(json.loads(text))
+            elif key == name:
+                return self._load_json(decode(text, idx)[0])
+
+            idx = _skip_ws(text, decode(text, idx)[1])  # Decoded, but no elements are built for skipped playlists
+            if text[idx] == ',':
+                idx = _skip_ws(text, idx + 1)
+
+        return None
+
+    # endregion
+
     # region Load All Playlists
 
     def load_all(self, path: PathLike) -> dict[str, PlexPlaylist]:
@@ -225,11 +326,19 @@ class PlaylistLoader:
 
 
 @contextmanager
-def _open_file(path: PathLike, mode: Literal['r', 'w']) -> Iterator[TextIO]:
+def _open_file(path: PathLike, mode: Literal['r', 'w'], compress: bool = None) -> Iterator[TextIO]:
+    """
+    :param path: The path of the file to open
+    :param mode: The mode to use when opening the file
+    :param compress: Whether the file is / should be gzip-compressed (default: determined by the file's suffix)
+    """
     if not isinstance(path, Path):
         path = Path(path).expanduser()
 
-    if path.suffix == '.gz':
+    if compress is None:
+        compress = path.suffix == '.gz'
+
+    if compress:
         open_func = gzip.open
         mode = 'rt' if mode == 'r' else 'wt'
     else:
@@ -260,6 +369,16 @@ class DataType(Enum):
             raise ValueError(f'Unable to determine data type {for_clause} with {first_char=}')
 
 
+_JSON_DECODER = json.JSONDecoder()
+_NON_WS_PAT = re.compile(r'\S')
+
+
+def _skip_ws(text: str, idx: int) -> int:
+    if m := _NON_WS_PAT.search(text, idx):
+        return m.start()
+    raise ValueError('Unable to load playlists - unexpected end of JSON content')
+
+
 def _get_file_type(file: TextIO) -> DataType:
     first_char = file.read(1)
     file.seek(0)  # Reset the position so the deserializer can read the whole file
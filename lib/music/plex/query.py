@@ -8,18 +8,19 @@ import logging
 import re
 from collections import defaultdict
 from operator import eq
-from typing import TYPE_CHECKING, Collection, Optional, Any, Union, Iterator
+from typing import TYPE_CHECKING, Collection, Optional, Any, Union, Iterable, Iterator
 from xml.etree.ElementTree import Element
 
 from plexapi.library import LibrarySection
 from plexapi.utils import PLEXOBJECTS
 
 from ds_tools.output import short_repr
-from ..files.track.track import SongFile
 from ..text.name import Name
-from .config import config
+from ..text.name_index import NameIndex
 from .exceptions import InvalidQueryFilter
 from .filters import ele_matches_filters
+from .lazy import get_lazy_class
+from .release_dates import ReleaseDateResolver
 
 if TYPE_CHECKING:
     from plexapi.library import LibrarySection, MusicSection, ShowSection, MovieSection, PhotoSection
@@ -222,10 +223,16 @@ class QueryResults:
 
         return self._new(results)
 
-    def results(self) -> set[PlexObj]:
-        return set(self._iter_results())  # noqa
+    def results(self, lazy: bool = False) -> set[PlexObj]:
+        """
+        :param lazy: Return :class:`.LazyPlexObject` stand-ins that only initialize the real PlexAPI object for each
+          result when an attribute that is not stored in the underlying element is accessed.  Useful when only keys or
+          basic attributes are needed, such as when comparing sets of tracks.
+        :return: The set of PlexAPI objects for these results
+        """
+        return set(self._iter_results(lazy))  # noqa
 
-    def _iter_results(self) -> Iterator[PlexObj]:
+    def _iter_results(self, lazy: bool = False) -> Iterator[PlexObj]:
         library_section_id = self._library_section_id
         init_path = self.plex.music._initpath
         server = self.plex.music._server
@@ -234,7 +241,7 @@ class QueryResults:
             get_attr = elem.attrib.get
             etype = get_attr('streamType', get_attr('tagType', get_attr('type')))
             if ecls := get_ecls(f'{elem.tag}.{etype}' if etype else elem.tag, get_ecls(elem.tag)):
-                obj = ecls(server, elem, init_path)
+                obj = (get_lazy_class(ecls) if lazy else ecls)(server, elem, init_path)
                 obj.librarySectionID = library_section_id
                 yield obj
 
@@ -294,6 +301,16 @@ class QueryResults:
         if self._type != 'track':
             raise InvalidQueryFilter('unique() is only permitted for track results')
 
+        dates = ReleaseDateResolver() if latest else None
+        try:
+            results = self._unique(dates, rated, fuzzy, latest, singles)
+        finally:
+            if dates is not None:
+                dates.save()
+
+        return self._new(results)
+
+    def _unique(self, dates: ReleaseDateResolver | None, rated: bool, fuzzy: bool, latest: bool, singles: bool):
         artist_title_obj_map = defaultdict(dict)
         for track in self._data:
             td = track.attrib
@@ -306,50 +323,59 @@ class QueryResults:
             title_obj_map = artist_title_obj_map[artist]
             lc_title = td['title'].lower()
             if existing := title_obj_map.get(lc_title):
-                keep = _pick_uniq_track(existing, track, rated, latest, singles)
+                keep = _pick_uniq_track(existing, track, rated, latest, singles, dates)
             else:
                 keep = track
 
             title_obj_map[lc_title] = keep
 
         if fuzzy:
-            name_from_enclosed = Name.from_enclosed
             results = set()
             for artist_key, title_obj_map in artist_title_obj_map.items():
+                named_tracks = _get_named_tracks(artist_key, title_obj_map.values())
+                # The index only returns names that may match, so this is equivalent to checking all uniq names in order
+                uniq_names = NameIndex(corpus=(name for name, _ in named_tracks))
                 artist_uniq = {}
-                for track in title_obj_map.values():
-                    try:
-                        track_name = name_from_enclosed(track.attrib['title'])
-                    except ValueError:
-                        title = track.attrib['title']
-                        parent = track.attrib['parentTitle']
-                        log.error(
-                            f'Error processing track name for {artist_key=} {title=} in {parent=}: {track=}',
-                            extra={'color': 'red'}
-                        )
-                        continue
-                        # raise
-
+                for track_name, track in named_tracks:
                     keep = track
-                    if match := next(filter(track_name.matches, artist_uniq), None):
+                    if match := uniq_names.find_match(track_name):
                         existing = artist_uniq.pop(match)
+                        uniq_names.discard(match)
                         # log.debug(f'Found {match=} / {existing=} for {track_name=} / {track=}', extra={'color': 13})
-                        keep = _pick_uniq_track(existing, track, rated, latest, singles)
+                        keep = _pick_uniq_track(existing, track, rated, latest, singles, dates)
                         keep_name = match if keep == existing else track_name
                     else:
                         # log.debug(f'{track_name=} / {track=} did not match any other tracks from {artist_key=}')
                         keep_name = track_name
 
                     artist_uniq[keep_name] = keep
+                    uniq_names.add(keep_name)
                 results.update(artist_uniq.values())
         else:
             results = {track for title_obj_map in artist_title_obj_map.values() for track in title_obj_map}
             # results = set(chain.from_iterable(artist_title_obj_map.values()))
 
-        return self._new(results)
+        return results
 
 
-def _pick_uniq_track(existing: Element, track: Element, rated, latest, singles) -> Element:
+def _get_named_tracks(artist_key: str, tracks: Iterable[Element]) -> list[tuple[Name, Element]]:
+    name_from_enclosed = Name.from_enclosed
+    named_tracks = []
+    for track in tracks:
+        try:
+            named_tracks.append((name_from_enclosed(track.attrib['title']), track))
+        except ValueError:
+            title = track.attrib['title']
+            parent = track.attrib['parentTitle']
+            log.error(
+                f'Error processing track name for {artist_key=} {title=} in {parent=}: {track=}', extra={'color': 'red'}
+            )
+            # raise
+
+    return named_tracks
+
+
+def _pick_uniq_track(existing: Element, track: Element, rated, latest, singles, dates) -> Element:
     if rated:
         if existing.attrib.get('userRating') and not track.attrib.get('userRating'):
             # log.debug(f'Keeping {existing=} instead of {track=} because of rating', extra={'color': 11})
@@ -357,7 +383,7 @@ def _pick_uniq_track(existing: Element, track: Element, rated, latest, singles)
         elif not existing.attrib.get('userRating') and track.attrib.get('userRating'):
             # log.debug(f'Keeping {track=} instead of {existing=} because of rating', extra={'color': 11})
             return track
-        elif latest and (latest_track := _get_latest(existing, track, singles)):
+        elif latest and (latest_track := _get_latest(existing, track, singles, dates)):
             # if latest_track == existing:
             #     log.debug(f'Keeping {existing=} instead of {track=} because of date', extra={'color': 11})
             # else:
@@ -366,7 +392,7 @@ def _pick_uniq_track(existing: Element, track: Element, rated, latest, singles)
             return latest_track
         else:                                                           # Ensure the chosen value is stable between runs
             return min(existing, track, key=lambda e: int(e.attrib['ratingKey']))
-    elif latest and (latest_track := _get_latest(existing, track, singles)):
+    elif latest and (latest_track := _get_latest(existing, track, singles, dates)):
         # if latest_track == existing:
         #     log.debug(f'Keeping {existing=} instead of {track=} because of date', extra={'color': 11})
         # else:
@@ -377,41 +403,16 @@ def _pick_uniq_track(existing: Element, track: Element, rated, latest, singles)
         return min(existing, track, key=lambda e: int(e.attrib['ratingKey']))
 
 
-def _get_latest(a: Element, b: Element, singles):
-    a_path = a[0][0].attrib['file']
-    b_path = b[0][0].attrib['file']
+def _get_latest(a: Element, b: Element, singles, dates: ReleaseDateResolver):
     if singles:
-        a_path_lc = a_path.lower()
-        b_path_lc = b_path.lower()
+        a_path_lc = a[0][0].attrib['file'].lower()
+        b_path_lc = b[0][0].attrib['file'].lower()
         if '/singles/' in a_path_lc and '/singles/' not in b_path_lc:
             return b
         elif '/singles/' in b_path_lc and '/singles/' not in a_path_lc:
             return a
 
-    server_root = config.server_root
-    strip_prefix = config.server_path_strip_prefix
-
-    a_file = SongFile.for_plex_track(a_path, server_root, strip_prefix)
-    b_file = SongFile.for_plex_track(b_path, server_root, strip_prefix)
-    try:
-        a_date = a_file.date
-    except Exception as e:
-        log.debug(f'Error getting date for {a_file}: {e}')
-        return None
-    try:
-        b_date = b_file.date
-    except Exception as e:
-        log.debug(f'Error getting date for {b_file}: {e}')
-        return None
-
-    try:
-        if a_date > b_date:
-            return a
-        elif b_date > a_date:
-            return b
-    except TypeError:
-        pass
-    return None
+    return dates.get_latest(a, b)
 
 
 def _prefixed_filters(field, filters):
@@ -7,14 +7,19 @@ Plex query grammar / parsing
 from __future__ import annotations
 
 import logging
+import pickle
 from functools import cached_property
+from hashlib import sha256
 from io import StringIO
+from pathlib import Path
 from typing import Iterable
 
-from lark import Lark, Tree, Token, Transformer, v_args
+from lark import Lark, Tree, Token, Transformer, v_args, __version__ as lark_version
 from lark.exceptions import UnexpectedEOF, UnexpectedInput
+from lark.load_grammar import Grammar, load_grammar
 
 from ds_tools.core.decorate import cached_classproperty
+from ds_tools.fs.paths import get_user_cache_dir
 from .exceptions import UnexpectedParseError, InvalidQuery
 
 __all__ = ['PlexQuery']
@@ -85,7 +90,43 @@ class PlexQuery:
 
     @cached_classproperty
     def parser(cls) -> Lark:  # noqa
-        return Lark(PLEX_QUERY_GRAMMAR)
+        return Lark(_get_grammar())
+
+
+def _get_grammar() -> Grammar:
+    """
+    Loading the grammar is the most expensive part of initializing the (Earley) parser, so the loaded grammar is stored
+    in the user cache dir.  The cache file name includes a hash of the grammar and the Lark version, so the grammar is
+    only loaded from scratch again if either of them changes.
+    """
+    key = sha256(f'{lark_version}\n{PLEX_QUERY_GRAMMAR}'.encode('utf-8')).hexdigest()[:16]
+    path = Path(get_user_cache_dir('music_manager')).joinpath(f'plex_query_grammar_{key}.pickle')
+    try:
+        with path.open('rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # The pickled Grammar may be incompatible if Lark internals changed without a new version
+        log.debug(f'Ignoring invalid cached query grammar in {path.as_posix()}: {e}')
+
+    grammar, _ = load_grammar(PLEX_QUERY_GRAMMAR, '<string>', None, False)
+    try:
+        _save_grammar(grammar, path)
+    except OSError as e:
+        log.debug(f'Unable to cache query grammar in {path.as_posix()}: {e}')
+    return grammar
+
+
+def _save_grammar(grammar: Grammar, path: Path):
+    log.debug(f'Saving query grammar to {path.as_posix()}')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with tmp_path.open('wb') as f:
+        pickle.dump(grammar, f)
+    tmp_path.replace(path)
+    for old_path in path.parent.glob('plex_query_grammar_*.pickle'):
+        if old_path != path:
+            old_path.unlink(missing_ok=True)
 
 
 class QueryTransformer(Transformer):
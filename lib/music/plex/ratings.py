@@ -6,13 +6,17 @@ Plex Track rating utilities
 
 from __future__ import annotations
 
+import json
 import logging
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
+from pathlib import Path
 from threading import Event
 from typing import TYPE_CHECKING
 
+from ds_tools.fs.paths import get_user_cache_dir
+
 from ..common.ratings import stars
 from ..files.track.track import SongFile
 from ..files.paths import plex_track_path
@@ -23,6 +27,9 @@ if TYPE_CHECKING:
     from plexapi.audio import Track
     from .typing import PlexObjTypes
 
+    # path, file mtime (ns), lastRatedAt, updatedAt, rating
+    SyncState = tuple[str, int, int | None, int | None, int | None]
+
 __all__ = ['find_and_rate', 'RatingSynchronizer', 'adjust_track_ratings']
 log = logging.getLogger(__name__)
 
@@ -58,8 +65,15 @@ class RatingSynchronizer:
     :param parallel: Number of workers to use in parallel
     :param mod_before: Only sync tracks with files modified before this time
     :param mod_after: Only sync tracks with files modified after this time
+    :param incremental: Skip tracks whose file modification time, Plex ``lastRatedAt`` / ``updatedAt`` values, and
+      rating have not changed since they were last synced, so their files do not need to be opened
+    :param state_path: Path to the file in which the state for incremental syncs should be stored (defaults to
+      ``plex_rating_sync_state.json`` in the user cache dir)
     """
-    __slots__ = ('plex', 'dry_run', 'path_filter', 'prefix', 'parallel', 'interrupted', 'mod_before', 'mod_after')
+    __slots__ = (
+        'plex', 'dry_run', 'path_filter', 'prefix', 'parallel', 'interrupted', 'mod_before', 'mod_after',
+        'incremental', 'state_path', '_state', '_state_changed', 'skipped',
+    )
     mod_before: datetime | date | None
     mod_after: datetime | date | None
 
@@ -71,6 +85,8 @@ class RatingSynchronizer:
         *,
         mod_before: timedelta | datetime | date = None,
         mod_after: timedelta | datetime | date = None,
+        incremental: bool = False,
+        state_path: Path | str = None,
     ):
         if config.server_root is None:
             raise ValueError(f"The custom.server_path_root is missing from {config.path} and wasn't provided")
@@ -82,6 +98,13 @@ class RatingSynchronizer:
         self.interrupted = Event()
         self.mod_before = _normalize_mod_time(mod_before)
         self.mod_after = _normalize_mod_time(mod_after)
+        self.incremental = incremental
+        if state_path is None:
+            state_path = Path(get_user_cache_dir('music_manager')).joinpath('plex_rating_sync_state.json')
+        self.state_path = Path(state_path).expanduser()
+        self._state: dict[str, SyncState] = {}
+        self._state_changed = False
+        self.skipped = 0
 
     def sync(self, to_plex: bool):
         kwargs = {'mood__ne': 'Duplicate Rating'}
@@ -95,6 +118,17 @@ class RatingSynchronizer:
         if not tracks:
             log.warning(f'No tracks found with path_filter={self.path_filter!r}')
 
+        if self.incremental:
+            self._state = self._load_state()
+
+        try:
+            self._sync(func, tracks)
+        finally:
+            if self.incremental:
+                log.info(f'Skipped {self.skipped:,d} / {len(tracks):,d} tracks that were unchanged since the last sync')
+                self._save_state()
+
+    def _sync(self, func, tracks):
         with ThreadPoolExecutor(max_workers=self.parallel) as executor:
             futures = (executor.submit(func, track) for track in tracks)
             try:
@@ -108,14 +142,19 @@ class RatingSynchronizer:
     def _get_song_file(self, track: Track) -> SongFile | None:
         path = plex_track_path(track, config.server_root, config.server_path_strip_prefix)
         mod_before, mod_after = self.mod_before, self.mod_after
-        if mod_before or mod_after:
-            modified = datetime.fromtimestamp(path.stat().st_mtime)
+        if mod_before or mod_after or self.incremental:
+            mod_time_ns = path.stat().st_mtime_ns
+            modified = datetime.fromtimestamp(mod_time_ns / 1_000_000_000)
             if mod_before and modified > mod_before:
                 log.log(9, f'Skipping {path.as_posix()} because modified={_dt_repr(modified)} > {_dt_repr(mod_before)}')
                 return None
             elif mod_after and modified < mod_after:
                 log.log(9, f'Skipping {path.as_posix()} because modified={_dt_repr(modified)} < {_dt_repr(mod_after)}')
                 return None
+            elif self.incremental and self._is_unchanged(track, path, mod_time_ns):
+                log.log(9, f'Skipping {path.as_posix()} because it was not changed since the last sync')
+                self.skipped += 1
+                return None
         return SongFile(path)
 
     def _sync_to_file(self, track: Track):
@@ -128,24 +167,87 @@ class RatingSynchronizer:
             log.log(9, f'Rating is already correct for {file}')
         else:
             log.info(f'{self.prefix} rating from {file_stars} to {plex_stars} for {file}')
-            if not self.dry_run:
-                file.star_rating_10 = plex_stars
+            if self.dry_run:
+                return
+            file.star_rating_10 = plex_stars
+
+        self._record_state(track)
 
     def _sync_to_plex(self, track: Track):
         if self.interrupted.is_set() or not (file := self._get_song_file(track)):
             return
         elif (file_stars := file.star_rating_10) is None:
             log.log(9, f'No rating is stored for {file}')
+            if not track.userRating:  # Only record state when both sides are in sync
+                self._record_state(track)
             return
 
         plex_stars = track.userRating
         if file_stars == plex_stars:
             log.log(9, f'Rating is already correct for {file}')
+            self._record_state(track)
         else:
             log.info(f'{self.prefix} rating from {plex_stars} to {file_stars} for {file}')
             if not self.dry_run:
+                # The new lastRatedAt value is not known without reloading the track, so no state is recorded here.
+                # The file will be opened once more during the next sync, and its state will be recorded then.
                 track.edit(**{'userRating.value': file_stars})
 
+    # region Incremental Sync State
+
+    def _is_unchanged(self, track: Track, path: Path, mod_time_ns: int) -> bool:
+        try:
+            return self._state[str(track.ratingKey)] == _sync_state(track, path, mod_time_ns)
+        except KeyError:
+            return False
+
+    def _record_state(self, track: Track):
+        if self.incremental and not self.dry_run:
+            # The file may have been modified during this sync, so the mod time needs to be refreshed
+            path = plex_track_path(track, config.server_root, config.server_path_strip_prefix)
+            state = _sync_state(track, path, path.stat().st_mtime_ns)
+            self._state[str(track.ratingKey)] = state
+            self._state_changed = True
+
+    def _load_state(self) -> dict[str, SyncState]:
+        try:
+            with self.state_path.open('r', encoding='utf-8') as f:
+                return {key: tuple(state) for key, state in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            log.warning(f'Ignoring invalid rating sync state in {self.state_path.as_posix()}: {e}')
+            return {}
+
+    def _save_state(self):
+        if not self._state_changed:
+            return
+
+        log.debug(f'Saving rating sync state for {len(self._state):,d} tracks to {self.state_path.as_posix()}')
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(self._state, f)
+        tmp_path.replace(self.state_path)
+        self._state_changed = False
+
+    # endregion
+
+
+def _sync_state(track: Track, path: Path, mod_time_ns: int) -> SyncState:
+    # Values are read from the raw element because accessing a missing attribute (such as lastRatedAt for a track that
+    # was never rated) on a partial Track would trigger a reload from the server
+    attrib = track._data.attrib
+    last_rated_at, updated_at = _timestamp(attrib.get('lastRatedAt')), _timestamp(attrib.get('updatedAt'))
+    return path.as_posix(), mod_time_ns, last_rated_at, updated_at, float(attrib.get('userRating', 0))
+
+
+def _timestamp(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
 
 def _dt_repr(dt: datetime) -> str:
     return dt.isoformat(' ', 'seconds')
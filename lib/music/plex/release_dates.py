@@ -0,0 +1,180 @@
+"""
+Utilities for determining the release dates of tracks in Plex query results while avoiding opening the files.
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ds_tools.fs.paths import get_user_cache_dir
+
+from ..files.track.track import SongFile
+from .config import config
+
+if TYPE_CHECKING:
+    from xml.etree.ElementTree import Element
+
+__all__ = ['ReleaseDateResolver']
+log = logging.getLogger(__name__)
+
+_NOT_CACHED = object()
+
+
+class ReleaseDateResolver:
+    """
+    Determines which of 2 tracks (as raw elements from Plex query results) was released more recently.
+
+    Sources are checked in order of cost:
+
+    #. The ``originallyAvailableAt`` date / ``parentYear`` (album year) attributes on each element.  When full dates
+       are not available for both tracks, years are only considered sufficient if they differ.
+    #. A persistent cache of file path to release date, where each entry is only used if the track's ``updatedAt``
+       value in Plex still matches the value from when the entry was stored.
+    #. The date tag in the file itself (the result is stored in the cache).
+
+    :param cache_path: Path to the cache file (defaults to ``plex_release_dates.json`` in the user cache dir)
+    """
+
+    __slots__ = ('cache_path', '_cache', '_changed', 'plex_hits', 'cache_hits', 'file_reads', 'errors')
+
+    def __init__(self, cache_path: Path | str = None):
+        if cache_path is None:
+            cache_path = Path(get_user_cache_dir('music_manager')).joinpath('plex_release_dates.json')
+        self.cache_path = Path(cache_path).expanduser()
+        self._cache: dict[str, tuple[str | None, str | None]] | None = None
+        self._changed = False
+        self.plex_hits = 0
+        self.cache_hits = 0
+        self.file_reads = 0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}[{self.stats_str}]>'
+
+    @property
+    def avoided_reads(self) -> int:
+        """The number of times that a file did not need to be opened to determine its release date"""
+        return self.plex_hits + self.cache_hits
+
+    @property
+    def stats_str(self) -> str:
+        return (
+            f'from_plex={self.plex_hits}, from_cache={self.cache_hits}, file_reads={self.file_reads},'
+            f' errors={self.errors}, avoided_reads={self.avoided_reads}'
+        )
+
+    def get_latest(self, a: Element, b: Element) -> Element | None:
+        """
+        :param a: A track element
+        :param b: A track element
+        :return: The element for the track with the more recent release date, or None if it could not be determined
+        """
+        a_date, b_date = _plex_date(a), _plex_date(b)
+        if a_date is None or b_date is None:
+            if (a_year := _plex_year(a)) and (b_year := _plex_year(b)) and a_year != b_year:
+                self.plex_hits += 2
+                return a if a_year > b_year else b
+
+        if (a_date := self._get_date(a, a_date)) is None or (b_date := self._get_date(b, b_date)) is None:
+            return None
+
+        try:
+            if a_date > b_date:
+                return a
+            elif b_date > a_date:
+                return b
+        except TypeError:
+            pass
+        return None
+
+    def _get_date(self, track: Element, plex_date: date | None) -> date | None:
+        if plex_date is None:
+            return self.get_file_date(track)
+        self.plex_hits += 1
+        return plex_date
+
+    def get_file_date(self, track: Element) -> date | None:
+        path = track[0][0].attrib['file']
+        updated_at = track.attrib.get('updatedAt')
+        if (cached := self._get_cached(path, updated_at)) is not _NOT_CACHED:
+            self.cache_hits += 1
+            return cached
+
+        self.file_reads += 1
+        try:
+            track_date = SongFile.for_plex_track(path, config.server_root, config.server_path_strip_prefix).date
+        except Exception as e:
+            log.debug(f'Error getting date for {path}: {e}')
+            self.errors += 1
+            return None
+
+        self.cache[path] = (updated_at, track_date.isoformat() if track_date else None)
+        self._changed = True
+        return track_date
+
+    # region Cache
+
+    @property
+    def cache(self) -> dict[str, tuple[str | None, str | None]]:
+        if self._cache is None:
+            self._cache = self._load()
+        return self._cache
+
+    def _get_cached(self, path: str, updated_at: str | None):
+        try:
+            cached_updated_at, date_str = self.cache[path]
+        except KeyError:
+            return _NOT_CACHED
+        if cached_updated_at != updated_at:
+            return _NOT_CACHED
+        return date.fromisoformat(date_str) if date_str else None
+
+    def _load(self) -> dict[str, tuple[str | None, str | None]]:
+        try:
+            with self.cache_path.open('r', encoding='utf-8') as f:
+                return {path: tuple(entry) for path, entry in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            log.warning(f'Ignoring invalid release date cache in {self.cache_path.as_posix()}: {e}')
+            return {}
+
+    def save(self):
+        log.debug(f'Release date stats: {self.stats_str}')
+        if not self._changed:
+            return
+
+        log.debug(f'Saving {len(self._cache):,d} release dates to {self.cache_path.as_posix()}')
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        with tmp_path.open('w', encoding='utf-8') as f:
+            json.dump(self._cache, f)
+        tmp_path.replace(self.cache_path)
+        self._changed = False
+
+    # endregion
+
+
+def _plex_date(track: Element) -> date | None:
+    if date_str := track.attrib.get('originallyAvailableAt'):
+        try:
+            return date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    return None
+
+
+def _plex_year(track: Element) -> int | None:
+    attrib = track.attrib
+    if year := attrib.get('parentYear') or attrib.get('year'):
+        try:
+            return int(year)
+        except ValueError:
+            pass
+    return None
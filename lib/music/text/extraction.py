@@ -7,8 +7,9 @@ from __future__ import annotations
 import logging
 import re
 from collections import defaultdict
+from functools import lru_cache
 from itertools import chain
-from typing import TYPE_CHECKING, Optional, Literal, overload
+from typing import TYPE_CHECKING, Optional, Literal, Sequence, overload
 
 if TYPE_CHECKING:
     from music.typing import Bool
@@ -24,6 +25,7 @@ CLOSERS = ')]}~`"\'～“՚՛՜՝”⁾₎⌉⌋〉〉》」』】〕〗〙〛
 DASH_CHARS = '~‐-'
 QUOTE_CHARS = '`"\'“՚՛՜՝”〞〟〝’'
 _NotSet = object()
+_find_enclosers = re.compile('[{}]'.format(re.escape(''.join(sorted(set(OPENERS + CLOSERS)))))).finditer
 
 
 class _CharMatcher:
@@ -73,7 +75,6 @@ def _get_unpaired(text: str, reverse: bool = True, exclude=_NotSet) -> Optional[
     exclude = DASH_CHARS if exclude is _NotSet else '' if exclude is None else exclude
     if reverse:
         o2c, c2o = CLOSER_TO_OPENER, OPENER_TO_CLOSER
-        text = text[::-1]
     else:
         o2c, c2o = OPENER_TO_CLOSER, CLOSER_TO_OPENER
 
@@ -81,7 +82,7 @@ def _get_unpaired(text: str, reverse: bool = True, exclude=_NotSet) -> Optional[
     closed = defaultdict(int)
     pairs = []
     last = defaultdict(list)
-    for i, c in enumerate(text):
+    for i, c in _tokenize(text, reverse):
         _open = True
         if c in o2c:
             # if c in "'-" and _should_skip(c, text, i, reverse):
@@ -283,6 +284,7 @@ def _partition_enclosed(text: str, reverse: bool = False, inner: bool = False) -
     Returns the text in case it was reversed, the index of the first character that is enclosed, and the index of the
     closing character for the enclosed portion.
     """
+    original = text
     if reverse:
         opener_to_closer_map, closer_to_opener_map = CLOSER_TO_OPENER, OPENER_TO_CLOSER
         text = text[::-1]
@@ -294,7 +296,7 @@ def _partition_enclosed(text: str, reverse: bool = False, inner: bool = False) -
     first = defaultdict(list)   # Treat as a LIFO queue
     pairs = []
     # log.debug(f'Partitioning enclosed {text=}')
-    for i, c in enumerate(text):
+    for i, c in _tokenize(original, reverse):
         # log.debug(f'{i=} {c=} ={ord(c)=} first={dict(first)} {pairs=} opened={dict(opened)} closed={dict(closed)}')
         try:
             openers = closer_to_opener_map[c]
@@ -331,6 +333,23 @@ def _partition_enclosed(text: str, reverse: bool = False, inner: bool = False) -
     raise ValueError('No enclosed text found')
 
 
+@lru_cache(4096)
+def _tokenize(text: str, reverse: bool = False) -> Sequence[tuple[int, str]]:
+    """
+    Finds all opener / closer characters in the given text in a single pass.  Other characters never affect the state
+    of the scans in :func:`._partition_enclosed` or :func:`._get_unpaired`, so they only need to visit these positions.
+    Results are cached, since the same text is often examined by several of the functions in this module in a row.
+
+    :param text: The text to examine
+    :param reverse: Whether positions should be relative to the reversed text, in reverse order
+    :return: A sequence of (index, char) tuples
+    """
+    if reverse:
+        last = len(text) - 1
+        return tuple((last - i, c) for i, c in reversed(_tokenize(text)))
+    return tuple((m.start(), m.group()) for m in _find_enclosers(text))
+
+
 def _should_skip(char: str, text: str, index: int, reverse: bool) -> Bool:
     try:
         skip_matches = _should_skip.skip_matches
@@ -2,18 +2,39 @@
 :author: Doug Skrypa
 """
 
+import logging
+from atexit import register as atexit_register
+from functools import lru_cache
+from typing import Callable, Sequence
 from unicodedata import normalize, combining
 
 from fuzzywuzzy import fuzz
 from fuzzywuzzy.fuzz import _token_sort as fuzz_token_sort_ratio, _token_set as fuzz_token_set_ratio
+from rapidfuzz.distance.Indel import normalized_similarity as indel_similarity
+from rapidfuzz.fuzz import token_set_ratio as rf_token_set_ratio, token_sort_ratio as rf_token_sort_ratio
+from rapidfuzz.process import extract
 
-__all__ = ['fuzz_process', 'revised_weighted_ratio']
+__all__ = [
+    'fuzz_process',
+    'revised_weighted_ratio',
+    'revised_weighted_ratios',
+    'revised_weighted_ratio_matrix',
+    'set_fuzz_cache_sizes',
+    'fuzz_cache_stats',
+    'log_fuzz_cache_stats',
+]
+log = logging.getLogger(__name__)
+
+# Default max number of entries in the LRU caches for processed strings and for pairwise revised_weighted_ratio scores
+PROCESS_CACHE_SIZE = 10_000
+RATIO_CACHE_SIZE = 100_000
 
 
 def fuzz_process(text: str, strip_special: bool = True, space: bool = True) -> str:
     """
     Performs the same functions as :func:`full_process<fuzzywuzzy.utils.full_process>`, with some additional steps.
-    Consecutive spaces are condensed, and diacritical marks are stripped.  Example::\n
+    Consecutive spaces are condensed, and diacritical marks are stripped.  Results are cached in an LRU cache (see
+    :func:`set_fuzz_cache_sizes`).  Example::\n
         >>> fuzz_process('Rosé  한')     # Note: there are 2 spaces here
         'rose 한'
 
@@ -24,13 +45,17 @@ def fuzz_process(text: str, strip_special: bool = True, space: bool = True) -> s
     """
     if not text:
         return text
+    return _cached_fuzz_process(text, strip_special, space)
+
+
+def _fuzz_process(text: str, strip_special: bool, space: bool) -> str:
     try:
-        non_letter_non_num_sub = fuzz_process._non_letter_non_num_sub
-        ost_sub = fuzz_process._ost_sub
+        non_letter_non_num_sub = _fuzz_process._non_letter_non_num_sub
+        ost_sub = _fuzz_process._ost_sub
     except AttributeError:
         import re
-        non_letter_non_num_sub = fuzz_process._non_letter_non_num_sub = re.compile(r'\W').sub
-        ost_sub = fuzz_process._ost_sub = re.compile(r'\sOST(?:$|\s|\)|\])', re.IGNORECASE).sub
+        non_letter_non_num_sub = _fuzz_process._non_letter_non_num_sub = re.compile(r'\W').sub
+        ost_sub = _fuzz_process._ost_sub = re.compile(r'\sOST(?:$|\s|\)|\])', re.IGNORECASE).sub
 
     original = text
     if strip_special:                               # Some titles are only differentiable by special characters
@@ -63,12 +88,18 @@ def revised_weighted_ratio(p1: str, p2: str) -> int:
         * otherwise call token_sort_ratio and token_set_ratio
         * all token based comparisons are scaled by 0.95 (on top of any partial scalars)
     #. Take the highest value from these results round it and return it as an integer.
+
+    Scores are cached in an LRU cache that is shared by both argument orders (see :func:`set_fuzz_cache_sizes`).
     """
     if not p1 or not p2:
         return 0
     elif p1 == p2:
         return 100
+    # Scores are cached and computed with the strings in a consistent order, so the order of arguments doesn't matter
+    return _cached_ratio(p1, p2) if p1 < p2 else _cached_ratio(p2, p1)
 
+
+def _revised_weighted_ratio(p1: str, p2: str) -> int:
     base = fuzz.ratio(p1, p2)
     lens = (len(p1), len(p2))
     len_ratio = max(lens) / min(lens)
@@ -80,16 +111,7 @@ def revised_weighted_ratio(p1: str, p2: str) -> int:
     # fuzz_token_set_ratio(s1, s2, partial=True, force_ascii=True, full_process=True)
 
     if try_partial:
-        # if one string is much much shorter than the other
-        if len_ratio > 3:
-            partial_scale = .25
-        elif len_ratio > 2:
-            partial_scale = .45
-        elif len_ratio > 1.5:
-            partial_scale = .625
-        else:
-            partial_scale = .75
-
+        partial_scale = _partial_scale(len_ratio)
         partial = fuzz.partial_ratio(p1, p2) * partial_scale
         ptsor = fuzz_token_sort_ratio(p1, p2, True, False, False) * .95 * partial_scale
         # ptsor = fuzz.partial_token_sort_ratio(p1, p2, full_process=False) * .95 * partial_scale
@@ -104,3 +126,156 @@ def revised_weighted_ratio(p1: str, p2: str) -> int:
         # tser = fuzz.token_set_ratio(p1, p2, full_process=False) * .95
         # log.debug('{!r}=?={!r}: ratio={}, len_ratio={}, tok_sort_ratio={}, tok_set_ratio={}'.format(p1, p2, base, len_ratio, tsor, tser))
         return int(round(max(base, tsor, tser)))
+
+
+def revised_weighted_ratios(p1: str, choices: Sequence[str], score_cutoff: int = 0) -> list[int]:
+    """
+    Batch version of :func:`revised_weighted_ratio` that scores one string against many.  Example::\n
+        >>> revised_weighted_ratios('abc', ['abc', 'abd', 'xyz'])
+        [100, 67, 0]
+
+    Each component score that can be computed by a C-accelerated ``rapidfuzz`` scorer with identical results (the plain
+    ratio, and the token sort / token set ratios for strings of similar length) is computed for all choices in a single
+    call, with candidates that can't reach the cutoff pruned inside that call.  The partial ratios used by
+    :func:`revised_weighted_ratio` for strings with very different lengths are scaled down (to at most 75), so they are
+    only computed (pair-by-pair) when they could change a result that meets the cutoff.
+
+    The ``rapidfuzz`` token scorers split strings differently than the ones used by :func:`revised_weighted_ratio` when
+    they contain leading, trailing, or consecutive whitespace, so pairs that include such strings are scored
+    pair-by-pair.  Strings processed by :func:`fuzz_process` never contain such whitespace.
+
+    :param p1: The string to compare against each choice
+    :param choices: The strings to compare against the first string
+    :param score_cutoff: Scores below this value may be returned as 0 instead of being fully computed
+    :return: The scores for each choice, in the same order as the given choices
+    """
+    if not p1 or not choices:
+        return [0] * len(choices)
+
+    # The final score is rounded, so components that are up to 0.5 lower than the cutoff may still meet it (the extra
+    # 0.01 ensures that floating point error can't result in pruning a score at that boundary)
+    base_scores = _extract_scores(p1, choices, indel_similarity, max(0.0, score_cutoff - 0.51) / 100)
+    token_cutoff = max(0.0, (score_cutoff - 0.51) / 0.95 - 0.51)
+    token_sort_scores = _extract_scores(p1, choices, rf_token_sort_ratio, token_cutoff)
+    token_set_scores = _extract_scores(p1, choices, rf_token_set_ratio, token_cutoff)
+
+    p1_len = len(p1)
+    p1_normalized = _is_space_normalized(p1)
+    scores = []
+    for i, p2 in enumerate(choices):
+        if not p2:
+            scores.append(0)
+            continue
+        elif p1 == p2:
+            scores.append(100)
+            continue
+
+        base = int(round(100 * base_scores.get(i, 0)))
+        p2_len = len(p2)
+        if not p1_normalized or not _is_space_normalized(p2):
+            score = revised_weighted_ratio(p1, p2)
+        elif (len_ratio := max(p1_len, p2_len) / min(p1_len, p2_len)) < 1.5:
+            tsor = int(round(token_sort_scores.get(i, 0))) * .95
+            tser = int(round(token_set_scores.get(i, 0))) * .95
+            score = int(round(max(base, tsor, tser)))
+        elif max(base, score_cutoff) > 100 * _partial_scale(len_ratio):
+            score = base  # The scaled partial scores can't exceed the base score or reach the cutoff
+        else:
+            score = revised_weighted_ratio(p1, p2)
+
+        scores.append(score if score >= score_cutoff else 0)
+
+    return scores
+
+
+def revised_weighted_ratio_matrix(
+    queries: Sequence[str], choices: Sequence[str], score_cutoff: int = 0
+) -> list[list[int]]:
+    """
+    Batch version of :func:`revised_weighted_ratio` that scores many strings against many.
+
+    :param queries: The strings to compare against each choice
+    :param choices: The strings to compare against each query
+    :param score_cutoff: Scores below this value may be returned as 0 instead of being fully computed
+    :return: A matrix of scores, with one row (in the same order as the given choices) for each query
+    """
+    return [revised_weighted_ratios(query, choices, score_cutoff) for query in queries]
+
+
+# region Caches
+
+
+def set_fuzz_cache_sizes(process: int = None, ratio: int = None):
+    """
+    Replace the LRU caches used by :func:`fuzz_process` and :func:`revised_weighted_ratio` with empty caches that hold
+    up to the given number of entries.  A size of 0 disables the respective cache.
+
+    :param process: Max number of processed strings to cache (default: keep the current cache)
+    :param ratio: Max number of pairwise scores to cache (default: keep the current cache)
+    """
+    global _cached_fuzz_process, _cached_ratio
+    if process is not None:
+        _cached_fuzz_process = lru_cache(process)(_fuzz_process)
+    if ratio is not None:
+        _cached_ratio = lru_cache(ratio)(_revised_weighted_ratio)
+
+
+def fuzz_cache_stats() -> dict[str, dict[str, int | float]]:
+    """
+    :return: Mapping of ``process`` / ``ratio`` to the hits, misses, max size, current size, and hit rate of the
+      respective cache
+    """
+    stats = {}
+    for name, func in (('process', _cached_fuzz_process), ('ratio', _cached_ratio)):
+        info = func.cache_info()
+        total = info.hits + info.misses
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'maxsize': info.maxsize,
+            'currsize': info.currsize,
+            'hit_rate': info.hits / total if total else 0.0,
+        }
+    return stats
+
+
+def log_fuzz_cache_stats():
+    """Log the hit rates of the caches used by :func:`fuzz_process` and :func:`revised_weighted_ratio` (at debug)"""
+    if not log.isEnabledFor(logging.DEBUG):
+        return
+    for name, stats in fuzz_cache_stats().items():
+        if stats['hits'] or stats['misses']:
+            hits, misses, rate = stats['hits'], stats['misses'], stats['hit_rate']
+            size, max_size = stats['currsize'], stats['maxsize']
+            log.debug(f'Fuzz {name} cache: {hits=:,d} {misses=:,d} hit_rate={rate:.1%} size={size:,d}/{max_size:,d}')
+
+
+_cached_fuzz_process = lru_cache(PROCESS_CACHE_SIZE)(_fuzz_process)
+_cached_ratio = lru_cache(RATIO_CACHE_SIZE)(_revised_weighted_ratio)
+atexit_register(log_fuzz_cache_stats)
+
+
+# endregion
+
+
+def _partial_scale(len_ratio: float) -> float:
+    # if one string is much much shorter than the other
+    if len_ratio > 3:
+        return .25
+    elif len_ratio > 2:
+        return .45
+    elif len_ratio > 1.5:
+        return .625
+    else:
+        return .75
+
+
+def _is_space_normalized(text: str) -> bool:
+    return ' '.join(text.split()) == text
+
+
+def _extract_scores(
+    query: str, choices: Sequence[str], scorer: Callable[..., float], score_cutoff: float
+) -> dict[int, float]:
+    results = extract(query, choices, scorer=scorer, processor=None, limit=None, score_cutoff=score_cutoff or None)
+    return {index: score for _, score, index in results}
@@ -6,27 +6,38 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import OrderedDict
 from copy import copy, deepcopy
-from functools import reduce
+from functools import lru_cache, partial, reduce
 from operator import xor
+from threading import Lock
 from typing import TYPE_CHECKING, Type, Any, Collection, Iterable, Iterator, TypeVar, MutableMapping, Mapping, Union
 
 from ds_tools.caching.decorators import ClearableCachedPropertyMixin, cached_property
-from ds_tools.unicode.hangul import hangul_romanized_permutations_pattern
-from ds_tools.unicode.languages import LangCat, J2R
+from ds_tools.unicode.languages import LangCat
 
 from .extraction import split_enclosed
-from .fuzz import fuzz_process, revised_weighted_ratio
+from .fuzz import fuzz_process, revised_weighted_ratio, revised_weighted_ratios
+from .name_index import NameIndex
+from .romanization import korean_romanization_pattern, korean_romanization_keys, japanese_romanizations
 from .spellcheck import is_english, english_probability
 from .utils import combine_with_parens
 
 if TYPE_CHECKING:
-    from typing import Pattern
+    from typing import Callable, Hashable, Pattern
     from music.typing import OptStr, StrIter
+    from .romanization import RomanizationKeys
 
-__all__ = ['Name', 'sort_name_parts']
+__all__ = ['Name', 'NameCache', 'sort_name_parts']
 log = logging.getLogger(__name__)
 
+# The minimum number of names for which find_best_matches will use batch scoring
+BATCH_SCORE_MIN = 25
+# The max number of distinct parsed values that are kept by Name.from_enclosed
+NAME_CACHE_SIZE = 50_000
+# The max number of distinct strings for which language category profiles are kept
+LANG_PROFILE_CACHE_SIZE = 50_000
+
 non_word_char_sub = re.compile(r'\W').sub
 NamePartType = TypeVar('NamePartType')
 NameLike = Union['Name', str]
@@ -87,7 +98,26 @@ class Name(ClearableCachedPropertyMixin):
 
     @classmethod
     def from_enclosed(cls, name: str, **kwargs) -> Name:
-        if LangCat.categorize(name) == LangCat.MIX:
+        """
+        Results are cached (see :class:`NameCache`), so repeated values are only parsed once.  A new Name is returned
+        each time, so the returned Name may be modified freely.
+
+        The given ``extra`` value is not part of the cache key, and it is not copied - it is attached to the returned
+        Name as-is after parsing, along with any extra values (such as ``unknown`` parts) that were found while parsing.
+        """
+        extra = kwargs.pop('extra', None)
+        key = _cache_key(cls, name, kwargs) if kwargs else (cls, name)
+        result = _ENCLOSED_CACHE.get(key, partial(cls._from_enclosed, name, **kwargs))
+        if extra is not None:
+            if parsed_extra := result.extra:
+                extra.update(parsed_extra)
+            # extra is not used by any cached properties, so the interned derived values do not need to be reset
+            result.__dict__['extra'] = extra
+        return result
+
+    @classmethod
+    def _from_enclosed(cls, name: str, **kwargs) -> Name:
+        if _lang_profile(name).lang == LangCat.MIX:
             parts = split_enclosed(name, reverse=True, maxsplit=1)
         else:
             parts = (name,)
@@ -108,7 +138,7 @@ class Name(ClearableCachedPropertyMixin):
                 non_eng = part
             elif not eng and LangCat.contains_any(part, LangCat.ENG):
                 eng = part
-            elif eng and non_eng and LangCat.categorize(part) == LangCat.ENG:
+            elif eng and non_eng and _lang_profile(part).lang == LangCat.ENG:
                 name = cls(eng, non_eng, **kwargs)
                 if name.has_romanization(part):
                     name.romanized = part
@@ -217,6 +247,18 @@ class Name(ClearableCachedPropertyMixin):
         attrs['eng'] = attrs.pop('_english')
         return self.__class__(**attrs)
 
+    def _interned_copy(self) -> Name:
+        """
+        Unlike :meth:`.__copy__`, this copy shares all string values and all cached derived values that were already
+        computed with this Name, and only ``versions`` and ``extra`` (which may be modified in place) are copied.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.__dict__['versions'] = deepcopy(self.versions) if self.versions else set()
+        if (extra := self.extra) is not None:
+            clone.__dict__['extra'] = deepcopy(extra)
+        return clone
+
     def __bool__(self) -> bool:
         return bool(self._english or self.non_eng or self.romanized or self.lit_translation)
 
@@ -286,13 +328,17 @@ class Name(ClearableCachedPropertyMixin):
         fuzzed = fuzz_process(text, space=False) if fuzz else text
         if not fuzzed:
             return False
-        if self.korean and self._romanization_pattern.match(fuzzed):
-            return True
+        if self.korean:
+            if (keys := self._romanization_keys) is not None:
+                if keys.matches(fuzzed):
+                    return True
+            elif self._romanization_pattern.match(fuzzed):
+                return True
         if self.japanese or self.cjk:  # Not mutually exclusive with previous condition
             return fuzzed in self._romanizations
         return False
 
-    def find_best_match(self, others: Collection[NameLike], threshold: int = 90, **kwargs) -> Name | None:
+    def find_best_match(self, others: Collection[NameLike] | NameIndex, threshold: int = 90, **kwargs) -> Name | None:
         try:
             return max(self.find_best_matches(others, threshold, **kwargs))[1]
         except ValueError as e:
@@ -302,7 +348,7 @@ class Name(ClearableCachedPropertyMixin):
 
     def find_best_matches(
         self,
-        others: Collection[NameLike],
+        others: Collection[NameLike] | NameIndex,
         threshold: int = 90,
         *,
         rom_match_score: int = 95,
@@ -310,14 +356,52 @@ class Name(ClearableCachedPropertyMixin):
         try_alt: bool = True,
         try_ost: bool = True,
     ) -> Iterator[tuple[int, Name]]:
+        """
+        :param others: The names to compare against.  If a :class:`.NameIndex` is provided, and the threshold is at
+          least as high as the index's threshold, then only the index's candidates for this name are scored.
+        :param threshold: The minimum score for a name to be considered a match
+        :param rom_match_score: The score to use for romanization matches
+        :param other_versions: Whether versions of other names should be compared
+        :param try_alt: Whether alternate romanizations should be considered
+        :param try_ost: Whether no-suffix versions of OST names should be compared
+        :return: Generator that yields 2-tuples of (score, name) for each name whose score met the threshold
+        """
         # Note: Use `sorted(..., reverse=True)` for the best matches to be at the beginning
-        for other in map(_normalize_name, others):
-            score = self.get_match_score(
-                other, rom_match_score=rom_match_score, other_versions=other_versions, try_alt=try_alt, try_ost=try_ost
-            )
+        if isinstance(others, NameIndex) and threshold >= others.threshold:
+            others = others.candidates(self)
+        others = list(map(_normalize_name, others))
+        ratio = self._batch_ratio_func(others, threshold) if len(others) >= BATCH_SCORE_MIN else revised_weighted_ratio
+        for other in others:
+            try:
+                score = max(self._score(other, rom_match_score, other_versions, try_alt, try_ost, ratio))
+            except ValueError as e:
+                if 'max() iterable argument is empty' in e.args:
+                    continue
+                raise
             if score >= threshold:
                 yield score, other
 
+    def _batch_ratio_func(self, others: Collection[Name], threshold: int) -> Callable[[str, str], int]:
+        """
+        Scores this name's values against all values of the given names via :func:`.revised_weighted_ratios`.  Scores
+        below the threshold may be reported as 0, which does not affect any score that meets the threshold in
+        :meth:`._score`.  Any other pairs of values are scored individually.
+        """
+        values = {v for other in others for name in (other, *other.versions) for v in name._ratio_values}
+        choices = list(values)
+        scores = {}
+        for value in self._ratio_values:
+            batch_scores = revised_weighted_ratios(value, choices, threshold)
+            scores.update(((value, choice), score) for choice, score in zip(choices, batch_scores))
+
+        def ratio(p1: str, p2: str) -> int:
+            try:
+                return scores[(p1, p2)]
+            except KeyError:
+                return revised_weighted_ratio(p1, p2)
+
+        return ratio
+
     def get_match_score(
         self,
         other: NameLike,
@@ -353,6 +437,7 @@ class Name(ClearableCachedPropertyMixin):
         other_versions: bool = True,
         try_alt: bool = True,
         try_ost: bool = True,
+        ratio: Callable[[str, str], int] = revised_weighted_ratio,
     ) -> Iterator[int]:
         # log.debug(
         #     f'Scoring match:\n{self.full_repr(attrs=["eng_langs", "non_eng_langs"])}'
@@ -361,7 +446,7 @@ class Name(ClearableCachedPropertyMixin):
         # )
         ep_score = None
         if self.non_eng_nospace and other.non_eng_nospace and self.non_eng_langs == other.non_eng_langs:
-            score = revised_weighted_ratio(self.non_eng_nospace, other.non_eng_nospace)
+            score = ratio(self.non_eng_nospace, other.non_eng_nospace)
             if score == 100 and self._english and other._english:
                 ep_score = self._score_eng_parts(other)
                 score = (score + ep_score) // 2
@@ -369,7 +454,7 @@ class Name(ClearableCachedPropertyMixin):
             yield score
 
         if self.eng_fuzzed_nospace and other.eng_fuzzed_nospace:
-            yield revised_weighted_ratio(self.eng_fuzzed_nospace, other.eng_fuzzed_nospace)
+            yield ratio(self.eng_fuzzed_nospace, other.eng_fuzzed_nospace)
 
         for a, b in ((self, other), (other, self)):
             if a.non_eng_nospace and b.eng_fuzzed_nospace and a.has_romanization(b.eng_fuzzed_nospace, False):
@@ -387,19 +472,19 @@ class Name(ClearableCachedPropertyMixin):
 
         if self.versions:
             for version in self.versions:
-                yield from version._score(other, rom_match_score, try_alt=try_alt, try_ost=try_ost)
+                yield from version._score(other, rom_match_score, try_alt=try_alt, try_ost=try_ost, ratio=ratio)
 
         if other_versions and other.versions:
             for version in other.versions:
-                yield from self._score(version, rom_match_score, other_versions=False, try_alt=try_alt, try_ost=try_ost)
+                yield from self._score(version, rom_match_score, False, try_alt, try_ost, ratio)
 
         if try_ost:
             if self._is_ost:
                 # log.debug(f'{self!r}: Trying {self.no_suffix_version!r}._score with {other!r}', extra={'color': (0, 8)})
-                yield from self.no_suffix_version._score(other, rom_match_score, other_versions, try_alt, False)
+                yield from self.no_suffix_version._score(other, rom_match_score, other_versions, try_alt, False, ratio)
             elif other._is_ost:
                 # log.debug(f'{self!r}: Trying self._score with {other.no_suffix_version!r}', extra={'color': (0, 8)})
-                yield from self._score(other.no_suffix_version, rom_match_score, other_versions, try_alt, False)
+                yield from self._score(other.no_suffix_version, rom_match_score, other_versions, try_alt, False, ratio)
 
     def _is_asian_misclassified_as_eng(self) -> bool:
         return not self.non_eng and self.eng_lang == LangCat.MIX and self.eng_langs.intersection(LangCat.asian_cats)
@@ -537,6 +622,11 @@ class Name(ClearableCachedPropertyMixin):
 
     # region Normalized Versions of Attributes
 
+    @property
+    def _ratio_values(self) -> tuple[str, ...]:
+        """The values that are compared via :func:`.revised_weighted_ratio` in :meth:`._score`"""
+        return tuple(v for v in (self.eng_fuzzed_nospace, self.non_eng_nospace) if v)
+
     @cached_property
     def no_suffix_version(self) -> Name | None:
         if self._is_ost:
@@ -595,21 +685,29 @@ class Name(ClearableCachedPropertyMixin):
 
     # region Language Categories
 
+    @cached_property
+    def _eng_profile(self) -> _LangProfile:
+        return _lang_profile(self.english)
+
+    @cached_property
+    def _non_eng_profile(self) -> _LangProfile:
+        return _lang_profile(self.non_eng)
+
     @cached_property
     def eng_lang(self) -> LangCat:
-        return LangCat.categorize(self.english)
+        return self._eng_profile.lang
 
     @cached_property
-    def eng_langs(self) -> set[LangCat]:
-        return LangCat.categorize(self.english, True)
+    def eng_langs(self) -> frozenset[LangCat]:
+        return self._eng_profile.langs
 
     @cached_property
     def non_eng_lang(self) -> LangCat:
-        return LangCat.categorize(self.non_eng)
+        return self._non_eng_profile.lang
 
     @cached_property
-    def non_eng_langs(self) -> set[LangCat]:
-        return LangCat.categorize(self.non_eng, True)
+    def non_eng_langs(self) -> frozenset[LangCat]:
+        return self._non_eng_profile.langs
 
     # endregion
 
@@ -617,33 +715,166 @@ class Name(ClearableCachedPropertyMixin):
 
     @cached_property
     def korean(self) -> OptStr:
-        return self._non_eng_if_expected(LangCat.HAN)
+        return self.non_eng if self._non_eng_profile.korean else None
 
     @cached_property
     def japanese(self) -> OptStr:
-        return self._non_eng_if_expected(LangCat.JPN)
+        return self.non_eng if self._non_eng_profile.japanese else None
 
     @cached_property
     def cjk(self) -> OptStr:
-        return self._non_eng_if_expected(LangCat.CJK)
+        return self.non_eng if self._non_eng_profile.cjk else None
 
     @cached_property
     def _romanization_pattern(self) -> Pattern:
-        return hangul_romanized_permutations_pattern(self.non_eng_nospecial, False)
+        return korean_romanization_pattern(self.non_eng_nospecial)
+
+    @cached_property
+    def _romanization_keys(self) -> RomanizationKeys | None:
+        """The expanded Korean romanization keys, or None if this is not a Korean name or they could not be expanded"""
+        return korean_romanization_keys(self.non_eng_nospecial) if self.korean else None
 
     @cached_property
-    def _romanizations(self) -> list[str]:
+    def _romanizations(self) -> frozenset[str]:
         if text := self.non_eng_nospace if self.japanese or self.cjk else None:
-            return list(J2R().romanize(text))
-        return []
+            return japanese_romanizations(text)
+        return frozenset()
+
+    # endregion
+
+
+NameOrNames = TypeVar('NameOrNames', Name, list[Name])
+
+
+class NameCache:
+    """
+    A bounded, thread-safe LRU cache of parsed :class:`Name` objects (or lists of them).
+
+    Cached names are never returned directly.  Each lookup returns new Name objects that share the cached names' string
+    values and the derived values (fuzzed / normalized versions, language categories, etc.) that were computed for
+    them.
+    The most commonly used derived values are computed for cached names the first time that a value is requested again,
+    so they are only computed once for each distinct value that is parsed more than once.
+
+    :param maxsize: The max number of distinct values to cache
+    """
 
-    def _non_eng_if_expected(self, expected: LangCat) -> OptStr:
-        non_eng_lang = self.non_eng_lang
-        if non_eng_lang == expected or non_eng_lang == LangCat.MIX and expected in self.non_eng_langs:
-            return self.non_eng
+    __slots__ = ('_cache', '_lock', 'maxsize', 'hits', 'misses')
+    _warm_attrs = ('english', 'eng_fuzzed_nospace', 'non_eng_nospace', 'eng_lang', 'non_eng_lang', '_is_ost')
+
+    def __init__(self, maxsize: int):
+        self._cache = OrderedDict()
+        self._lock = Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        size, maxsize = len(self._cache), self.maxsize
+        return f'<{self.__class__.__name__}[{size=}, {maxsize=}, hits={self.hits}, misses={self.misses}]>'
+
+    def get(self, key: Hashable | None, parse: Callable[[], NameOrNames]) -> NameOrNames:
+        """
+        :param key: The key for the value to be parsed.  If None, then the value will be parsed without caching.
+        :param parse: A callable that returns the parsed Name or list of Names for the given key
+        :return: The parsed Name or list of Names
+        """
+        if key is None:
+            return parse()
+        with self._lock:
+            if (entry := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+
+        if entry is None:
+            self.misses += 1
+            result = parse()
+            if isinstance(result, list):
+                templates = [name._interned_copy() for name in result]
+            else:
+                templates = result._interned_copy()
+            with self._lock:
+                self._cache[key] = [templates, False]
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+            return result
+
+        self.hits += 1
+        templates, warm = entry
+        if not warm:
+            for name in templates if isinstance(templates, list) else (templates,):
+                for attr in self._warm_attrs:
+                    getattr(name, attr)
+            entry[1] = True
+
+        if isinstance(templates, list):
+            return [name._interned_copy() for name in templates]
+        return templates._interned_copy()
+
+    def resize(self, maxsize: int):
+        """Change the max number of values to cache, discarding the least recently used values if necessary"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._cache) > maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+        self.hits = self.misses = 0
+
+
+_ENCLOSED_CACHE = NameCache(NAME_CACHE_SIZE)
+
+
+def _cache_key(*parts: Any) -> Hashable | None:
+    """
+    :return: A hashable key for the given values, or None if any of them (or any of the values that they contain) are
+      not hashable
+    """
+    try:
+        key = tuple(map(_freeze, parts))
+        hash(key)
+    except TypeError:
         return None
+    return key
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return value
+    elif isinstance(value, Mapping):
+        return type(value), tuple((key, _freeze(val)) for key, val in value.items())
+    elif isinstance(value, (list, tuple)):
+        return type(value), tuple(map(_freeze, value))
+    elif isinstance(value, (set, frozenset)):
+        return type(value), frozenset(map(_freeze, value))
+    return value
+
+
+class _LangProfile:
+    """
+    The language categories of a string, and the conditional non-English attributes of :class:`Name` that depend on
+    them.  Profiles are cached per string (see :func:`._lang_profile`), so categorization is only performed once for
+    each distinct value, regardless of how many Names contain it.
+    """
+
+    __slots__ = ('lang', 'langs', 'korean', 'japanese', 'cjk')
+
+    def __init__(self, text: OptStr):
+        self.lang = lang = LangCat.categorize(text)
+        self.langs = langs = frozenset(LangCat.categorize(text, True))
+        is_mix = lang == LangCat.MIX
+        self.korean = lang == LangCat.HAN or is_mix and LangCat.HAN in langs
+        self.japanese = lang == LangCat.JPN or is_mix and LangCat.JPN in langs
+        self.cjk = lang == LangCat.CJK or is_mix and LangCat.CJK in langs
 
-    # endregion
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}[{self.lang!r}, langs={set(self.langs)}]>'
+
+
+@lru_cache(LANG_PROFILE_CACHE_SIZE)
+def _lang_profile(text: OptStr) -> _LangProfile:
+    return _LangProfile(text)
 
 
 class _NamePart:
@@ -652,7 +883,7 @@ class _NamePart:
     def __init__(self, pos: int, value: str):
         self.pos = pos
         self.value = value
-        self.cat = LangCat.categorize(value)
+        self.cat = _lang_profile(value).lang
 
     def __lt__(self, other: _NamePart) -> bool:
         s_cat = self.cat
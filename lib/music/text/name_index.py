@@ -0,0 +1,372 @@
+"""
+Blocking index that can be used to avoid scoring every pair of :class:`Name` objects when looking for matches.
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, insort
+from collections import Counter
+from math import ceil
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from .name import Name
+    from .romanization import RomanizationKeys
+
+__all__ = ['NameIndex']
+log = logging.getLogger(__name__)
+
+Token = tuple[int, str, int]
+# The highest score that :func:`.revised_weighted_ratio` can return from its partial / token-based comparisons for
+# strings that do not contain any spaces when the plain ratio is lower.  Matching thresholds above this value imply a
+# minimum plain ratio, which is what makes pruning candidates via shared characters safe.
+_MAX_NON_RATIO_SCORE = 75
+
+
+class NameIndex:
+    """
+    An insertion-ordered collection of :class:`Name` objects that can find the indexed Names that may match a given
+    Name without scoring every indexed Name.
+
+    :meth:`Name.matches` can only succeed if, for some pair of variants of the two names (each name, its versions, and
+    its no-suffix version if it is an OST), 1) the space-stripped non-English or fuzzed English values of both variants
+    have a :func:`.revised_weighted_ratio` score that meets the threshold, or if 2) one variant's non-English value is
+    romanized as the other's fuzzed English value.  For thresholds above 75, the first case requires the plain
+    Levenshtein ratio of those values to meet the threshold, which in turn requires them to share a minimum number of
+    characters.  Values are indexed by the rarest characters that they contain (prefix filtering), so any two values
+    that could share enough characters will share at least one indexed character.  Romanizations of Japanese / CJK
+    names are indexed directly, as are the expanded keys of Korean romanization patterns (see
+    :func:`.korean_romanization_keys`).  Korean romanization patterns that could not be expanded are only evaluated
+    against indexed English values.
+    Names that require any of the other paths in :meth:`Name._score` (such as nested versions, or alternate
+    romanizations of names that were misclassified as English) are always considered to be candidates.
+
+    The same guarantee applies to :meth:`Name.get_match_score` with any options, since disabling any of them only
+    removes paths, so this index can be passed to :meth:`Name.find_best_matches` for any threshold that is at least as
+    high as the index's threshold.
+
+    Candidates are returned in insertion order, so ``index.find_match(name)`` returns the same result as
+    ``next(filter(name.matches, names), None)`` for an equivalent ``names`` collection.  Indexed names must not be
+    modified while they are in the index.
+
+    :param names: Names that should be added to this index
+    :param threshold: The score threshold that will be used for :meth:`Name.matches`
+    :param rom_match_score: The score that will be used for romanization matches
+    :param corpus: Names to use to determine the relative rarity of characters (defaults to the given names).  Providing
+      all names that will be added to this index, if known in advance, results in fewer false-positive candidates.
+    """
+
+    __slots__ = (
+        'threshold', 'rom_match_score', '_min_ratio', '_weights', '_entries', '_count', '_eng_index', '_non_eng_index',
+        '_eng_keys', '_sorted_eng_keys', '_romanizations', '_korean_keys', '_korean_prefixes', '_prefix_lengths',
+        '_korean', '_unindexed',
+    )
+
+    def __init__(
+        self,
+        names: Iterable[Name] = None,
+        threshold: int = 90,
+        rom_match_score: int = 95,
+        *,
+        corpus: Iterable[Name] = None,
+    ):
+        self.threshold = threshold
+        self.rom_match_score = rom_match_score
+        # The integer score is rounded, so a ratio slightly below the threshold can still result in a match
+        self._min_ratio = (threshold - 1) / 100
+        names = list(names) if names else ()
+        self._weights = Counter(c for name in (names if corpus is None else corpus) for c in _get_chars(name))
+        self._entries: dict[Name, _Entry] = {}
+        self._count = 0
+        self._eng_index: dict[Token, dict[Name, _Entry]] = {}
+        self._non_eng_index: dict[Token, dict[Name, _Entry]] = {}
+        self._eng_keys: dict[str, dict[Name, _Entry]] = {}
+        self._sorted_eng_keys: list[str] = []
+        self._romanizations: dict[str, dict[Name, _Entry]] = {}
+        # Expanded Korean romanization keys that must match a whole English value, or only its beginning, respectively
+        self._korean_keys: dict[str, dict[Name, _Entry]] = {}
+        self._korean_prefixes: dict[str, dict[Name, _Entry]] = {}
+        self._prefix_lengths: Counter[int] = Counter()
+        self._korean: dict[Name, _Entry] = {}
+        self._unindexed: dict[Name, _Entry] = {}
+        if names:
+            for name in names:
+                self.add(name)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}[{len(self._entries)} names, threshold={self.threshold}]>'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: Name) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[Name]:
+        return iter(self._entries)
+
+    # region Add / Remove
+
+    def add(self, name: Name):
+        """Add the given name to this index.  If an equal name is already present, its position is not changed."""
+        if name in self._entries:
+            return
+
+        self._entries[name] = entry = _Entry(self, name, self._count)
+        self._count += 1
+        if entry.unindexed:
+            self._unindexed[name] = entry
+            return
+
+        for index, keys in ((self._eng_index, entry.eng), (self._non_eng_index, entry.non_eng)):
+            for key in keys:
+                for token in key.prefix:
+                    index.setdefault(token, {})[name] = entry
+
+        for key in entry.eng:
+            if key.value not in self._eng_keys:
+                insort(self._sorted_eng_keys, key.value)
+            self._eng_keys.setdefault(key.value, {})[name] = entry
+        for romanization in entry.romanizations:
+            self._romanizations.setdefault(romanization, {})[name] = entry
+        for rom_keys in entry.korean_keys:
+            index = self._korean_keys if rom_keys.anchored else self._korean_prefixes
+            for rom_key in rom_keys.keys:
+                if not rom_keys.anchored and rom_key not in index:
+                    self._prefix_lengths[len(rom_key)] += 1
+                index.setdefault(rom_key, {})[name] = entry
+        if entry.korean:
+            self._korean[name] = entry
+
+    def discard(self, name: Name):
+        """Remove the given name from this index, if it is present."""
+        try:
+            entry = self._entries.pop(name)
+        except KeyError:
+            return
+
+        name = entry.name
+        if entry.unindexed:
+            del self._unindexed[name]
+            return
+
+        for index, keys in ((self._eng_index, entry.eng), (self._non_eng_index, entry.non_eng)):
+            for token in {token for key in keys for token in key.prefix}:  # Keys for different variants may overlap
+                _discard(index, token, name)
+
+        for key in entry.eng:
+            _discard(self._eng_keys, key.value, name)
+            if key.value not in self._eng_keys:
+                sorted_keys = self._sorted_eng_keys
+                del sorted_keys[bisect_left(sorted_keys, key.value)]
+        for romanization in entry.romanizations:
+            _discard(self._romanizations, romanization, name)
+        for rom_keys in entry.korean_keys:
+            index = self._korean_keys if rom_keys.anchored else self._korean_prefixes
+            for rom_key in rom_keys.keys:
+                if name in index.get(rom_key, ()):  # Keys for different variants may overlap
+                    _discard(index, rom_key, name)
+                    if not rom_keys.anchored and rom_key not in index:
+                        self._prefix_lengths[len(rom_key)] -= 1
+                        if not self._prefix_lengths[len(rom_key)]:
+                            del self._prefix_lengths[len(rom_key)]
+        if entry.korean:
+            del self._korean[name]
+
+    # endregion
+
+    # region Candidates & Matches
+
+    def candidates(self, name: Name) -> list[Name]:
+        """
+        :param name: The name for which potential matches should be found
+        :return: The indexed names that may match the given name, in the order that they were added to this index
+        """
+        if self.threshold <= _MAX_NON_RATIO_SCORE:
+            return list(self._entries)
+
+        query = _Entry(self, name, -1)
+        if query.unindexed:
+            return list(self._entries)
+
+        candidates = self._unindexed.copy()
+        candidates.update(self._get_similar(self._eng_index, query.eng, attrgetter('eng')))
+        candidates.update(self._get_similar(self._non_eng_index, query.non_eng, attrgetter('non_eng')))
+
+        candidates.update(self._get_romanization_candidates(query))
+        return [entry.name for entry in sorted(candidates.values(), key=lambda e: e.order)]
+
+    def find_match(self, name: Name) -> Name | None:
+        """
+        :param name: The name for which a match should be found
+        :return: The first indexed name (in insertion order) that matches the given name, or None if no match was found
+        """
+        threshold, rom_match_score = self.threshold, self.rom_match_score
+        for candidate in self.candidates(name):
+            if name.matches(candidate, threshold, rom_match_score):
+                return candidate
+        return None
+
+    def _get_similar(
+        self, index: dict[Token, dict[Name, _Entry]], keys: list[_Key], get_keys: Callable[[_Entry], list[_Key]]
+    ) -> Iterator[tuple[Name, _Entry]]:
+        found = set()
+        for key in keys:
+            checked = set()
+            for token in key.prefix:
+                for other, entry in index.get(token, {}).items():
+                    if other not in checked and other not in found:
+                        checked.add(other)
+                        if any(self._may_match(key, other_key) for other_key in get_keys(entry)):
+                            found.add(other)
+                            yield other, entry
+
+    def _may_match(self, a: _Key, b: _Key) -> bool:
+        """
+        The Levenshtein ratio of 2 strings is ``2 * M / T``, where ``M`` is the length of their longest common
+        subsequence, and ``T`` is the sum of their lengths.  ``M`` can be no larger than the number of characters that
+        they share, or the length of the shorter string.
+        """
+        a_len, b_len = len(a.value), len(b.value)
+        min_total = self._min_ratio * (a_len + b_len)
+        if 2 * min(a_len, b_len) < min_total:
+            return False
+        return 2 * sum((a.counts & b.counts).values()) >= min_total
+
+    def _get_romanization_candidates(self, query: _Entry) -> Iterator[tuple[Name, _Entry]]:
+        korean_prefixes = self._korean_prefixes
+        for key in query.eng:
+            eng = key.value
+            yield from self._romanizations.get(eng, {}).items()
+            yield from self._korean_keys.get(eng, {}).items()
+            eng_len = len(eng)
+            for length in self._prefix_lengths:
+                if length <= eng_len:
+                    yield from korean_prefixes.get(eng[:length], {}).items()
+            # Korean romanization patterns that could not be expanded can't be indexed by value
+            for other, entry in self._korean.items():
+                if any(variant.has_romanization(eng, False) for variant in entry.korean):
+                    yield other, entry
+
+        for romanization in query.romanizations:
+            yield from self._eng_keys.get(romanization, {}).items()
+
+        for rom_keys in query.korean_keys:
+            if rom_keys.anchored:
+                for rom_key in rom_keys.keys:
+                    yield from self._eng_keys.get(rom_key, {}).items()
+            else:
+                for eng in self._iter_eng_keys_with_prefixes(rom_keys.keys):
+                    yield from self._eng_keys[eng].items()
+
+        for variant in query.korean:
+            for eng, name_entry_map in self._eng_keys.items():
+                if variant.has_romanization(eng, False):
+                    yield from name_entry_map.items()
+
+    def _iter_eng_keys_with_prefixes(self, prefixes: Iterable[str]) -> Iterator[str]:
+        sorted_keys = self._sorted_eng_keys
+        num_keys = len(sorted_keys)
+        for prefix in prefixes:
+            i = bisect_left(sorted_keys, prefix)
+            while i < num_keys and sorted_keys[i].startswith(prefix):
+                yield sorted_keys[i]
+                i += 1
+
+    # endregion
+
+    def _get_prefix(self, value: str) -> tuple[Token, ...]:
+        """
+        Returns the rarest characters in the given value, such that any other value with a high enough ratio to the
+        given value must share at least one of them.  If the ratio meets the threshold, then the number of shared
+        characters ``M`` satisfies ``M >= r * len(value) / (2 - r)`` for any value length, so they will share at least
+        one of the ``len(value) - ceil(r * len(value) / (2 - r)) + 1`` rarest characters (using the same order).
+        """
+        weights = self._weights
+        seen = Counter()
+        tokens = []
+        for c in value:
+            tokens.append((weights[c], c, seen[c]))  # Repeated characters are distinct tokens
+            seen[c] += 1
+
+        tokens.sort()
+        size = len(tokens)
+        min_ratio = self._min_ratio
+        return tuple(tokens[:size - ceil(min_ratio * size / (2 - min_ratio)) + 1])
+
+
+class _Key:
+    __slots__ = ('value', 'counts', 'prefix')
+
+    def __init__(self, index: NameIndex, value: str):
+        self.value = value
+        self.counts = Counter(value)
+        self.prefix = index._get_prefix(value)
+
+
+class _Entry:
+    __slots__ = ('name', 'order', 'unindexed', 'eng', 'non_eng', 'romanizations', 'korean_keys', 'korean')
+
+    def __init__(self, index: NameIndex, name: Name, order: int):
+        self.name = name
+        self.order = order
+        variants = _get_variants(name)
+        self.unindexed = variants is None
+        if self.unindexed:
+            return
+
+        eng_keys, non_eng_keys = {}, {}
+        self.romanizations = set()
+        self.korean_keys: list[RomanizationKeys] = []  # Expanded Korean romanization patterns
+        self.korean: list[Name] = []  # Variants with Korean romanization patterns that could not be expanded
+        for variant in variants:
+            if (eng := variant.eng_fuzzed_nospace) and eng not in eng_keys:
+                eng_keys[eng] = _Key(index, eng)
+            if non_eng := variant.non_eng_nospace:
+                if non_eng not in non_eng_keys:
+                    non_eng_keys[non_eng] = _Key(index, non_eng)
+                self.romanizations.update(variant._romanizations)
+                if variant.korean:
+                    if (rom_keys := variant._romanization_keys) is not None:
+                        self.korean_keys.append(rom_keys)
+                    else:
+                        self.korean.append(variant)
+
+        self.eng: list[_Key] = list(eng_keys.values())
+        self.non_eng: list[_Key] = list(non_eng_keys.values())
+
+
+def _get_variants(name: Name) -> list[Name] | None:
+    """
+    :param name: A Name
+    :return: The variants of the given name whose values may be compared by :meth:`Name._score`, or None if the name
+      may match via a path that can't be indexed
+    """
+    variants = [name, *name.versions]
+    if any(version.versions or version._is_ost for version in name.versions):
+        return None
+    if name._is_ost:
+        if name.versions or (no_suffix := name.no_suffix_version)._is_ost:
+            return None
+        variants.append(no_suffix)
+    if any(variant._is_asian_misclassified_as_eng() for variant in variants):
+        return None
+    return variants
+
+
+def _get_chars(name: Name) -> Iterator[str]:
+    for variant in (name, *name.versions):
+        for value in (variant.eng_fuzzed_nospace, variant.non_eng_nospace):
+            if value:
+                yield from value
+
+
+def _discard(index: dict[str | Token, dict[Name, _Entry]], key: str | Token, name: Name):
+    names = index[key]
+    del names[name]
+    if not names:
+        del index[key]
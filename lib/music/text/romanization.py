@@ -0,0 +1,173 @@
+"""
+Precomputed romanization keys, so that romanization matches can be identified via hash lookups instead of constructing
+and evaluating a regex for every comparison.
+
+Korean romanizations are described by a permutation pattern rather than a set of values.  Those patterns only consist
+of literal alternatives, so the finite set of strings that they can match is expanded once per distinct value.  Values
+whose patterns contain constructs that can't be expanded, or that would expand to too many keys, fall back to the
+pattern.
+
+:author: Doug Skrypa
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from itertools import product
+from re import _constants as sre_c, _parser as sre_parse  # noqa
+from typing import Optional, Pattern
+
+from ds_tools.unicode.hangul import hangul_romanized_permutations_pattern
+from ds_tools.unicode.languages import J2R
+
+__all__ = ['RomanizationKeys', 'korean_romanization_pattern', 'korean_romanization_keys', 'japanese_romanizations']
+log = logging.getLogger(__name__)
+
+# The max number of distinct values for which romanization patterns / keys are kept
+ROMANIZATION_CACHE_SIZE = 20_000
+# The max number of keys that a single pattern may be expanded to before falling back to the pattern
+ROMANIZATION_KEY_LIMIT = 4096
+
+_UNSUPPORTED_FLAGS = re.MULTILINE | re.DOTALL | re.LOCALE
+_AT_START = {sre_c.AT_BEGINNING, sre_c.AT_BEGINNING_STRING}
+_AT_END = {sre_c.AT_END, sre_c.AT_END_STRING}
+_REPEATS = {sre_c.MAX_REPEAT, sre_c.MIN_REPEAT, getattr(sre_c, 'POSSESSIVE_REPEAT', sre_c.MAX_REPEAT)}
+
+
+class _Unexpandable(Exception):
+    pass
+
+
+class RomanizationKeys:
+    """
+    The set of strings that a romanization pattern can match.  Since patterns are evaluated via ``pattern.match``, a
+    pattern that is not anchored at the end matches any text that starts with one of its keys.
+    """
+
+    __slots__ = ('keys', 'anchored', 'lengths')
+
+    def __init__(self, keys: frozenset[str], anchored: bool):
+        self.keys = keys
+        self.anchored = anchored
+        self.lengths = sorted({len(key) for key in keys})
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}[keys={len(self.keys)}, anchored={self.anchored}]>'
+
+    def matches(self, text: str) -> bool:
+        """
+        :param text: A fuzzed string that may be a romanization
+        :return: True if the pattern that these keys were expanded from would match the given text, False otherwise
+        """
+        keys = self.keys
+        if self.anchored:
+            return text in keys
+
+        max_len = len(text)
+        for length in self.lengths:
+            if length > max_len:
+                break
+            elif text[:length] in keys:
+                return True
+        return False
+
+
+@lru_cache(ROMANIZATION_CACHE_SIZE)
+def korean_romanization_pattern(text: str) -> Pattern:
+    return hangul_romanized_permutations_pattern(text, False)
+
+
+@lru_cache(ROMANIZATION_CACHE_SIZE)
+def korean_romanization_keys(text: str) -> Optional[RomanizationKeys]:
+    """
+    :param text: A Korean string, with special characters removed
+    :return: The expanded keys for the given text's romanization pattern, or None if it could not be expanded
+    """
+    pattern = korean_romanization_pattern(text)
+    try:
+        return _expand_pattern(pattern)
+    except _Unexpandable as e:
+        log.debug(f'Unable to expand romanization pattern for {text!r}: {e}')
+        return None
+
+
+@lru_cache(ROMANIZATION_CACHE_SIZE)
+def japanese_romanizations(text: str) -> frozenset[str]:
+    return frozenset(J2R().romanize(text))
+
+
+# region Pattern Expansion
+
+
+def _expand_pattern(pattern: Pattern) -> RomanizationKeys:
+    if not isinstance(pattern.pattern, str):
+        raise _Unexpandable('bytes patterns are not supported')
+    elif pattern.flags & _UNSUPPORTED_FLAGS:
+        raise _Unexpandable(f'unsupported flags={pattern.flags}')
+
+    items = list(sre_parse.parse(pattern.pattern, pattern.flags))
+    if items and items[0][0] == sre_c.AT and items[0][1] in _AT_START:
+        items = items[1:]  # pattern.match is already anchored at the beginning
+    if anchored := bool(items and items[-1][0] == sre_c.AT and items[-1][1] in _AT_END):
+        items = items[:-1]
+
+    keys = _expand_sequence(items)
+    if pattern.flags & re.IGNORECASE:
+        keys = {key.lower() for key in keys}  # Fuzzed text is always lower case
+    return RomanizationKeys(frozenset(keys), anchored)
+
+
+def _expand_sequence(items) -> set[str]:
+    results = {''}
+    for op, av in items:
+        options = _expand_item(op, av)
+        if len(results) * len(options) > ROMANIZATION_KEY_LIMIT:
+            raise _Unexpandable(f'more than {ROMANIZATION_KEY_LIMIT} keys')
+        results = {a + b for a in results for b in options}
+    return results
+
+
+def _expand_item(op, av) -> set[str]:
+    if op == sre_c.LITERAL:
+        return {chr(av)}
+    elif op == sre_c.IN:
+        return _expand_class(av)
+    elif op == sre_c.SUBPATTERN:
+        group, add_flags, del_flags, sub_pattern = av
+        if add_flags or del_flags:
+            raise _Unexpandable('inline flags are not supported')
+        return _expand_sequence(sub_pattern)
+    elif op == sre_c.BRANCH:
+        results = set()
+        for sub_pattern in av[1]:
+            results.update(_expand_sequence(sub_pattern))
+        return results
+    elif op in _REPEATS:
+        min_count, max_count, sub_pattern = av
+        if max_count == sre_c.MAXREPEAT or max_count > ROMANIZATION_KEY_LIMIT:
+            raise _Unexpandable('unbounded repetition')
+        options = _expand_sequence(sub_pattern)
+        results = set()
+        for count in range(min_count, max_count + 1):
+            if len(options) ** count > ROMANIZATION_KEY_LIMIT:
+                raise _Unexpandable(f'more than {ROMANIZATION_KEY_LIMIT} keys')
+            results.update(map(''.join, product(options, repeat=count)))
+        return results
+    raise _Unexpandable(f'unsupported {op=}')
+
+
+def _expand_class(items) -> set[str]:
+    results = set()
+    for op, av in items:
+        if op == sre_c.LITERAL:
+            results.add(chr(av))
+        elif op == sre_c.RANGE and av[1] - av[0] < ROMANIZATION_KEY_LIMIT:
+            results.update(map(chr, range(av[0], av[1] + 1)))
+        else:
+            raise _Unexpandable(f'unsupported character class {op=}')
+    return results
+
+
+# endregion
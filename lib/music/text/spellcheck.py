@@ -5,26 +5,33 @@
 from __future__ import annotations
 
 import logging
-from functools import cached_property
-from typing import TYPE_CHECKING, Callable, Iterator, Match
+import mmap
+import sys
+from array import array
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Match
+from zlib import crc32
 
 if TYPE_CHECKING:
-    from symspellpy import Verbosity, SymSpell
+    from music.typing import PathLike
 
-__all__ = ['init_sym_spell', 'is_english', 'english_probability']
+__all__ = ['WordList', 'load_word_list', 'is_english', 'english_probability']
 log = logging.getLogger(__name__)
 
+WORD_LIST_NAME = 'words.idx'
+WORD_CACHE_SIZE = 100_000  # The max number of word lookup results to cache
+_MAGIC = b'MMWORDS' + sys.byteorder[0].encode()  # Integers are stored in native byte order
+
 
 class SpellChecker:
     @cached_property
-    def sym_spell(self) -> SymSpell:
-        return init_sym_spell()
+    def words(self) -> WordList:
+        return load_word_list()
 
     @cached_property
-    def _verbosity(self) -> Verbosity:
-        from symspellpy import Verbosity
-
-        return Verbosity.TOP
+    def _is_word(self) -> Callable[[str], bool]:
+        return lru_cache(WORD_CACHE_SIZE)(self.words.__contains__)
 
     @cached_property
     def word_finder(self) -> Callable[[str], Iterator[Match]]:
@@ -33,11 +40,9 @@ class SpellChecker:
         return re.compile(r'(\w+)').finditer
 
     def is_english(self, text: str) -> bool:
-        lookup = self.sym_spell.lookup
-        verbosity = self._verbosity
+        is_word = self._is_word
         for m in self.word_finder(text.lower()):
-            results = lookup(m.group(), verbosity)
-            if not results or results[0].distance != 0:
+            if not is_word(m.group()):
                 return False
         return True
 
@@ -46,26 +51,110 @@ class SpellChecker:
         Approximate the likelihood that the provided text is English.
 
         For strings containing multiple words (delimited by spaces), the string is split and each separate word is
-        analyzed.  The return value is calculated as the sum of the number of characters that would not need to change
-        to make each word match an entry in the dictionary (edit distance) over the total number of word characters.
+        analyzed.  The return value is calculated as the number of characters in words that are in the dictionary over
+        the total number of word characters.
 
         :param text: The text to analyze
         :return: A value between 0 and 1, inclusive
         """
-        words = text.lower().split()
-        lookup = self.sym_spell.lookup
-        verbosity = self._verbosity
-        total_dist = 0
+        is_word = self._is_word
         char_count = 0
-        for word in words:
-            results = lookup(word, verbosity)
+        eng_count = 0
+        for word in text.lower().split():
             char_count += len(word)
-            if results:
-                total_dist += results[0].distance
-            else:
-                total_dist += len(word)
-
-        return (char_count - total_dist) / char_count if char_count else 0
+            if is_word(word):
+                eng_count += len(word)
+
+        return eng_count / char_count if char_count else 0
+
+
+class WordList:
+    """
+    A set of words in a memory-mapped file.  Membership checks are hash table lookups against the mapped file, so it
+    does not need to be read or deserialized up front, and processes that use the same file share its pages via the OS
+    page cache.
+
+    File layout (all integers are native uint32s):
+
+    - An 8 byte magic value, the number of words, and the number of bits used for hash table slots
+    - The hash table, with ``2 ** bits`` slots (at least twice as many as words) that contain ``1 + word index`` for
+      the word whose CRC32 maps to that slot (collisions are resolved with linear probing), or 0 if empty
+    - ``count + 1`` offsets (relative to the start of the word data) that delimit each word
+    - The UTF-8 encoded words, sorted by their encoded bytes, with no delimiters
+
+    :param path: The path to a file that was written by :meth:`.build`
+    """
+
+    __slots__ = ('path', '_mmap', '_table', '_mask', '_offsets', '_data_start', '_count')
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with self.path.open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:8] != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f'Invalid word list file: {self.path.as_posix()}')
+        view = memoryview(self._mmap)
+        self._count, bits = view[8:16].cast('I')
+        self._mask = (1 << bits) - 1
+        offsets_start = 16 + 4 * (1 << bits)
+        self._data_start = data_start = offsets_start + 4 * (self._count + 1)
+        self._table = view[16:offsets_start].cast('I')
+        self._offsets = view[offsets_start:data_start].cast('I')
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}[{self._count} words @ {self.path.as_posix()}]>'
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, word: str) -> bool:
+        key = word.encode('utf-8')
+        data, table, offsets, start, mask = self._mmap, self._table, self._offsets, self._data_start, self._mask
+        slot = crc32(key) & mask
+        while index := table[slot]:
+            if data[start + offsets[index - 1]:start + offsets[index]] == key:
+                return True
+            slot = (slot + 1) & mask
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        data, offsets, start = self._mmap, self._offsets, self._data_start
+        for i in range(self._count):
+            yield data[start + offsets[i]:start + offsets[i + 1]].decode('utf-8')
+
+    @classmethod
+    def build(cls, path: PathLike, words: Iterable[str]) -> WordList:
+        """
+        :param path: The path to which the word list should be written.  It is written to a temp file first, which
+          then replaces any existing file, so other processes never see a partially written file.
+        :param words: The words to store
+        :return: The new WordList
+        """
+        encoded = sorted({word.encode('utf-8') for word in words})
+        bits = max(2 * len(encoded) - 1, 1).bit_length()
+        mask = (1 << bits) - 1
+        table = array('I', bytes(4 << bits))
+        offsets = array('I', [0])
+        pos = 0
+        for index, word in enumerate(encoded, 1):
+            pos += len(word)
+            offsets.append(pos)
+            slot = crc32(word) & mask
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = index
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with tmp_path.open('wb') as f:
+            f.write(_MAGIC)
+            array('I', [len(encoded), bits]).tofile(f)
+            table.tofile(f)
+            offsets.tofile(f)
+            f.write(b''.join(encoded))
+        tmp_path.replace(path)
+        return cls(path)
 
 
 spell_checker = SpellChecker()
@@ -73,38 +162,39 @@ is_english = spell_checker.is_english
 english_probability = spell_checker.english_probability
 
 
-def init_sym_spell():
-    from pathlib import Path
-    from symspellpy import SymSpell
+def load_word_list() -> WordList:
+    """
+    Load the word list from the user cache dir, building it first (from the symspellpy English frequency dictionary
+    and the bundled SCOWL word list) if necessary.
+    """
     from ds_tools.fs.paths import get_user_cache_dir
 
-    sym_spell = SymSpell(max_dictionary_edit_distance=0, prefix_length=1)
-    if (cached_path := Path(get_user_cache_dir('music_manager')).joinpath('words.pkl.gz')).exists():
-        log.debug(f'Loading pickled spellcheck dictionary: {cached_path.as_posix()}')
-        sym_spell.load_pickle(cached_path)
-        return sym_spell
+    path = Path(get_user_cache_dir('music_manager')).joinpath(WORD_LIST_NAME)
+    if path.exists():
+        try:
+            return WordList(path)
+        except ValueError as e:
+            log.warning(f'{e} - it will be rebuilt')
+
+    log.info(f'Saving spellcheck word list (this is a one-time action that may take a few seconds): {path.as_posix()}')
+    word_list = WordList.build(path, _iter_default_words())
+    path.with_name('words.pkl.gz').unlink(missing_ok=True)  # The pickled SymSpell dictionary used previously
+    return word_list
+
 
+def _iter_default_words() -> Iterator[str]:
     import lzma
     from importlib.resources import files
 
-    sym_spell.load_dictionary(files('symspellpy').joinpath('frequency_dictionary_en_82_765.txt'), 0, 1)  # noqa
+    freq_dict_path = files('symspellpy').joinpath('frequency_dictionary_en_82_765.txt')
+    log.debug(f'Loading words from {freq_dict_path.as_posix()}')  # noqa
+    with freq_dict_path.open('r', encoding='utf-8') as f:
+        for line in f:
+            if len(parts := line.split()) >= 2 and parts[1].isdigit():
+                yield parts[0]
 
     word_list_path_xz = files('music.text._data.scowl').joinpath('words.xz')
-    log.debug(f'Loading default dictionary + word list from {word_list_path_xz.as_posix()}')  # noqa
+    log.debug(f'Loading words from {word_list_path_xz.as_posix()}')  # noqa
     with lzma.open(word_list_path_xz, 'rt', encoding='utf-8') as f:  # noqa
-        word_list: list[str] = f.read().splitlines()  # noqa
-
-    loaded = sym_spell.words
-    min_count = min(loaded.values())
-    add_word = sym_spell.create_dictionary_entry
-    for word in word_list:
-        try:
-            loaded[word]
-        except KeyError:
-            add_word(word, min_count)
-
-    log.info(
-        f'Saving cached spellcheck dictionary (this is a one-time action that may take ~15s): {cached_path.as_posix()}'
-    )
-    sym_spell.save_pickle(cached_path)
-    return sym_spell
+        # Text is always lower-cased before lookups, so words with upper-case characters could never match
+        yield from (word for word in f.read().splitlines() if word == word.lower())
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import logging
+from unittest.mock import patch
 
 from ds_tools.test_common import main, TestCaseBase
 from ds_tools.output.color import colored
@@ -202,6 +203,34 @@ class FileAlbumParsingTestCase(TestCaseBase):
         for case, expected in cases:
             self.assertSequenceEqual(sort_name_parts(case), expected)
 
+    def test_parsed_read_only(self):
+        parsed = AlbumName.parse('Wannabe (Feat. San E)')
+        with self.assertRaisesRegex(AttributeError, 'read-only'):
+            parsed.alb_type = 'Single'
+        self.assertIs(None, parsed.alb_type)
+        constructed = AlbumName('Wannabe')
+        constructed.alb_type = 'Single'
+        self.assertEqual('Single', constructed.alb_type)
+
+    def test_parse_results_reused(self):
+        album = 'Make It Right (feat. Lauv) (EDM Remix)'
+        with patch.object(AlbumName, '_parse', wraps=AlbumName._parse) as parse_mock:
+            first, second = AlbumName.parse(album, 'BTS'), AlbumName.parse(album, 'BTS')
+        self.assertEqual(1, parse_mock.call_count)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_parse_results_contain_name_copies(self):
+        album = 'Make It Right (feat. Lauv) (EDM Remix)'
+        first, second = AlbumName.parse(album), AlbumName.parse(album)
+        self.assertIsNot(first.name, second.name)
+        self.assertIsNot(first.feat[0], second.feat[0])
+        first.name.update(versions={Name('Make It Right (Remix)')})
+        first.feat[0].update(non_eng='라우브')
+        self.assertEqual(set(), second.name.versions)
+        self.assertNotEqual(first.feat[0], second.feat[0])
+        self.assertEqual(second, AlbumName.parse(album))
+
 
 if __name__ == '__main__':
     main()
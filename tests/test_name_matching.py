@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 from music.text.name import Name
+from music.text.name_index import NameIndex
 from music.test_common import NameTestCaseBase, main
 
 
@@ -87,5 +88,41 @@ class NameMatchingTest(NameTestCaseBase):
         self.assertTrue(b.matches(a), f'\n{b.full_repr()}\n.matches is not true for\n{a.full_repr()}')
 
 
+class NameIndexTest(NameTestCaseBase):
+    titles = [
+        'Into the New World (다시 만난 세계)', 'Into The New World', 'Gee', 'GEE', 'Genie (소원을 말해봐)', 'Genie',
+        '소원을 말해봐', 'So Won Eul Mal Hae Bwa', 'Oh!', 'Run Devil Run', 'Run Devil Run (Remix)', 'Lion Heart',
+        'Lion Heart OST', 'Party', 'Catch Me If You Can', 'Catch Me If You Can (Japanese ver.)', 'Mr.Mr.', 'Mr. Mr.',
+    ]
+
+    def test_candidates_include_all_matches(self):
+        names = [Name.from_enclosed(title) for title in self.titles]
+        index = NameIndex(names)
+        for name in names:
+            expected = [other for other in names if name.matches(other)]
+            candidates = index.candidates(name)
+            self.assertTrue(set(expected).issubset(candidates), f'Missing matches for {name!r} in {candidates}')
+            self.assertEqual(expected[0], index.find_match(name))
+
+    def test_find_match_equivalent_to_sequential(self):
+        names = [Name.from_enclosed(title) for title in self.titles]
+        index = NameIndex(corpus=names)
+        uniq = []
+        for name in names:
+            expected = next(filter(name.matches, uniq), None)
+            self.assertEqual(expected, index.find_match(name))
+            if expected is None:
+                uniq.append(name)
+                index.add(name)
+
+    def test_discard(self):
+        a, b = Name('Gee'), Name('GEE')
+        index = NameIndex([a])
+        self.assertEqual(a, index.find_match(b))
+        index.discard(a)
+        self.assertNotIn(a, index)
+        self.assertIsNone(index.find_match(b))
+
+
 if __name__ == '__main__':
     main()
@@ -35,6 +35,28 @@ class NameParsingTest(NameTestCaseBase):
         self.assertEqual(name._english, 'bar')
         self.assertEqual(name.english, 'bar')
 
+    def test_cached_from_enclosed_returns_copies(self):
+        names = [Name.from_enclosed('Taeyeon (태연)', extra={'a': [1]}) for _ in range(3)]
+        self.assertEqual(names[0], names[2])
+        self.assertIsNot(names[1], names[2])
+        names[1]._english = 'foo'
+        names[1].extra['a'].append(2)
+        name = Name.from_enclosed('Taeyeon (태연)', extra={'a': [1]})
+        self.assertAll(name, _english='Taeyeon', english='Taeyeon', non_eng='태연', korean='태연', extra={'a': [1]})
+
+    def test_cached_from_enclosed_uses_given_extra(self):
+        group_a = Name('Girls\' Generation', '소녀시대', extra={'links': ['SNSD']})
+        group_b = Name('Girls\' Generation', '소녀시대', extra={'links': ['SNSD']})
+        self.assertEqual(group_a, group_b)
+        extra_a, extra_b = {'group': group_a}, {'group': group_b}
+        name_a = Name.from_enclosed('Taeyeon (태연)', extra=extra_a)
+        name_b = Name.from_enclosed('Taeyeon (태연)', extra=extra_b)
+        self.assertIs(extra_a, name_a.extra)
+        self.assertIs(extra_b, name_b.extra)
+        self.assertIs(group_b, name_b.extra['group'])
+        self.assertIs(group_b.extra, name_b.extra['group'].extra)
+        self.assertIs(None, Name.from_enclosed('Taeyeon (태연)').extra)
+
 
 if __name__ == '__main__':
     main()
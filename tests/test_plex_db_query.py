@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+import re
+import sqlite3
+
+from ds_tools.test_common import TestCaseBase, main
+
+from music.plex.db_query import DBQuery, register_functions
+from music.plex.exceptions import InvalidQueryFilter
+
+SCHEMA = """
+CREATE TABLE metadata_items (
+    id INTEGER PRIMARY KEY, parent_id INTEGER, metadata_type INTEGER, library_section_id INTEGER, guid TEXT,
+    title TEXT, title_sort TEXT, original_title TEXT, "index" INTEGER, year INTEGER, duration INTEGER,
+    originally_available_at TEXT, added_at INTEGER, updated_at INTEGER, deleted_at INTEGER
+);
+CREATE TABLE metadata_item_settings (
+    id INTEGER PRIMARY KEY, account_id INTEGER, guid TEXT, rating REAL, last_rated_at INTEGER, view_count INTEGER,
+    last_viewed_at INTEGER
+);
+CREATE TABLE media_items (id INTEGER PRIMARY KEY, metadata_item_id INTEGER);
+CREATE TABLE media_parts (id INTEGER PRIMARY KEY, media_item_id INTEGER, file TEXT, size INTEGER, container TEXT);
+CREATE TABLE tags (id INTEGER PRIMARY KEY, tag TEXT, tag_type INTEGER);
+CREATE TABLE taggings (id INTEGER PRIMARY KEY, metadata_item_id INTEGER, tag_id INTEGER);
+"""
+# id, parent_id, metadata_type, title, year, deleted_at
+ITEMS = [
+    (1, None, 8, 'Red Velvet', None, None),
+    (2, 1, 9, 'The Red', 2015, None),
+    (3, 2, 10, 'Dumb Dumb', None, None),
+    (4, 2, 10, 'Huff n Puff', None, None),
+    (5, None, 8, 'IU', None, None),
+    (6, 5, 9, 'Palette', 2017, None),
+    (7, 6, 10, 'Palette', None, None),
+    (8, 6, 10, 'Deleted Track', None, 1700000000),
+]
+# guid, account_id, rating
+SETTINGS = [('guid-3', 1, 8.0), ('guid-7', 1, 10.0), ('guid-4', 2, 10.0)]
+# track id, file
+FILES = [
+    (3, '/music/Red Velvet/The Red/01. Dumb Dumb.flac'),
+    (4, '/music/Red Velvet/The Red/02. Huff n Puff.mp3'),
+    (7, '/music/IU/Palette/01. Palette.flac'),
+    (8, '/music/IU/Palette/99. Deleted Track.flac'),
+]
+# tag id, tag, tag_type, item ids
+TAGS = [(1, 'Duplicate Rating', 300, (4,)), (2, 'Upbeat', 300, (3, 4)), (3, 'K-pop', 1, (2, 6))]
+
+
+class DBQueryTest(TestCaseBase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.db = db = sqlite3.connect(':memory:')
+        register_functions(db)
+        db.executescript(SCHEMA)
+        db.executemany(
+            'INSERT INTO metadata_items'
+            ' (id, parent_id, metadata_type, title, year, deleted_at, library_section_id, guid)'
+            " VALUES (?, ?, ?, ?, ?, ?, 1, 'guid-' || ?)",
+            [(*item, item[0]) for item in ITEMS],
+        )
+        db.executemany('INSERT INTO metadata_item_settings (guid, account_id, rating) VALUES (?, ?, ?)', SETTINGS)
+        for i, (track_id, file) in enumerate(FILES, 1):
+            db.execute('INSERT INTO media_items (id, metadata_item_id) VALUES (?, ?)', (i, track_id))
+            db.execute('INSERT INTO media_parts (media_item_id, file) VALUES (?, ?)', (i, file))
+        for tag_id, tag, tag_type, item_ids in TAGS:
+            db.execute('INSERT INTO tags (id, tag, tag_type) VALUES (?, ?, ?)', (tag_id, tag, tag_type))
+            db.executemany(
+                'INSERT INTO taggings (metadata_item_id, tag_id) VALUES (?, ?)', [(i, tag_id) for i in item_ids]
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        super().tearDownClass()
+
+    def _query(self, obj_type: str = 'track', **kwargs) -> set[str]:
+        query, params = DBQuery(obj_type).build(**kwargs)
+        return {row[0] for row in self.db.execute(f'SELECT title FROM ({query})', params)}
+
+    # region SQL Generation
+
+    def test_scalar_filter_sql(self):
+        query, params = DBQuery('track').build(userRating__gte=8)
+        self.assertIn('(settings.rating) >= ?', query)
+        self.assertEqual([1, 8], params)
+
+    def test_case_insensitive_filter_sql(self):
+        query, params = DBQuery('track').build(title__icontains='dumb')
+        self.assertIn('instr(py_lower((tracks.title)), py_lower(?)) > 0', query)
+        self.assertEqual([1, 'dumb'], params)
+
+    def test_like_uses_case_insensitive_regex(self):
+        query, params = DBQuery('track').build(grandparentTitle__like='red velvet')
+        self.assertIn('regexp(?, (artists.title), 1)', query)
+        self.assertEqual([1, 'red.*?velvet'], params)
+
+    def test_negated_filter_includes_missing_values(self):
+        query, params = DBQuery('track').build(title__ne='Palette')
+        self.assertIn('((tracks.title) IS NULL OR NOT (tracks.title) = ?)', query)
+        self.assertEqual([1, 'Palette'], params)
+
+    def test_nested_multi_value_filter_sql(self):
+        query, params = DBQuery('track').build(media__part__file__contains='Red')
+        self.assertIn('EXISTS (SELECT 1 FROM (SELECT media_parts.file AS value FROM media_parts', query)
+        self.assertIn('WHERE instr(value, ?) > 0)', query)
+        self.assertEqual([1, 'Red'], params)
+
+    def test_section_and_account(self):
+        query, params = DBQuery('album', section_id=3, account_id=2).build(title='The Red')
+        self.assertIn('albums.library_section_id = ?', query)
+        self.assertEqual([2, 3, 'The Red'], params)
+
+    def test_invalid_filters(self):
+        with self.assertRaises(InvalidQueryFilter):
+            DBQuery('playlist')
+        with self.assertRaises(InvalidQueryFilter):
+            DBQuery('track').build(foo='bar')
+        with self.assertRaises(InvalidQueryFilter):
+            DBQuery('track').build(title__custom=lambda value: True)
+
+    # endregion
+
+    # region Results
+
+    def test_all_tracks_excludes_deleted(self):
+        self.assertEqual({'Dumb Dumb', 'Huff n Puff', 'Palette'}, self._query())
+
+    def test_rating_uses_account(self):
+        self.assertEqual({'Dumb Dumb', 'Palette'}, self._query(userRating__gte=8))
+        self.assertEqual({'Palette'}, self._query(rating=10))
+
+    def test_like(self):
+        self.assertEqual({'Dumb Dumb', 'Huff n Puff'}, self._query(grandparentTitle__like='^red velvet$'))
+
+    def test_not_like(self):
+        self.assertEqual({'Palette'}, self._query(grandparentTitle__not_like='velvet'))
+
+    def test_case_insensitive_ops(self):
+        self.assertEqual({'Huff n Puff'}, self._query(title__icontains='PUFF'))
+        self.assertEqual(set(), self._query(title__contains='PUFF'))
+        self.assertEqual({'Dumb Dumb'}, self._query(title__iexact='dumb dumb'))
+        self.assertEqual({'Palette'}, self._query(title__istartswith='pal'))
+
+    def test_regex_pattern(self):
+        self.assertEqual({'Huff n Puff'}, self._query(title__regex=re.compile('puff', re.IGNORECASE)))
+        self.assertEqual(set(), self._query(title__regex=re.compile('puff')))
+
+    def test_negation(self):
+        self.assertEqual({'Dumb Dumb', 'Huff n Puff'}, self._query(title__ne='Palette'))
+        self.assertEqual({'Dumb Dumb', 'Palette'}, self._query(title__not__contains='Puff'))
+        self.assertEqual({'Dumb Dumb', 'Palette'}, self._query(mood__ne='Duplicate Rating'))
+
+    def test_nested_file_filter(self):
+        self.assertEqual({'Dumb Dumb', 'Palette'}, self._query(media__part__file__like=r'\.flac$'))
+        self.assertEqual({'Huff n Puff'}, self._query(media__part__file__endswith='.mp3'))
+
+    def test_tags(self):
+        self.assertEqual({'Dumb Dumb', 'Huff n Puff'}, self._query(mood='Upbeat'))
+        self.assertEqual({'Palette'}, self._query(mood__exists=False))
+        self.assertEqual({'Dumb Dumb', 'Huff n Puff', 'Palette'}, self._query(genre='K-pop'))
+
+    def test_parent_year(self):
+        self.assertEqual({'Palette'}, self._query(year__gte=2016))
+        self.assertEqual({'The Red'}, self._query('album', year=2015))
+
+    # endregion
+
+
+if __name__ == '__main__':
+    main()
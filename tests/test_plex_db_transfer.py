@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+
+import shlex
+import sqlite3
+import sys
+from contextlib import closing
+from hashlib import blake2b
+from pathlib import Path
+from subprocess import run
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from ds_tools.test_common import TestCaseBase, main
+
+from music.plex import db_transfer
+from music.plex.db_transfer import _DIGEST_SIZE, DeltaTransferError, _get_ranges, _zip_hashes, delta_fetch
+
+BLOCK_SIZE = 16
+
+
+class FakeOutput:
+    def __init__(self, data: bytes, exit_status: int):
+        self.data = data
+        self.channel = self
+        self.exit_status = exit_status
+
+    def read(self) -> bytes:
+        return self.data
+
+    def recv_exit_status(self) -> int:
+        return self.exit_status
+
+
+class FakeClient:
+    """Runs remote commands locally, and reads remote files from the local filesystem via a fake SFTP client"""
+
+    def __init__(self, short_reads: bool = False):
+        self.short_reads = short_reads
+        self.readv_calls = []
+
+    def exec_command(self, cmd: str):
+        proc = run(shlex.split(cmd), capture_output=True)
+        return None, FakeOutput(proc.stdout, proc.returncode), FakeOutput(proc.stderr, proc.returncode)
+
+    def open_sftp(self):
+        return FakeSFTP(self)
+
+
+class FakeSFTP:
+    def __init__(self, client: FakeClient):
+        self.client = client
+
+    def close(self):
+        pass
+
+    def open(self, path: str, mode: str):
+        return FakeRemoteFile(self.client, Path(path))
+
+
+class FakeRemoteFile:
+    def __init__(self, client: FakeClient, path: Path):
+        self.client = client
+        self.path = path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def readv(self, chunks):
+        self.client.readv_calls.append(list(chunks))
+        with self.path.open('rb') as f:
+            for offset, length in chunks:
+                f.seek(offset)
+                data = f.read(length)
+                yield data[:-1] if self.client.short_reads else data
+
+
+class DeltaTransferTestCase(TestCaseBase):
+    def setUp(self):
+        super().setUp()
+        self._tmp_dir = TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp_dir.name)
+        self.local_path = self.tmp_dir.joinpath('local.db')
+        self.remote_path = self.tmp_dir.joinpath('remote', 'remote.db')
+        self.remote_path.parent.mkdir()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+        super().tearDown()
+
+    def _fetch(self, local: bytes, remote: bytes, block_size: int = BLOCK_SIZE, **kwargs) -> FakeClient:
+        self.local_path.write_bytes(local)
+        self.remote_path.write_bytes(remote)
+        client = FakeClient(**kwargs)
+        delta_fetch(client, self.remote_path.as_posix(), self.local_path, block_size, sys.executable)
+        return client
+
+    def assertNoTempFile(self):
+        self.assertEqual([self.local_path], list(self.tmp_dir.glob('local.db*')))
+
+
+class DeltaFetchTest(DeltaTransferTestCase):
+    def setUp(self):
+        super().setUp()
+        integrity_patch = patch.object(db_transfer, 'integrity_check', return_value=[])
+        self.integrity_check = integrity_patch.start()
+        self.addCleanup(integrity_patch.stop)
+
+    def test_unchanged(self):
+        data = bytes(range(40))
+        client = self._fetch(data, data)
+        self.assertEqual(data, self.local_path.read_bytes())
+        self.assertEqual([], client.readv_calls)
+        self.assertNoTempFile()
+
+    def test_remote_grows(self):
+        local = b'a' * 32
+        remote = local + b'b' * 20
+        client = self._fetch(local, remote)
+        self.assertEqual(remote, self.local_path.read_bytes())
+        self.assertEqual([[(32, 20)]], client.readv_calls)
+        self.assertNoTempFile()
+
+    def test_remote_shrinks(self):
+        local = bytes(range(50))
+        remote = local[:20]
+        client = self._fetch(local, remote)
+        self.assertEqual(remote, self.local_path.read_bytes())
+        self.assertEqual([[(16, 4)]], client.readv_calls)
+
+    def test_remote_shrinks_on_block_boundary(self):
+        local = bytes(range(50))
+        remote = local[:32]
+        client = self._fetch(local, remote)
+        self.assertEqual(remote, self.local_path.read_bytes())
+        self.assertEqual([], client.readv_calls)
+
+    def test_non_contiguous_blocks(self):
+        local = bytes(range(80))
+        remote = bytearray(local)
+        remote[20] = 255  # block 1
+        remote[50] = 255  # block 3
+        remote[79] = 255  # block 4
+        remote = bytes(remote)
+        client = self._fetch(local, remote)
+        self.assertEqual(remote, self.local_path.read_bytes())
+        self.assertEqual([[(16, 16), (48, 32)]], client.readv_calls)
+
+    def test_short_last_block(self):
+        local = bytes(range(70))
+        remote = local[:-1] + b'\xff'
+        client = self._fetch(local, remote)
+        self.assertEqual(remote, self.local_path.read_bytes())
+        self.assertEqual([[(64, 6)]], client.readv_calls)
+
+    def test_remote_command_error(self):
+        self.local_path.write_bytes(b'local')
+        missing_path = self.tmp_dir.joinpath('missing.db').as_posix()
+        with self.assertRaisesRegex(DeltaTransferError, 'exited with code=1'):
+            delta_fetch(FakeClient(), missing_path, self.local_path, BLOCK_SIZE, sys.executable)
+        self.assertEqual(b'local', self.local_path.read_bytes())
+        self.assertNoTempFile()
+
+    def test_short_read(self):
+        local = b'a' * 32
+        with self.assertRaisesRegex(DeltaTransferError, 'Expected length=16 bytes at offset=16'):
+            self._fetch(local, b'a' * 16 + b'b' * 16, short_reads=True)
+        self.assertEqual(local, self.local_path.read_bytes())
+        self.assertNoTempFile()
+
+    def test_integrity_check_failure(self):
+        self.integrity_check.return_value = ['corrupt']
+        with self.assertRaisesRegex(DeltaTransferError, 'Integrity check failed'):
+            self._fetch(b'a' * 32, b'b' * 32)
+        self.assertEqual(b'a' * 32, self.local_path.read_bytes())
+        self.assertNoTempFile()
+
+
+class DeltaFetchDBTest(DeltaTransferTestCase):
+    def _write_db(self, path: Path, rows: int):
+        with closing(sqlite3.connect(path)) as db:
+            db.execute('PRAGMA page_size = 512')
+            db.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)')
+            db.executemany('INSERT INTO items (value) VALUES (?)', [(f'item {i}' * 5,) for i in range(rows)])
+            db.commit()
+
+    def test_sqlite_db(self):
+        self._write_db(self.local_path, 100)
+        self._write_db(self.remote_path, 200)
+        delta_fetch(FakeClient(), self.remote_path.as_posix(), self.local_path, 1024, sys.executable)
+        self.assertEqual(self.remote_path.read_bytes(), self.local_path.read_bytes())
+        with closing(sqlite3.connect(self.local_path)) as db:
+            self.assertEqual(200, db.execute('SELECT COUNT(*) FROM items').fetchone()[0])
+
+
+class DeltaTransferHelperTest(TestCaseBase):
+    def test_get_ranges(self):
+        self.assertEqual([(0, 16)], _get_ranges([0], 16, 40))
+        self.assertEqual([(32, 8)], _get_ranges([2], 16, 40))
+        self.assertEqual([(0, 48), (80, 16), (112, 29)], _get_ranges([0, 1, 2, 5, 7, 8], 16, 141))
+
+    def test_zip_hashes(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, 'local.db')
+            path.write_bytes(b'a' * 16 + b'b' * 4)
+            hashes = list(_zip_hashes(path, 16, ['x', 'y', 'z']))
+
+        expected_a = blake2b(b'a' * 16, digest_size=_DIGEST_SIZE).hexdigest()
+        expected_b = blake2b(b'b' * 4, digest_size=_DIGEST_SIZE).hexdigest()
+        self.assertEqual([(expected_a, 'x'), (expected_b, 'y'), (None, 'z')], hashes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+import json
+from unittest.mock import Mock, patch
+
+from ds_tools.test_common import TestCaseBase, main
+
+from music.plex.playlist import PlexPlaylist
+from music.plex.playlist.compare import PlaylistComparer, PlaylistDiff, TrackKeyIndex
+
+
+class FakeTrack:
+    def __init__(self, key: int, artist: str, album: str, title: str):
+        self._int_key = key
+        self.grandparentTitle = artist
+        self.parentTitle = album
+        self.title = title
+
+    def __repr__(self) -> str:
+        return f'<FakeTrack[{self._int_key}: {self.title}]>'
+
+
+A = FakeTrack(1, 'Red Velvet', 'The Red', 'Dumb Dumb')
+B = FakeTrack(2, 'Red Velvet', 'The Red', 'Huff n Puff')
+C = FakeTrack(3, 'IU', 'Palette', 'Palette')
+A_COPY = FakeTrack(4, 'Red  Velvet', 'THE RED', 'Dumb Dumb')  # Same normalized key as A, different ID
+
+
+class TrackKeyIndexTest(TestCaseBase):
+    def test_duplicates_are_only_indexed_once(self):
+        index = TrackKeyIndex([A, B, A])
+        self.assertEqual(2, len(index))
+        self.assertEqual({1, 2}, index.ids)
+
+    def test_non_strict_difference_uses_keys(self):
+        old, new = TrackKeyIndex([A, B]), TrackKeyIndex([A_COPY, C])
+        self.assertEqual([(2, B)], old.difference(new))
+        self.assertEqual([(2, C)], new.difference(old))
+
+    def test_strict_difference_uses_ids(self):
+        old, new = TrackKeyIndex([A, B]), TrackKeyIndex([A_COPY, C])
+        self.assertEqual([(1, A), (2, B)], old.difference(new, strict=True))
+        self.assertEqual([(1, A_COPY), (2, C)], new.difference(old, strict=True))
+
+
+class PlaylistDiffTest(TestCaseBase):
+    def test_statuses(self):
+        index = TrackKeyIndex([A, B])
+        self.assertEqual('deleted', PlaylistDiff('x', index, None).status)
+        self.assertEqual('created', PlaylistDiff('x', None, index).status)
+        self.assertEqual('unchanged', PlaylistDiff('x', index, TrackKeyIndex([B, A])).status)
+        self.assertEqual('unchanged', PlaylistDiff('x', index, TrackKeyIndex([A_COPY, B])).status)
+        self.assertEqual('changed', PlaylistDiff('x', index, TrackKeyIndex([A_COPY, B]), strict=True).status)
+        self.assertEqual('changed', PlaylistDiff('x', index, TrackKeyIndex([A])).status)
+        self.assertFalse(PlaylistDiff('x', index, TrackKeyIndex([A, B])).changed)
+
+    def test_to_dict(self):
+        diff = PlaylistDiff('x', TrackKeyIndex([A, B]), TrackKeyIndex([A, C]))
+        expected = {
+            'name': 'x',
+            'status': 'changed',
+            'old_tracks': 2,
+            'new_tracks': 2,
+            'removed': [{'position': 2, 'id': 2, 'artist': 'Red Velvet', 'album': 'The Red', 'title': 'Huff n Puff'}],
+            'added': [{'position': 2, 'id': 3, 'artist': 'IU', 'album': 'Palette', 'title': 'Palette'}],
+        }
+        self.assertEqual(expected, json.loads(json.dumps(diff.to_dict())))
+
+    def test_to_dict_missing_side(self):
+        data = PlaylistDiff('x', TrackKeyIndex([A]), None).to_dict()
+        self.assertEqual(
+            {'name': 'x', 'status': 'deleted', 'old_tracks': 1, 'new_tracks': None, 'removed': [], 'added': []}, data
+        )
+
+
+class PlaylistComparerTest(TestCaseBase):
+    def _compare(self, **kwargs) -> dict[str, str]:
+        plex = Mock(playlists={'changed': Mock(items=[A, C]), 'created': Mock(items=[C]), 'same': Mock(items=[B])})
+        backup = {'changed': Mock(items=[A, B]), 'deleted': Mock(items=[A]), 'same': Mock(items=[B])}
+        with patch.object(PlexPlaylist, 'load_all', return_value=backup):
+            diffs = PlaylistComparer(plex).compare('backup.json', **kwargs)
+        return {diff.name: diff.status for diff in diffs}
+
+    def test_compare_backup_playlists(self):
+        self.assertEqual({'changed': 'changed', 'deleted': 'deleted', 'same': 'unchanged'}, self._compare())
+
+    def test_compare_include_created(self):
+        expected = {'changed': 'changed', 'created': 'created', 'deleted': 'deleted', 'same': 'unchanged'}
+        self.assertEqual(expected, self._compare(include_created=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+import gzip
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+from xml.etree.ElementTree import fromstring
+
+from ds_tools.test_common import TestCaseBase, main
+from plexapi.audio import Track
+from plexapi.playlist import Playlist
+
+from music.plex.playlist import PlexPlaylist
+from music.plex.playlist.serialization import PlaylistLoader, PlaylistSerializer
+
+PLAYLISTS = {
+    'A Playlist': ('One', 'Two'),
+    'Another Playlist': ('Three',),
+}
+
+
+class PlaylistSerializationTest(TestCaseBase):
+    def setUp(self):
+        super().setUp()
+        self.plex = plex = Mock(dry_run=False, server=Mock())
+        plex.playlists = {name: self._playlist(name, titles) for name, titles in PLAYLISTS.items()}
+
+    def _playlist(self, name: str, titles: tuple[str, ...]) -> PlexPlaylist:
+        server = self.plex.server
+        playlist = Playlist(server, fromstring(f'<Playlist title="{name}" playlistType="audio" smart="0" />'))
+        playlist._items = [
+            Track(server, fromstring(f'<Track ratingKey="{i}" title="{title}" type="track" />'))
+            for i, title in enumerate(titles, 1)
+        ]
+        return PlexPlaylist(name, self.plex, playlist)
+
+    def _assert_loaded(self, path: Path):
+        loader = PlaylistLoader(self.plex)
+        loaded = loader.load_all(path)
+        self.assertEqual(set(PLAYLISTS), set(loaded))
+        for name, titles in PLAYLISTS.items():
+            self.assertEqual(titles, tuple(track.title for track in loaded[name].playlist.items()))
+            self.assertEqual(name, loader.load_one(path, name).name)
+
+    def _dump_combined(self, tmp_dir: str, compress: bool, xml: bool) -> Path:
+        PlaylistSerializer(tmp_dir, self.plex, compress=compress, xml=xml).dump_all()
+        paths = list(Path(tmp_dir).iterdir())
+        self.assertEqual(1, len(paths))
+        return paths[0]
+
+    def test_dump_combined_compressed_json(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._dump_combined(tmp_dir, True, False)
+            self.assertTrue(path.name.endswith('.json.gz'))
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                self.assertEqual(set(PLAYLISTS), set(json.load(f)))
+            self._assert_loaded(path)
+
+    def test_dump_combined_compressed_xml(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._dump_combined(tmp_dir, True, True)
+            self.assertTrue(path.name.endswith('.xml.gz'))
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                self.assertTrue(f.read().startswith('<PlexPlaylists>'))
+            self._assert_loaded(path)
+
+    def test_dump_combined_uncompressed(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._dump_combined(tmp_dir, False, False)
+            self.assertTrue(path.name.endswith('.json'))
+            self._assert_loaded(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+from xml.etree.ElementTree import fromstring
+
+from ds_tools.test_common import TestCaseBase, main
+from plexapi.audio import Track
+
+from music.plex.ratings import RatingSynchronizer, _sync_state
+
+TRACK_XML = '<Track ratingKey="123" key="/library/metadata/123" type="track" title="Test" updatedAt="1700000000" />'
+
+
+class RatingSyncStateTest(TestCaseBase):
+    def _unrated_track(self) -> Track:
+        server = Mock(query=Mock(side_effect=AssertionError('Unexpected request')))
+        return Track(server, fromstring(TRACK_XML), initpath='/library/sections/1/all')
+
+    def test_sync_state_uses_raw_values(self):
+        track = self._unrated_track()
+        with patch.object(Track, '_reload', side_effect=AssertionError('Unexpected reload')):
+            state = _sync_state(track, Path('/music/a.flac'), 123)
+        self.assertEqual(('/music/a.flac', 123, None, 1700000000, 0.0), state)
+
+    def test_unchanged_check_does_not_reload_unrated_tracks(self):
+        track = self._unrated_track()
+        synchronizer = RatingSynchronizer.__new__(RatingSynchronizer)
+        synchronizer._state = {'123': ('/music/a.flac', 123, None, 1700000000, 0)}
+        with patch.object(Track, '_reload', side_effect=AssertionError('Unexpected reload')) as reload_mock:
+            self.assertTrue(synchronizer._is_unchanged(track, Path('/music/a.flac'), 123))
+            self.assertFalse(synchronizer._is_unchanged(track, Path('/music/a.flac'), 456))
+        reload_mock.assert_not_called()
+        track._server.query.assert_not_called()
+
+
+if __name__ == '__main__':
+    main()
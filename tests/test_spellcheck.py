@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from zlib import crc32
+
+from ds_tools.test_common import TestCaseBase, main
+
+from music.text.spellcheck import SpellChecker, WordList
+
+
+class WordListTest(TestCaseBase):
+    def setUp(self):
+        super().setUp()
+        self._tmp_dir = TemporaryDirectory()
+        self.path = Path(self._tmp_dir.name, 'words.idx')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_build_and_lookup(self):
+        words = ['hello', 'world', 'café', '사랑', '日本語', 'a']
+        word_list = WordList.build(self.path, words + ['hello'])
+        self.assertEqual(len(words), len(word_list))
+        self.assertEqual(sorted(words, key=lambda w: w.encode('utf-8')), list(word_list))
+        for word in words:
+            self.assertIn(word, word_list)
+        for word in ('', 'hell', 'helloo', 'cafe', '사', 'Hello', 'b'):
+            self.assertNotIn(word, word_list)
+        self.assertFalse(self.path.with_name('words.idx.tmp').exists())
+
+    def test_empty_word_list(self):
+        word_list = WordList.build(self.path, [])
+        self.assertEqual(0, len(word_list))
+        self.assertEqual([], list(word_list))
+        self.assertNotIn('', word_list)
+        self.assertNotIn('a', word_list)
+
+    def test_empty_word(self):
+        word_list = WordList.build(self.path, ['', 'a'])
+        self.assertEqual(['', 'a'], list(word_list))
+        self.assertIn('', word_list)
+        self.assertIn('a', word_list)
+
+    def test_hash_collisions(self):
+        # 2 words use a table with 4 slots, so some pair of these words must share a slot
+        candidates = [f'word{i}' for i in range(5)]
+        slots = {}
+        for word in candidates:
+            slots.setdefault(crc32(word.encode()) & 3, []).append(word)
+        words = next(words for words in slots.values() if len(words) > 1)[:2]
+        word_list = WordList.build(self.path, words)
+        for word in words:
+            self.assertIn(word, word_list)
+        for word in set(candidates).difference(words):
+            self.assertNotIn(word, word_list)
+
+    def test_many_words(self):
+        words = {f'w{i}' for i in range(5000)}
+        word_list = WordList.build(self.path, words)
+        self.assertEqual(len(words), len(word_list))
+        self.assertEqual(words, set(word_list))
+        self.assertTrue(all(word in word_list for word in words))
+        self.assertFalse(any(f'x{i}' in word_list for i in range(5000)))
+
+    def test_rebuild_replaces_existing_file(self):
+        WordList.build(self.path, ['old'])
+        word_list = WordList.build(self.path, ['new'])
+        self.assertIn('new', word_list)
+        self.assertNotIn('old', word_list)
+
+    def test_bad_magic_is_rejected(self):
+        self.path.write_bytes(b'NOTWORDS' + bytes(64))
+        with self.assertRaisesRegex(ValueError, 'Invalid word list file'):
+            WordList(self.path)
+
+
+class SpellCheckerTest(TestCaseBase):
+    def setUp(self):
+        super().setUp()
+        self._tmp_dir = TemporaryDirectory()
+        words = ['the', 'quick', 'brown', 'fox', 'love', 'you', 'café']
+        self.checker = checker = SpellChecker()
+        checker.words = WordList.build(Path(self._tmp_dir.name, 'words.idx'), words)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_is_english(self):
+        self.assertTrue(self.checker.is_english('The Quick Brown Fox'))
+        self.assertTrue(self.checker.is_english('Love-You'))
+        self.assertTrue(self.checker.is_english('Café'))
+        self.assertFalse(self.checker.is_english('the quikc brown fox'))
+
+    def test_english_probability(self):
+        self.assertEqual(1, self.checker.english_probability('The Quick Brown Fox'))
+        self.assertEqual(0.5, self.checker.english_probability('fox fax'))
+        self.assertEqual(0, self.checker.english_probability(''))
+
+    def test_word_lookups_cached(self):
+        for text in ('the fox', 'The Fox', 'the fax'):
+            self.checker.is_english(text)
+        info = self.checker._is_word.cache_info()
+        self.assertEqual(3, info.misses)
+        self.assertEqual(3, info.hits)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 
-from music.text.fuzz import fuzz_process, revised_weighted_ratio
+from random import Random
+
+from music.text.fuzz import fuzz_process, revised_weighted_ratio, revised_weighted_ratios, fuzz_cache_stats
+from music.text.fuzz import set_fuzz_cache_sizes
+from music.text.romanization import korean_romanization_pattern, korean_romanization_keys
 from music.text.utils import combine_with_parens
 from music.test_common import NameTestCaseBase, main
 
@@ -21,6 +25,43 @@ class TextTest(NameTestCaseBase):
         self.assertEqual(0, revised_weighted_ratio('', ''))
         self.assertEqual(25, revised_weighted_ratio('a', 'abcdefg'))
 
+    def test_revised_weighted_ratio_cache_is_order_insensitive(self):
+        set_fuzz_cache_sizes(ratio=fuzz_cache_stats()['ratio']['maxsize'] or 100)  # Start with an empty, enabled cache
+        score = revised_weighted_ratio('sky i sky', 'quick')
+        self.assertEqual({'hits': 0, 'misses': 1}, _hits_and_misses())
+        self.assertEqual(score, revised_weighted_ratio('quick', 'sky i sky'))
+        self.assertEqual({'hits': 1, 'misses': 1}, _hits_and_misses())
+
+    def test_revised_weighted_ratios_match_pairwise(self):
+        rand = Random(42)
+        alphabet = 'abcdeXY z1 국어한\t.-  '
+
+        def random_str():
+            return ''.join(rand.choice(alphabet) for _ in range(rand.randint(0, 20)))
+
+        for _ in range(500):
+            query, choices = random_str(), [random_str() for _ in range(10)]
+            for cutoff in (0, 50, 90):
+                expected = [revised_weighted_ratio(query, choice) for choice in choices]
+                expected = [score if score >= cutoff else 0 for score in expected]
+                with self.subTest(query=query, choices=choices, cutoff=cutoff):
+                    self.assertEqual(expected, revised_weighted_ratios(query, choices, cutoff))
+
+    def test_korean_romanization_keys_match_pattern(self):
+        pattern = korean_romanization_pattern('소녀시대')
+        rom_keys = korean_romanization_keys('소녀시대')
+        self.assertIsNotNone(rom_keys)
+        self.assertIn('sonyeosidae', rom_keys.keys)
+        for key in rom_keys.keys:
+            self.assertTrue(pattern.match(key))
+        for text in ('sonyeosidae', 'sonyeosidaeabc', 'sonyeo', 'girlsgeneration', ''):
+            self.assertEqual(bool(pattern.match(text)), rom_keys.matches(text))
+
+
+def _hits_and_misses() -> dict[str, int]:
+    stats = fuzz_cache_stats()['ratio']
+    return {'hits': stats['hits'], 'misses': stats['misses']}
+
 
 if __name__ == '__main__':
     main()